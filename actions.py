@@ -0,0 +1,298 @@
+"""
+Action executor for the overlay.
+
+Everything a menu selection does in game (voicelines, chat messages,
+animations) runs as an action on one long-lived worker thread:
+- Actions run one at a time, so keystrokes from two selections never
+  interleave
+- Among the actions that are due, the highest priority runs first, then
+  the oldest
+- submit() returns an Action handle with status, cancel() and wait()
+- No thread is created per action
+- A long action (an animation) can be preempted: it registers
+  on_preempt() callbacks and calls yield_to_preempting() at a safe point,
+  where higher priority actions run before it carries on (SUSPEND) or
+  is cancelled (ABORT)
+"""
+
+import heapq
+import itertools
+import threading
+from collections import deque
+
+from clock import SYSTEM_CLOCK
+from profiling import PROFILER
+
+# Lower runs first
+PRIORITY_VOICELINE = 0
+PRIORITY_CHAT = 1
+PRIORITY_ANIMATION = 2
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+CANCELLED = "cancelled"
+FAILED = "failed"
+
+# What a preempting action does to the action it interrupts
+SUSPEND = "suspend"  # carry on afterwards
+ABORT = "abort"  # cancel it
+
+
+class Action:
+    """
+    Handle for one submitted action.
+    - func(action) is called on the worker thread; long-running actions can
+      check action.cancelled or register on_cancel() callbacks
+    - preempt (SUSPEND or ABORT) applies when this action interrupts a
+      running one with a lower priority
+    - Times are clock.time() values: submitted, started, finished
+    """
+
+    def __init__(self, func, priority, due, name, preempt=SUSPEND, worker=None,
+                 clock=SYSTEM_CLOCK):
+        self.func = func
+        self.priority = priority
+        self.due = due
+        self.preempt = preempt
+        self.name = name or getattr(func, "__name__", "action")
+        self.status = PENDING
+        self.error = None
+        self._clock = clock
+        self.submitted = clock.time()
+        self.started = None
+        self.finished = None
+        self._cancel_requested = False
+        self._cancel_callbacks = []
+        self._preempt_callbacks = []
+        self._worker = worker
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    def __repr__(self):
+        return f"<Action {self.name} {self.status}>"
+
+    @property
+    def cancelled(self):
+        """Whether cancel() was called"""
+        return self._cancel_requested
+
+    @property
+    def dispatch_latency(self):
+        """Seconds from becoming due to starting, None if it has not started"""
+        if self.started is None:
+            return None
+        return self.started - max(self.submitted, self.due)
+
+    def on_cancel(self, callback):
+        """Call callback() if the action is cancelled while running"""
+        with self._lock:
+            if not self._cancel_requested:
+                self._cancel_callbacks.append(callback)
+                return
+        callback()
+
+    def on_preempt(self, callback):
+        """
+        Call callback() when a higher priority action is submitted while this
+        one runs; it should make the action call yield_to_preempting() soon
+        """
+        self._preempt_callbacks.append(callback)
+        # Something may have been submitted before the callback was registered
+        if self._worker is not None and self._worker._has_pending_below(self.priority):
+            callback()
+
+    def yield_to_preempting(self):
+        """
+        Run the queued actions with a higher priority than this one, on this
+        thread, then return. Call from func at a point where it is safe to
+        be interrupted.
+        """
+        self._worker._run_preempting(self)
+
+    def cancel(self):
+        """
+        Cancel the action. A pending action will not run; a running one is
+        asked to stop through its on_cancel callbacks. Returns False if the
+        action had already finished.
+        """
+        with self._lock:
+            if self.status in (DONE, CANCELLED, FAILED):
+                return False
+            self._cancel_requested = True
+            callbacks, self._cancel_callbacks = self._cancel_callbacks, []
+            if self.status == PENDING:
+                self._finish(CANCELLED)
+        for callback in callbacks:
+            callback()
+        return True
+
+    def wait(self, timeout=None):
+        """Wait until the action has finished; False on timeout"""
+        return self._done.wait(timeout)
+
+    def _finish(self, status):
+        self.status = status
+        self.finished = self._clock.time()
+        self._done.set()
+
+    def _start(self):
+        """Mark as running; False if it was cancelled while pending"""
+        with self._lock:
+            if self.status != PENDING:
+                return False
+            self.status = RUNNING
+            self.started = self._clock.time()
+            return True
+
+    def _run(self):
+        try:
+            self.func(self)
+        except Exception as e:
+            self.error = e
+            print(f"Action {self.name} failed: {e}")
+            status = FAILED
+        else:
+            status = CANCELLED if self._cancel_requested else DONE
+        with self._lock:
+            self._finish(status)
+
+
+class ActionWorker:
+    """
+    One worker thread running submitted actions in priority order.
+    - delay postpones an action without holding up others that are due
+    - A higher priority action preempts a running action that accepts it
+      (see Action.on_preempt)
+    - cancel_all() cancels everything pending and the running action
+    - latencies holds (name, seconds from due to started) for recent actions
+    - clock times the delays (a VirtualClock runs them in simulated time)
+    """
+
+    def __init__(self, name="ValTime actions", clock=SYSTEM_CLOCK):
+        self.clock = clock
+        self._cond = threading.Condition()
+        self._queue = []  # heap of (priority, sequence, action)
+        self._sequence = itertools.count()
+        self._closed = False
+        self.current = None  # The running action
+        self._suspended = []  # Actions preempted by the running one
+        self.latencies = deque(maxlen=256)
+        self._thread = threading.Thread(target=self._work, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, func, priority=PRIORITY_CHAT, delay=0.0, name=None,
+               preempt=SUSPEND):
+        """Queue func(action) to run after delay seconds; returns the Action"""
+        action = Action(func, priority, self.clock.time() + delay, name,
+                        preempt, self, self.clock)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("The action worker has been closed")
+            heapq.heappush(self._queue, (priority, next(self._sequence), action))
+            self._cond.notify()
+            current = self.current
+        if current is not None and priority < current.priority:
+            for callback in current._preempt_callbacks:
+                callback()
+        return action
+
+    def pending(self):
+        """Actions waiting to run, in the order they would run if all due"""
+        with self._cond:
+            return [action for _, _, action in sorted(self._queue)
+                    if action.status == PENDING]
+
+    def cancel_all(self):
+        with self._cond:
+            actions = [action for _, _, action in self._queue]
+            actions.extend(self._suspended)
+            if self.current is not None:
+                actions.append(self.current)
+        for action in actions:
+            action.cancel()
+
+    def close(self, timeout=1.0):
+        """Cancel everything and stop the worker thread"""
+        self.cancel_all()
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout)
+
+    def _next(self, below=None):
+        """
+        Pop the highest priority action that is due, or wait for one.
+        With below, only actions with a priority under it count, and None
+        is returned as soon as there are none left.
+        """
+        with self._cond:
+            while True:
+                if self._closed:
+                    return None
+                now = self.clock.time()
+                later = []
+                action = None
+                while self._queue:
+                    entry = heapq.heappop(self._queue)
+                    if entry[2].status != PENDING:
+                        continue  # Cancelled while queued
+                    if below is not None and entry[0] >= below:
+                        later.append(entry)
+                        break  # Nothing after it in the heap qualifies
+                    if entry[2].due <= now:
+                        action = entry[2]
+                        break
+                    later.append(entry)
+                for entry in later:
+                    heapq.heappush(self._queue, entry)
+                if action is not None:
+                    self.current = action
+                    return action
+                if below is not None:
+                    later = [entry for entry in later if entry[0] < below]
+                    if not later:
+                        return None
+                if later:
+                    self.clock.wait(self._cond, min(entry[2].due for entry in later) - now)
+                else:
+                    self._cond.wait()  # Only submit() or close() can wake it
+
+    def _has_pending_below(self, priority):
+        with self._cond:
+            return any(entry[0] < priority and entry[2].status == PENDING
+                       for entry in self._queue)
+
+    def _execute(self, action):
+        if action._start():
+            self.latencies.append((action.name, action.dispatch_latency))
+            with PROFILER.thread_profile():
+                action._run()
+
+    def _run_preempting(self, running):
+        """Run the actions that preempt running, then hand back to it"""
+        with self._cond:
+            self._suspended.append(running)
+        try:
+            while True:
+                action = self._next(below=running.priority)
+                if action is None:
+                    break
+                self._execute(action)
+                with self._cond:
+                    self.current = running
+                if action.preempt == ABORT:
+                    running.cancel()
+        finally:
+            with self._cond:
+                self._suspended.remove(running)
+                self.current = running
+
+    def _work(self):
+        while True:
+            action = self._next()
+            if action is None:
+                return
+            self._execute(action)
+            with self._cond:
+                self.current = None
@@ -0,0 +1,220 @@
+"""
+Binary animation format (.vta).
+
+A compact alternative to the JSON animation files ({"frames": [...],
+"delay": ...}) that can be read through mmap without loading the file.
+
+Layout (all integers little-endian):
+    header      magic "VTA1", frame count, keyframe interval, delay,
+                offset of the frame index
+    frames      one record per frame, either a keyframe or a delta
+                against the previous frame
+    index       per frame: record offset and the keyframe it depends on
+
+Frame records:
+    kind u8 (0 = keyframe, 1 = delta), single u8 (1 = one-line frame),
+    row count u16, then one op per row:
+        COPY     u8 op, u16 source row in the previous frame
+        SHIFT    u8 op, i16 shift, u32 n, n code points entering the row
+        LITERAL  u8 op, u32 n, n code points
+Text is stored as fixed-width UTF-32 code points. Keyframes only use
+LITERAL rows, so any frame can be rebuilt from its keyframe forward.
+"""
+
+import json
+import mmap
+import struct
+import threading
+
+MAGIC = b"VTA1"
+HEADER = struct.Struct("<4sIIdQ")  # magic, frames, keyframe interval, delay, index offset
+INDEX_ENTRY = struct.Struct("<QI")  # record offset, keyframe number
+RECORD = struct.Struct("<BBH")  # kind, single, row count
+U8 = struct.Struct("<B")
+U16 = struct.Struct("<H")
+U32 = struct.Struct("<I")
+SHIFT = struct.Struct("<hI")
+
+KEYFRAME, DELTA = 0, 1
+OP_COPY, OP_SHIFT, OP_LITERAL = 0, 1, 2
+
+MAX_SHIFT = 4  # Largest scroll step looked for between frames
+MAX_ROW_SEARCH = 4  # How far away a copied row may come from
+
+ENCODING = "utf-32-le"
+ERRORS = "surrogatepass"  # Keep lone surrogates from JSON lossless
+
+
+def _literal(text):
+    return U32.pack(len(text)) + text.encode(ENCODING, ERRORS)
+
+
+def _encode_row(row, index, prev_rows):
+    """Smallest op that rebuilds row from the previous frame's rows"""
+    # Unchanged row, or a row that moved up/down
+    for offset in range(MAX_ROW_SEARCH + 1):
+        for source in {index - offset, index + offset}:
+            if 0 <= source < len(prev_rows) and prev_rows[source] == row:
+                return U8.pack(OP_COPY) + U16.pack(source)
+
+    # Row scrolled sideways with a few new characters entering
+    if index < len(prev_rows):
+        prev = prev_rows[index]
+        if len(prev) == len(row):
+            for shift in range(1, min(MAX_SHIFT, len(row) - 1) + 1):
+                if row[shift:] == prev[:-shift]:
+                    return U8.pack(OP_SHIFT) + SHIFT.pack(shift, shift) + row[:shift].encode(ENCODING, ERRORS)
+                if row[:-shift] == prev[shift:]:
+                    return U8.pack(OP_SHIFT) + SHIFT.pack(-shift, shift) + row[-shift:].encode(ENCODING, ERRORS)
+
+    return U8.pack(OP_LITERAL) + _literal(row)
+
+
+def _encode_frame(frame, prev_frame, keyframe):
+    single = isinstance(frame, str)
+    rows = [frame] if single else frame
+    if keyframe:
+        ops = [U8.pack(OP_LITERAL) + _literal(row) for row in rows]
+    else:
+        prev_rows = [prev_frame] if isinstance(prev_frame, str) else prev_frame
+        ops = [_encode_row(row, i, prev_rows) for i, row in enumerate(rows)]
+    kind = KEYFRAME if keyframe else DELTA
+    return RECORD.pack(kind, single, len(rows)) + b"".join(ops)
+
+
+def write_animation(path, frames, delay=0.5, keyframe_interval=64):
+    """Write frames (lists of lines or strings) to a binary animation file"""
+    index = []
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, 0, keyframe_interval, delay, 0))
+        prev = None
+        keyframe_number = 0
+        for i, frame in enumerate(frames):
+            keyframe = i % keyframe_interval == 0
+            if keyframe:
+                keyframe_number = i
+            index.append(INDEX_ENTRY.pack(f.tell(), keyframe_number))
+            f.write(_encode_frame(frame, prev, keyframe))
+            prev = frame
+
+        index_offset = f.tell()
+        f.write(b"".join(index))
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, len(index), keyframe_interval, delay, index_offset))
+
+
+class AnimationFile:
+    """
+    Read-only frame sequence backed by a memory-mapped .vta file.
+    - Only the frames that are accessed are decoded
+    - Reading frames in order decodes one small delta per frame
+    - Random access decodes at most keyframe_interval records
+    - Each thread keeps its own decode position, so frames can be read
+      from several threads at once (e.g. a prefetch and the playback)
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count, self.keyframe_interval, self.delay, self._index_offset = \
+            HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"Not a ValTime animation file: {path}")
+        # Per thread: .last is (frame number, frame) of the last decoded frame
+        self._cursor = threading.local()
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self[i]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(self._count)[index]]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("frame index out of range")
+
+        _, keyframe = INDEX_ENTRY.unpack_from(
+            self._mm, self._index_offset + index * INDEX_ENTRY.size
+        )
+        # Continue from this thread's last decoded frame when reading in order
+        last = getattr(self._cursor, "last", None)
+        if last is not None and keyframe <= last[0] <= index:
+            start, frame = last
+        else:
+            start, frame = keyframe, self._decode(keyframe, None)
+
+        for i in range(start + 1, index + 1):
+            frame = self._decode(i, frame)
+        self._cursor.last = (index, frame)
+        return list(frame) if isinstance(frame, list) else frame
+
+    def _text(self, pos, length):
+        end = pos + length * 4
+        return self._mm[pos:end].decode(ENCODING, ERRORS), end
+
+    def _decode(self, index, prev):
+        mm = self._mm
+        pos, _ = INDEX_ENTRY.unpack_from(mm, self._index_offset + index * INDEX_ENTRY.size)
+        _, single, row_count = RECORD.unpack_from(mm, pos)
+        pos += RECORD.size
+        prev_rows = [prev] if isinstance(prev, str) else prev
+
+        rows = []
+        for i in range(row_count):
+            op = mm[pos]
+            pos += 1
+            if op == OP_COPY:
+                source, = U16.unpack_from(mm, pos)
+                pos += U16.size
+                rows.append(prev_rows[source])
+            elif op == OP_SHIFT:
+                shift, length = SHIFT.unpack_from(mm, pos)
+                text, pos = self._text(pos + SHIFT.size, length)
+                prev_row = prev_rows[i]
+                if shift > 0:
+                    rows.append(text + prev_row[:-shift])
+                else:
+                    rows.append(prev_row[-shift:] + text)
+            else:
+                length, = U32.unpack_from(mm, pos)
+                text, pos = self._text(pos + U32.size, length)
+                rows.append(text)
+
+        return rows[0] if single else rows
+
+
+def read_animation(path):
+    """Open a binary animation file for memory-mapped frame access"""
+    return AnimationFile(path)
+
+
+def json_to_binary(json_path, binary_path, keyframe_interval=64):
+    """Convert a JSON animation ({"frames", "delay"}) to the binary format"""
+    with open(json_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    write_animation(binary_path, data.get("frames", []), data.get("delay", 0.5),
+                    keyframe_interval)
+
+
+def binary_to_json(binary_path, json_path):
+    """Convert a binary animation back to the JSON layout"""
+    with AnimationFile(binary_path) as animation:
+        data = {"frames": list(animation), "delay": animation.delay}
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
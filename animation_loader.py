@@ -0,0 +1,187 @@
+"""
+Background animation loading for the animation player.
+
+Frames are parsed on a worker thread and handed to the UI in batches, so
+the first frame can be shown while the rest of a large file is still
+being read. Loading reports progress and can be cancelled.
+"""
+
+import codecs
+import json
+import os
+import re
+import threading
+import time
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from animation_format import read_animation
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r"\s*")
+_delimiter = re.compile(r"[\s,\]}]")
+
+CHUNK_SIZE = 64 * 1024  # bytes read from disk at a time
+BATCH_INTERVAL = 0.05  # seconds between batches posted to the UI
+BATCH_MAX = 2000  # frames per batch at most
+
+
+class _JsonStream:
+    """JSON values read one at a time from a file, a chunk at a time"""
+
+    def __init__(self, f, chunk_size):
+        self._file = f
+        self._chunk_size = chunk_size
+        self._decode = codecs.getincrementaldecoder("utf-8")().decode
+        self.text = ""
+        self.pos = 0
+        self.bytes_read = 0
+
+    def _more(self):
+        """Read the next chunk, dropping text already consumed"""
+        data = self._file.read(self._chunk_size)
+        self.bytes_read += len(data)
+        new_text = self._decode(data, final=not data)
+        self.text = self.text[self.pos:] + new_text
+        self.pos = 0
+        return bool(data)
+
+    def peek(self):
+        """Next non-whitespace character ('' at the end of the file)"""
+        while True:
+            self.pos = _whitespace.match(self.text, self.pos).end()
+            if self.pos < len(self.text) or not self._more():
+                return self.text[self.pos:self.pos + 1]
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} in animation file")
+        self.pos += 1
+
+    def skip(self, char):
+        if self.peek() == char:
+            self.pos += 1
+
+    def value(self):
+        # Numbers and literals may continue in the next chunk, so read on
+        # until something that ends them is in the buffer
+        if self.peek() not in '"[{':
+            while not _delimiter.search(self.text, self.pos) and self._more():
+                pass
+        while True:
+            try:
+                value, self.pos = _decoder.raw_decode(self.text, self.pos)
+                return value
+            except json.JSONDecodeError:
+                if not self._more():
+                    raise
+
+
+def iter_json_frames(f, extra, chunk_size=CHUNK_SIZE):
+    """
+    Parse a JSON animation ({"frames": [...], "delay": ...}) incrementally
+    from a binary file object.
+    - Yields (frame, bytes read so far) one frame at a time
+    - Every other top-level key (e.g. "delay") is stored in extra
+    """
+    stream = _JsonStream(f, chunk_size)
+    stream.expect("{")
+    while stream.peek() != "}":
+        key = stream.value()
+        stream.expect(":")
+        if key == "frames":
+            stream.expect("[")
+            while stream.peek() != "]":
+                yield stream.value(), stream.bytes_read
+                stream.skip(",")
+            stream.expect("]")
+        else:
+            extra[key] = stream.value()
+        stream.skip(",")
+
+
+def check_frame(frame, number):
+    """Raise ValueError unless frame is a line of text or a list of lines"""
+    if isinstance(frame, str):
+        return
+    if not isinstance(frame, list) or not all(isinstance(line, str) for line in frame):
+        raise ValueError(f"Frame {number} is not a line of text or a list of lines")
+
+
+class LoaderSignals(QObject):
+    """Signals for thread-safe communication"""
+    frames_loaded = pyqtSignal(list)  # next batch of frames
+    progress = pyqtSignal(float)  # 0.0 - 1.0
+    finished = pyqtSignal(float)  # frame delay from the file
+    cancelled = pyqtSignal()
+    failed = pyqtSignal(str)
+
+
+class AnimationLoader:
+    """
+    Loads a .json or .vta animation on a background thread.
+    - The first frame is posted on its own, then frames arrive in batches
+    - Every frame is checked here, so a malformed file fails through
+      signals.failed instead of in the UI
+    - cancel() stops loading; frames already posted are kept
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.signals = LoaderSignals()  # Created on the GUI thread
+        self._cancel = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def _frames(self, extra):
+        """Yield (frame, progress) for the file"""
+        if self.filename.endswith(".vta"):
+            with read_animation(self.filename) as animation:
+                extra["delay"] = animation.delay
+                total = len(animation)
+                for i, frame in enumerate(animation):
+                    yield frame, (i + 1) / total
+        else:
+            total = os.path.getsize(self.filename) or 1
+            with open(self.filename, "rb") as f:
+                for frame, bytes_read in iter_json_frames(f, extra):
+                    yield frame, bytes_read / total
+
+    def _run(self):
+        extra = {}
+        batch = []
+        last_post = None
+        try:
+            for number, (frame, progress) in enumerate(self._frames(extra), 1):
+                if self._cancel.is_set():
+                    break
+                check_frame(frame, number)
+                batch.append(frame)
+                now = time.perf_counter()
+                # Post the very first frame immediately, then in batches
+                if last_post is None or len(batch) >= BATCH_MAX or now - last_post >= BATCH_INTERVAL:
+                    self.signals.frames_loaded.emit(batch)
+                    self.signals.progress.emit(progress)
+                    batch = []
+                    last_post = now
+        except (OSError, ValueError) as e:
+            self.signals.failed.emit(str(e))
+            return
+
+        if batch:
+            self.signals.frames_loaded.emit(batch)
+        if self._cancel.is_set():
+            self.signals.cancelled.emit()
+        else:
+            self.signals.progress.emit(1.0)
+            self.signals.finished.emit(float(extra.get("delay", 0.5)))
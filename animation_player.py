@@ -1,22 +1,32 @@
 import sys
-import time
 import threading
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QTextEdit, QListWidget, QLabel, QSpinBox, QDoubleSpinBox,
-    QGroupBox, QSplitter, QMessageBox, QInputDialog, QFileDialog
+    QGroupBox, QSplitter, QMessageBox, QInputDialog, QFileDialog, QProgressBar,
+    QComboBox
 )
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QObject
-from PyQt6.QtGui import QFont
-from pynput import keyboard
-import pyperclip
+from PyQt6.QtCore import Qt, pyqtSignal, QObject
+from PyQt6.QtGui import QFont, QKeySequence, QShortcut
 import json
 
+from animation_format import write_animation
+from animation_loader import AnimationLoader
+from clipboard import create_clipboard
+from clock import QtClock
+from injection import chat_sequence, create_backend
+from frames import BG_CHAR, FrameStore, LazyFrames, PAYLOAD_CACHE, frames_hash
+from ratelimit import limiter_from_config
+from playback import TIMING_MODES, PlaybackScheduler, pacer_from_config, run_playback
+from profiling import PROFILER, profiling_requested
+
 
 class AnimationSignals(QObject):
     """Signals for thread-safe communication"""
-    frame_played = pyqtSignal(int)
-    animation_complete = pyqtSignal()
+    frame_played = pyqtSignal(int, int)  # frame number, repeated frames elided so far
+    animation_complete = pyqtSignal(int)  # repeated frames elided
+    animation_failed = pyqtSignal(str)  # what stopped the playback
+    countdown_finished = pyqtSignal(object)  # the playback's scheduler; on the GUI thread
 
 
 # The full truck sprite (each line is exactly 26 characters)
@@ -36,11 +46,99 @@ TRUCK_SPRITE = [
     "▒▒▙▟▙▟▒▒▒▒▒▒▒▒▒▒▙▟▙▟▒▒▒▒▒▒",
 ]
 
-# Background character
-BG_CHAR = "▒"
 SCREEN_WIDTH = 26  # Each line is 26 characters
 TRUCK_WIDTH = 26
 
+SCROLL_DIRECTIONS = ("left", "right", "up", "down")
+
+
+class ScrollAnimation:
+    """
+    A sprite scrolling through a fixed-size viewport.
+    - Every sprite row is padded with the background once, up front
+    - Each frame is then just a window sliced out of the padded rows
+    - Works for any sprite size, any viewport size and all four directions
+    - With wrap=True the sprite loops around like a marquee
+    """
+
+    def __init__(self, sprite, viewport_width=None, viewport_height=None,
+                 direction="right", wrap=False, bg_char=BG_CHAR):
+        if direction not in SCROLL_DIRECTIONS:
+            raise ValueError(f"Unknown scroll direction: {direction}")
+
+        sprite_width = max((len(line) for line in sprite), default=0)
+        rows = [line.ljust(sprite_width, bg_char) for line in sprite]
+
+        self.width = sprite_width if viewport_width is None else viewport_width
+        self.height = len(rows) if viewport_height is None else viewport_height
+        self.direction = direction
+        self.wrap = wrap
+        self.horizontal = direction in ("left", "right")
+        self.content_hash = hash(
+            (tuple(rows), self.width, self.height, direction, wrap, bg_char)
+        )
+
+        if self.horizontal:
+            # Fit the sprite rows to the viewport height
+            rows = rows[:self.height]
+            rows += [bg_char * sprite_width] * (self.height - len(rows))
+            gap = bg_char * self.width
+            if wrap:
+                # Two copies of (sprite + gap) so any window is one slice
+                self._rows = [(line + gap) * 2 for line in rows]
+                self._count = sprite_width + self.width
+            else:
+                # Fully off-screen on one side to fully off-screen on the other
+                self._rows = [gap + line + gap for line in rows]
+                self._count = sprite_width + self.width + 1
+        else:
+            # Fit the sprite rows to the viewport width
+            rows = [line[:self.width].ljust(self.width, bg_char) for line in rows]
+            gap = [bg_char * self.width] * self.height
+            if wrap:
+                self._rows = (rows + gap) * 2
+                self._count = len(rows) + self.height
+            else:
+                self._rows = gap + rows + gap
+                self._count = len(rows) + self.height + 1
+
+    def __len__(self):
+        return self._count
+
+    def _offset(self, index):
+        """Window offset into the padded rows for a frame index"""
+        if self.direction in ("left", "up"):
+            return index
+        if self.wrap:
+            return -index % self._count
+        return self._count - 1 - index
+
+    def frame(self, index):
+        """Render a single frame as a list of lines"""
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("frame index out of range")
+
+        offset = self._offset(index)
+        if self.horizontal:
+            end = offset + self.width
+            return [line[offset:end] for line in self._rows]
+        return self._rows[offset:offset + self.height]
+
+    def frames(self):
+        """Render every frame"""
+        return [self.frame(i) for i in range(self._count)]
+
+
+def generate_scroll_frames(sprite, viewport_width=None, viewport_height=None,
+                           direction="right", wrap=False, bg_char=BG_CHAR):
+    """Generate every frame of a sprite scrolling through a viewport"""
+    return ScrollAnimation(
+        sprite, viewport_width, viewport_height, direction, wrap, bg_char
+    ).frames()
+
+
 def generate_truck_frames():
     """
     Generate frames for the truck scrolling left to right.
@@ -49,41 +147,30 @@ def generate_truck_frames():
     - Each frame has exactly 13 lines of 26 characters
     - Space added after every 26 chars for Valorant compatibility
     """
-    frames = []
-    
-    # truck_pos: position of truck's left edge relative to screen
-    # -TRUCK_WIDTH = fully off left, 0 = at left edge, SCREEN_WIDTH = fully off right
-    for truck_pos in range(-TRUCK_WIDTH, SCREEN_WIDTH + 1):
-        frame_lines = []
-        for sprite_line in TRUCK_SPRITE:
-            line = ""
-            for screen_x in range(SCREEN_WIDTH):
-                # Which column of the truck would be at this screen position?
-                truck_x = screen_x - truck_pos
-                if 0 <= truck_x < TRUCK_WIDTH:
-                    line += sprite_line[truck_x]
-                else:
-                    line += BG_CHAR
-            frame_lines.append(line)
-        frames.append(frame_lines)
-    
-    return frames
+    return generate_scroll_frames(TRUCK_SPRITE, SCREEN_WIDTH)
 
-def format_frame_for_valorant(frame_lines):
+def generate_passing_trucks_frames():
     """
-    Combine all lines into one string with spaces after every 26 characters.
-    Each line is 26 chars, so we add a space after each line.
+    Generate frames for two trucks passing each other.
+    - One truck drives right in front, a mirrored one drives left behind it
+    - Needs numpy for the compositor
     """
-    result = ""
-    for line in frame_lines:
-        result += line + " "
-    return result.rstrip()  # Remove trailing space
+    from compositor import Compositor, Layer, linear_path, mirror_sprite
+
+    scene = Compositor(SCREEN_WIDTH, len(TRUCK_SPRITE), [
+        Layer(TRUCK_SPRITE, linear_path(-TRUCK_WIDTH, 0, dx=1), z=1),
+        Layer(mirror_sprite(TRUCK_SPRITE), linear_path(SCREEN_WIDTH, 0, dx=-1), z=0),
+    ])
+    return scene.frames(TRUCK_WIDTH + SCREEN_WIDTH + 1)
 
-# Generate the full animation frames
-TRUCK_ANIMATION = generate_truck_frames()
+# The full animation - frames are only rendered when they are first used
+TRUCK_SCROLL = ScrollAnimation(TRUCK_SPRITE, SCREEN_WIDTH)
+TRUCK_ANIMATION = LazyFrames(len(TRUCK_SCROLL), TRUCK_SCROLL.frame)
 
 
 CONFIG_FILE = "animation_config.json"
+CHAT_PASTE = chat_sequence()
+ANIMATION_FILE_FILTER = "Animations (*.json *.vta);;JSON Files (*.json);;Binary Animations (*.vta)"
 
 def load_animation_config():
     """Load animation configuration from file"""
@@ -99,24 +186,46 @@ def save_animation_config(config):
         json.dump(config, f, indent=2)
 
 
+def elided_note(elided):
+    """Status label suffix for repeated frames that were not re-sent"""
+    return f" - {elided} repeated frames elided" if elided else ""
+
+
 class AnimationPlayer(QMainWindow):
-    def __init__(self):
+    def __init__(self, clock=None):
         super().__init__()
-        self.frames = TRUCK_ANIMATION.copy()  # Each frame is a list of lines
-        self.keyboard_controller = keyboard.Controller()
+        # Times the countdown and playback; a VirtualClock simulates them
+        self.clock = clock or QtClock()
+        self.frames = FrameStore(TRUCK_ANIMATION)  # Each frame is a list of lines
+        self.injector = create_backend(clock=self.clock)
+        self.clipboard = create_clipboard(clock=self.clock)
         self.signals = AnimationSignals()
         self.is_playing = False
+        self.scheduler = PlaybackScheduler(self.clock)  # Stops/pauses the running playback
+        self.playback_total = 0
         self.current_animation = "Truck"
+        self._content_hash = None  # Hash of self.frames, None when stale
+        self.loader = None  # Background loader while a file is loading
         
         # Load config
         self.config = load_animation_config()
+        self.chat_limiter = limiter_from_config(self.config, self.clock.time)  # Paces chat sends, if set
         anim_config = self.config.get("animations", {}).get("Truck", {})
         self.frame_delay = anim_config.get("frame_delay", 0.5)
         self.skip_frames = anim_config.get("skip_frames", 5)
-        self.line_delay = 0.05  # seconds between lines within a frame
+        # "manual" uses skip/delay, "duration"/"fps" pace towards a target
+        self.timing = anim_config.get("timing", "manual")
+        self.targets = {
+            "duration": anim_config.get("target_duration", 10.0),
+            "fps": anim_config.get("target_fps", 2.0),
+        }
         
         self.signals.frame_played.connect(self.on_frame_played)
         self.signals.animation_complete.connect(self.on_animation_complete)
+        self.signals.animation_failed.connect(self.on_animation_failed)
+        self.signals.countdown_finished.connect(self.start_playback)
+        # Hidden: Pause starts and stops profiling
+        QShortcut(QKeySequence(Qt.Key.Key_Pause), self, activated=PROFILER.toggle)
         
         self.init_ui()
         self.load_default_animation()
@@ -130,6 +239,7 @@ class AnimationPlayer(QMainWindow):
             self.frames_list.setCurrentRow(0)
         self.delay_spin.setValue(self.frame_delay)
         self.skip_spin.setValue(self.skip_frames)
+        self.timing_combo.setCurrentIndex(list(TIMING_MODES).index(self.timing))
         self.status_label.setText(f"Truck animation loaded - {len(self.frames)} frames, {len(TRUCK_SPRITE)} lines each")
         
     def init_ui(self):
@@ -215,6 +325,21 @@ class AnimationPlayer(QMainWindow):
         self.skip_spin.valueChanged.connect(lambda v: setattr(self, 'skip_frames', v))
         settings_layout.addWidget(self.skip_spin)
         
+        # Timing mode - skip/delay by hand, or a target the player paces to
+        settings_layout.addWidget(QLabel("Timing:"))
+        self.timing_combo = QComboBox()
+        for mode, label in TIMING_MODES.items():
+            self.timing_combo.addItem(label, mode)
+        self.timing_combo.currentIndexChanged.connect(self.on_timing_changed)
+        settings_layout.addWidget(self.timing_combo)
+        
+        self.target_spin = QDoubleSpinBox()
+        self.target_spin.setRange(0.1, 600.0)
+        self.target_spin.setSingleStep(0.5)
+        self.target_spin.valueChanged.connect(self.on_target_changed)
+        self.target_spin.setEnabled(False)
+        settings_layout.addWidget(self.target_spin)
+        
         settings_layout.addStretch()
         
         # Save/Load buttons
@@ -247,16 +372,39 @@ class AnimationPlayer(QMainWindow):
         self.stop_btn.setEnabled(False)
         playback_layout.addWidget(self.stop_btn)
         
+        self.pause_btn = QPushButton("❚❚ Pause")
+        self.pause_btn.setStyleSheet("font-size: 14px; padding: 10px;")
+        self.pause_btn.clicked.connect(self.toggle_pause)
+        self.pause_btn.setEnabled(False)
+        playback_layout.addWidget(self.pause_btn)
+        
         main_layout.addLayout(playback_layout)
         
         # Status
+        status_layout = QHBoxLayout()
+        
         self.status_label = QLabel("Ready - Add frames and press Play")
         self.status_label.setStyleSheet("color: gray; padding: 5px;")
-        main_layout.addWidget(self.status_label)
+        status_layout.addWidget(self.status_label, 1)
+        
+        # Load progress - only shown while a file is loading
+        self.load_progress = QProgressBar()
+        self.load_progress.setRange(0, 1000)
+        self.load_progress.setMaximumWidth(200)
+        self.load_progress.hide()
+        status_layout.addWidget(self.load_progress)
+        
+        self.cancel_load_btn = QPushButton("Cancel")
+        self.cancel_load_btn.clicked.connect(self.cancel_load)
+        self.cancel_load_btn.hide()
+        status_layout.addWidget(self.cancel_load_btn)
+        
+        main_layout.addLayout(status_layout)
         
     def add_frame(self):
         """Add a new frame"""
         self.frames.append([])  # Empty list for multi-line frame
+        self.frames_changed()
         self.frames_list.addItem(f"Frame {len(self.frames)}")
         self.frames_list.setCurrentRow(len(self.frames) - 1)
         self.frame_editor.clear()
@@ -267,6 +415,7 @@ class AnimationPlayer(QMainWindow):
         row = self.frames_list.currentRow()
         if row >= 0:
             self.frames.pop(row)
+            self.frames_changed()
             self.frames_list.takeItem(row)
             self.update_frame_labels()
             
@@ -275,6 +424,7 @@ class AnimationPlayer(QMainWindow):
         row = self.frames_list.currentRow()
         if row > 0:
             self.frames[row], self.frames[row-1] = self.frames[row-1], self.frames[row]
+            self.frames_changed()
             self.frames_list.setCurrentRow(row - 1)
             self.update_frame_labels()
             
@@ -283,9 +433,21 @@ class AnimationPlayer(QMainWindow):
         row = self.frames_list.currentRow()
         if row < len(self.frames) - 1:
             self.frames[row], self.frames[row+1] = self.frames[row+1], self.frames[row]
+            self.frames_changed()
             self.frames_list.setCurrentRow(row + 1)
             self.update_frame_labels()
             
+    def frames_changed(self):
+        """Drop cached chat payloads after the frames were edited"""
+        self._content_hash = None
+        PAYLOAD_CACHE.invalidate(self.current_animation)
+        
+    def content_hash(self):
+        """Hash of the current frames, recomputed only after edits"""
+        if self._content_hash is None:
+            self._content_hash = frames_hash(self.frames)
+        return self._content_hash
+        
     def update_frame_labels(self):
         """Update frame list labels"""
         for i in range(self.frames_list.count()):
@@ -310,6 +472,7 @@ class AnimationPlayer(QMainWindow):
             text = self.frame_editor.toPlainText()
             # Store as list of lines for multi-line support
             self.frames[row] = text.split('\n') if '\n' in text else text
+            self.frames_changed()
             
     def update_current_frame(self):
         """Explicitly update current frame"""
@@ -317,55 +480,126 @@ class AnimationPlayer(QMainWindow):
         if 0 <= row < len(self.frames):
             text = self.frame_editor.toPlainText()
             self.frames[row] = text.split('\n') if '\n' in text else text
+            self.frames_changed()
             self.status_label.setText(f"Frame {row + 1} updated")
             
     def save_animation(self):
         """Save animation to file"""
         filename, _ = QFileDialog.getSaveFileName(
-            self, "Save Animation", "", "JSON Files (*.json)"
+            self, "Save Animation", "", ANIMATION_FILE_FILTER
         )
         if filename:
-            data = {
-                "frames": self.frames,
-                "delay": self.frame_delay
-            }
-            with open(filename, 'w') as f:
-                json.dump(data, f, indent=2)
+            if filename.endswith(".vta"):
+                write_animation(filename, self.frames, self.frame_delay)
+            else:
+                data = {
+                    "frames": list(self.frames),
+                    "delay": self.frame_delay
+                }
+                with open(filename, 'w') as f:
+                    json.dump(data, f, indent=2)
             self.status_label.setText(f"Saved to {filename}")
             
     def load_animation(self):
-        """Load animation from file"""
+        """Load animation from file - frames are parsed in the background"""
         filename, _ = QFileDialog.getOpenFileName(
-            self, "Load Animation", "", "JSON Files (*.json)"
+            self, "Load Animation", "", ANIMATION_FILE_FILTER
         )
         if filename:
-            with open(filename, 'r') as f:
-                data = json.load(f)
-            self.frames = data.get("frames", [])
-            self.frame_delay = data.get("delay", 0.5)
-            self.delay_spin.setValue(self.frame_delay)
-            
+            self.cancel_load()
+            self.frames = FrameStore()
+            self.frames_changed()
             self.frames_list.clear()
-            for i in range(len(self.frames)):
-                self.frames_list.addItem(f"Frame {i+1}")
             
-            if self.frames:
-                self.frames_list.setCurrentRow(0)
-                
-            self.status_label.setText(f"Loaded {len(self.frames)} frames")
+            loader = self.loader = AnimationLoader(filename)
+            
+            def current(slot):
+                # Ignore anything still queued from a cancelled loader
+                return lambda *args: slot(*args) if loader is self.loader else None
+            
+            loader.signals.frames_loaded.connect(current(self.on_frames_loaded))
+            loader.signals.progress.connect(current(self.on_load_progress))
+            loader.signals.finished.connect(current(self.on_load_finished))
+            loader.signals.failed.connect(current(self.on_load_failed))
+            
+            self.load_progress.setValue(0)
+            self.load_progress.show()
+            self.cancel_load_btn.show()
+            self.play_btn.setEnabled(False)
+            self.status_label.setText(f"Loading {filename}...")
+            loader.start()
+            
+    def on_frames_loaded(self, batch):
+        """Append a batch of frames from the background loader"""
+        start = len(self.frames)
+        self.frames.extend(batch)
+        self.frames_list.addItems([f"Frame {i+1}" for i in range(start, len(self.frames))])
+        if start == 0 and self.frames:
+            self.frames_list.setCurrentRow(0)
+        self.status_label.setText(f"Loading... {len(self.frames)} frames")
+        
+    def on_load_progress(self, value):
+        self.load_progress.setValue(int(value * 1000))
+        
+    def on_load_finished(self, delay):
+        """Background loading completed"""
+        self.frame_delay = delay
+        self.delay_spin.setValue(self.frame_delay)
+        self.on_load_stopped("Loaded")
+        
+    def on_load_failed(self, error):
+        """Background loading hit a bad file"""
+        self.on_load_stopped("Loading failed")
+        QMessageBox.warning(self, "Load Failed", f"Could not load animation:\n{error}")
+        
+    def on_load_stopped(self, message):
+        self.loader = None
+        self.frames_changed()
+        self.load_progress.hide()
+        self.cancel_load_btn.hide()
+        self.play_btn.setEnabled(not self.is_playing)
+        self.status_label.setText(f"{message} - {len(self.frames)} frames")
+        
+    def cancel_load(self):
+        """Stop a background load, keeping the frames loaded so far"""
+        if self.loader is not None:
+            self.loader.cancel()
+            self.on_load_stopped("Loading cancelled")
     
+    def on_timing_changed(self, index):
+        """Switch between skip/delay and target-paced playback"""
+        self.timing = self.timing_combo.itemData(index)
+        manual = self.timing == "manual"
+        self.delay_spin.setEnabled(manual)
+        self.skip_spin.setEnabled(manual)
+        self.target_spin.setEnabled(not manual)
+        if not manual:
+            self.target_spin.setValue(self.targets[self.timing])
+            
+    def on_target_changed(self, value):
+        if self.timing != "manual":
+            self.targets[self.timing] = value
+            
     def save_config(self):
         """Save current animation settings to config file"""
         if "animations" not in self.config:
             self.config["animations"] = {}
         
+        # Round so spin box steps don't end up as 0.7999999999999999
         self.config["animations"][self.current_animation] = {
             "skip_frames": self.skip_frames,
-            "frame_delay": self.frame_delay
+            "frame_delay": round(self.frame_delay, 3),
+            "timing": self.timing,
+            "target_duration": round(self.targets["duration"], 3),
+            "target_fps": round(self.targets["fps"], 3)
         }
         
         save_animation_config(self.config)
-        self.status_label.setText(f"Settings saved for {self.current_animation}: skip={self.skip_frames}, delay={self.frame_delay}s")
+        if self.timing == "manual":
+            detail = f"skip={self.skip_frames}, delay={round(self.frame_delay, 3)}s"
+        else:
+            detail = f"{TIMING_MODES[self.timing]} = {round(self.targets[self.timing], 3)}"
+        self.status_label.setText(f"Settings saved for {self.current_animation}: {detail}")
             
     def play_animation(self):
         """Play the animation in Valorant chat"""
@@ -374,112 +608,133 @@ class AnimationPlayer(QMainWindow):
             return
             
         self.is_playing = True
+        self.scheduler = PlaybackScheduler(self.clock)
         self.play_btn.setEnabled(False)
         self.stop_btn.setEnabled(True)
+        self.pause_btn.setEnabled(False)  # Until playback starts
         self.status_label.setText("Playing... Switch to Valorant now! (3 seconds)")
         
-        # Give user time to switch to Valorant
-        QTimer.singleShot(3000, self.start_playback)
+        # Give user time to switch to Valorant. The countdown carries its own
+        # scheduler, so one left over from Play -> Stop -> Play does nothing
+        scheduler = self.scheduler
+        self.clock.call_later(3.0, lambda: self.signals.countdown_finished.emit(scheduler))
         
-    def start_playback(self):
+    def start_playback(self, scheduler):
         """Start the actual playback"""
+        if scheduler.stopped:
+            return  # Stopped during the countdown
+        self.pause_btn.setEnabled(True)
+        
+        # Target-paced playback picks its own stride, so it gets every frame
+        settings = {"timing": self.timing,
+                    "target_duration": self.targets["duration"],
+                    "target_fps": self.targets["fps"]}
+        pacer = pacer_from_config(settings, len(self.frames))
+        skip = self.skip_frames if pacer is None else 1
+        
+        # Ready-to-paste payloads for the frames to play (always ends on the
+        # last frame) - cached, so replays do no formatting work
+        payloads = PAYLOAD_CACHE.payloads(
+            self.current_animation, self.frames, skip,
+            content_hash=self.content_hash()
+        )
+        self.playback_total = len(payloads)
+
         def play_thread():
-            # Get frames to play based on skip setting
-            frames_to_play = list(self.frames[::self.skip_frames])
-            
-            # Always include the last frame if not already included
-            if self.frames and frames_to_play[-1] is not self.frames[-1]:
-                frames_to_play.append(self.frames[-1])
+            # Lines are already joined with a space after every 26 chars.
+            # Frames go out on fixed deadlines, and a frame identical to the
+            # one already in chat is not sent again - the previous one is
+            # simply held for its duration. Each frame is formatted and
+            # encoded for the clipboard while waiting for its deadline.
+            try:
+                with PROFILER.thread_profile(), PROFILER.memory_snapshots("playback"):
+                    elided = run_playback(
+                        payloads, self.paste_prepared, self.frame_delay, pacer,
+                        scheduler=scheduler,
+                        on_frame=lambda i, elided: self.signals.frame_played.emit(i + 1, elided),
+                        prepare=self.clipboard.prepare,
+                        limiter=self.chat_limiter
+                    )
+            except Exception as e:
+                # Give the buttons back, then let the thread report the traceback
+                if not scheduler.stopped:
+                    self.signals.animation_failed.emit(str(e) or type(e).__name__)
+                raise
+            if not scheduler.stopped:
+                self.signals.animation_complete.emit(elided)
             
-            for i, frame in enumerate(frames_to_play):
-                if not self.is_playing:
-                    break
-                
-                # Each frame is a list of 26-char lines
-                # Format with space after every 26 chars for Valorant
-                if isinstance(frame, list):
-                    formatted = format_frame_for_valorant(frame)
-                    if formatted:
-                        self.type_line_in_chat(formatted)
-                else:
-                    # Single line frame - add spaces every 26 chars
-                    if frame.strip():
-                        result = ""
-                        for j, char in enumerate(frame):
-                            result += char
-                            if (j + 1) % 26 == 0:
-                                result += " "
-                        self.type_line_in_chat(result.rstrip())
-                
-                self.signals.frame_played.emit(i + 1)
-                    
-                if i < len(frames_to_play) - 1 and self.is_playing:
-                    time.sleep(self.frame_delay)
-                    
-            self.signals.animation_complete.emit()
-            
-        threading.Thread(target=play_thread, daemon=True).start()
-        
-    def type_line_in_chat(self, line):
-        """Paste a line in Valorant all chat using clipboard"""
-        # Copy to clipboard
-        pyperclip.copy(line)
-        time.sleep(0.01)
-        
-        # Press Shift+Enter to open all chat
-        self.keyboard_controller.press(keyboard.Key.shift)
-        time.sleep(0.01)
-        self.keyboard_controller.press(keyboard.Key.enter)
-        time.sleep(0.01)
-        self.keyboard_controller.release(keyboard.Key.enter)
-        time.sleep(0.01)
-        self.keyboard_controller.release(keyboard.Key.shift)
-        time.sleep(0.02)
-        
-        # Paste with Ctrl+V
-        self.keyboard_controller.press(keyboard.Key.ctrl)
-        self.keyboard_controller.press('v')
-        self.keyboard_controller.release('v')
-        self.keyboard_controller.release(keyboard.Key.ctrl)
-        time.sleep(0.01)
-        
-        # Press Enter to send
-        self.keyboard_controller.press(keyboard.Key.enter)
-        self.keyboard_controller.release(keyboard.Key.enter)
-        
-    def on_frame_played(self, frame_num):
+        threading.Thread(target=play_thread, name="ValTime playback", daemon=True).start()
+        
+    def paste_prepared(self, prepared):
+        """Paste a line already prepared for the clipboard in all chat"""
+        # Copy to clipboard; returns once the clipboard holds the line
+        self.clipboard.copy_prepared(prepared)
+        
+        # Shift+Enter to open all chat, Ctrl+V to paste, Enter to send
+        self.injector.send(CHAT_PASTE)
+        
+    def on_frame_played(self, frame_num, elided):
         """Update UI when frame is played"""
-        base_frames = list(self.frames[::self.skip_frames])
-        # Account for possibly added last frame
-        if self.frames and base_frames[-1] is not self.frames[-1]:
-            total = len(base_frames) + 1
-        else:
-            total = len(base_frames)
-        self.status_label.setText(f"Playing frame {frame_num}/{total}")
+        self.status_label.setText(
+            f"Playing frame {frame_num}/{self.playback_total}" + elided_note(elided)
+        )
         
-    def on_animation_complete(self):
+    def on_animation_complete(self, elided):
         """Animation finished"""
         self.is_playing = False
         self.play_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
-        self.status_label.setText("Animation complete!")
+        self.pause_btn.setEnabled(False)
+        timing = self.scheduler.lateness_summary()
+        self.status_label.setText(
+            "Animation complete!" + elided_note(elided) +
+            f" - frames late by {timing['mean']:.1f} ms avg, {timing['max']:.1f} ms max"
+        )
+        
+    def on_animation_failed(self, message):
+        """Playback ended with an error (e.g. the clipboard could not be set)"""
+        self.is_playing = False
+        self.play_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
+        self.pause_btn.setEnabled(False)
+        self.pause_btn.setText("❚❚ Pause")
+        self.status_label.setText(f"Playback failed: {message}")
         
     def stop_animation(self):
-        """Stop the animation"""
+        """Stop the animation - takes effect right away, even mid-wait"""
+        self.scheduler.stop()
         self.is_playing = False
         self.play_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
+        self.pause_btn.setEnabled(False)
+        self.pause_btn.setText("❚❚ Pause")
         self.status_label.setText("Animation stopped")
+        
+    def toggle_pause(self):
+        """Pause or resume the animation"""
+        if self.scheduler.paused:
+            self.scheduler.resume()
+            self.pause_btn.setText("❚❚ Pause")
+        else:
+            self.scheduler.pause()
+            self.pause_btn.setText("▶ Resume")
+            self.status_label.setText("Animation paused")
 
 
 def main():
     app = QApplication(sys.argv)
     app.setStyle('Fusion')
     
+    # VALTIME_PROFILE=1 profiles the whole session (Pause toggles it too)
+    if profiling_requested():
+        PROFILER.start()
+    
     window = AnimationPlayer()
     window.show()
     
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    PROFILER.stop()
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,89 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Run any benchmark from the project root, e.g.:
+    python benchmarks/bench_frames.py
+
+benchmarks/suite.py runs the main hot paths and compares them with a
+saved JSON baseline.
+
+The scripts run headless: Qt uses the offscreen platform and, on Linux
+without a display, pynput falls back to its dummy backend.
+"""
+
+import os
+import sys
+import threading
+import time
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+    os.environ.setdefault("PYNPUT_BACKEND", "dummy")
+
+
+def bench(func, number=None, repeat=5):
+    """Time func and return the best per-call time in seconds"""
+    timer = timeit.Timer(func)
+    if number is None:
+        number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def report(name, seconds, baseline=None):
+    """Print one result line, with a speedup if a baseline time is given"""
+    line = f"  {name:<44} {seconds * 1e3:10.3f} ms"
+    if baseline:
+        line += f"   {baseline / seconds:6.1f}x"
+    print(line)
+
+
+def header(title):
+    print()
+    print(title)
+    print("-" * len(title))
+
+
+def quiet_listener():
+    """pynput's dummy backend fails in its thread; keep that out of the output"""
+    default = threading.excepthook
+
+    def hook(args):
+        if not issubclass(args.exc_type, NotImplementedError):
+            default(args)
+    threading.excepthook = hook
+
+
+def quiet_platform():
+    """The offscreen plugin warns on every opacity change; drop those warnings"""
+    from PyQt6.QtCore import qInstallMessageHandler
+
+    def handler(mode, context, message):
+        if "does not support" not in message:
+            print(message)
+    qInstallMessageHandler(handler)
+
+
+def run_until(condition, timeout=2.0):
+    """Process Qt events until condition() is true or timeout seconds pass"""
+    from PyQt6.QtWidgets import QApplication
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        QApplication.processEvents()
+        time.sleep(0.001)
+
+
+def wide_sprite(width, height=13):
+    """A sprite of the given size built by tiling the truck"""
+    from animation_player import TRUCK_SPRITE
+    return [(line * (width // len(line) + 1))[:width] for line in TRUCK_SPRITE[:height]]
+
+
+def long_animation(count=10_000):
+    """count frames of the truck scrolling by, over and over"""
+    from animation_player import TRUCK_ANIMATION
+    return [TRUCK_ANIMATION[i % len(TRUCK_ANIMATION)] for i in range(count)]
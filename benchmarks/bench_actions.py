@@ -0,0 +1,74 @@
+"""Action dispatch latency: a threading.Timer per action vs the ActionWorker"""
+
+import statistics
+import threading
+import time
+
+from _common import header
+
+from actions import PRIORITY_CHAT, PRIORITY_VOICELINE, ActionWorker
+
+ACTIONS = 2000
+
+
+def summary(latencies):
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return (f"median {statistics.median(latencies) * 1e6:8.1f} us   "
+            f"p99 {p99 * 1e6:8.1f} us   max {latencies[-1] * 1e6:8.1f} us")
+
+
+def timer_latencies():
+    """Start-up latency of a fresh threading.Timer(0) per action"""
+    latencies = []
+    for _ in range(ACTIONS):
+        done = threading.Event()
+        submitted = time.perf_counter()
+
+        def run():
+            latencies.append(time.perf_counter() - submitted)
+            done.set()
+
+        threading.Timer(0, run).start()
+        done.wait()
+    return latencies
+
+
+def worker_latencies(worker):
+    """Submit-to-start latency on the persistent worker"""
+    latencies = []
+    for _ in range(ACTIONS):
+        action = worker.submit(lambda action: None, PRIORITY_CHAT)
+        action.wait()
+        latencies.append(action.started - action.submitted)
+    return latencies
+
+
+def voiceline_behind_queue(worker, queued=50):
+    """Latency of a voiceline submitted behind a queue of chat actions"""
+    gate = threading.Event()
+    worker.submit(lambda action: gate.wait(), PRIORITY_CHAT)
+    for _ in range(queued):
+        worker.submit(lambda action: time.sleep(0.0001), PRIORITY_CHAT)
+    voiceline = worker.submit(lambda action: None, PRIORITY_VOICELINE)
+    released = time.perf_counter()
+    gate.set()
+    voiceline.wait()
+    return voiceline.started - released
+
+
+def main():
+    worker = ActionWorker()
+    header(f"Dispatch latency, {ACTIONS} actions")
+    print(f"  threading.Timer per action  {summary(timer_latencies())}")
+    print(f"  ActionWorker                {summary(worker_latencies(worker))}")
+
+    header("Voiceline queued behind 50 chat actions")
+    latency = voiceline_behind_queue(worker)
+    print(f"  starts {latency * 1e6:.1f} us after the running action finishes "
+          f"(runs ahead of the queue)")
+    worker.close()
+
+
+if __name__ == "__main__":
+    main()
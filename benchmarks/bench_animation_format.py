@@ -0,0 +1,76 @@
+"""Load time, memory and file size: JSON animations vs the binary .vta format"""
+
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from _common import bench, header, report
+
+from animation_format import read_animation, write_animation
+from animation_player import TRUCK_SPRITE, generate_scroll_frames
+
+
+def long_animation(frame_count):
+    """A 10k+ frame scrolling animation built from a 200-column sprite"""
+    sprite = [(line * 8)[:200] for line in TRUCK_SPRITE]
+    frames = generate_scroll_frames(sprite, 26, wrap=True)
+    return (frames * (frame_count // len(frames) + 1))[:frame_count]
+
+
+def load_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["frames"]
+
+
+def held_memory(load):
+    """Python memory still held after load() returns (result kept alive)"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = load()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        for frame_count in (10_000, 50_000):
+            frames = long_animation(frame_count)
+            json_path = os.path.join(tmp, "anim.json")
+            vta_path = os.path.join(tmp, "anim.vta")
+            with open(json_path, "w", encoding="utf-8") as f:
+                json.dump({"frames": frames, "delay": 0.5}, f, indent=2)
+            start = time.perf_counter()
+            write_animation(vta_path, frames, 0.5)
+            write_time = time.perf_counter() - start
+
+            header(f"{frame_count} frames of 13 x 26")
+            print(f"  file size: json {os.path.getsize(json_path) / 1e6:.2f} MB, "
+                  f"vta {os.path.getsize(vta_path) / 1e6:.2f} MB "
+                  f"(written in {write_time:.2f} s)")
+
+            json_load = bench(lambda: load_json(json_path), number=1, repeat=3)
+            report("json.load whole file", json_load)
+            report("open .vta (mmap)", bench(lambda: read_animation(vta_path).close()), json_load)
+
+            animation = read_animation(vta_path)
+            positions = [random.randrange(frame_count) for _ in range(100)]
+            report("random frame access (.vta, per frame)",
+                   bench(lambda: [animation[p] for p in positions], number=10) / 100)
+            report("read all frames in order (.vta)",
+                   bench(lambda: list(animation), number=1, repeat=3), json_load)
+            assert list(animation) == frames
+            animation.close()
+
+            _, json_mem = held_memory(lambda: load_json(json_path))
+            vta, vta_mem = held_memory(lambda: read_animation(vta_path))
+            vta.close()
+            print(f"  memory held: json {json_mem / 1e6:.1f} MB, .vta {vta_mem / 1e3:.1f} kB "
+                  "(mapped pages are shared page cache)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Clipboard copies per second: pyperclip.copy + sleep vs the session backends"""
+
+import threading
+import time
+
+from _common import header
+
+from PyQt6.QtWidgets import QApplication
+
+from animation_player import TRUCK_ANIMATION
+from clipboard import CLIPBOARDS, ClipboardError, PyperclipClipboard
+from frames import format_frame_for_valorant
+
+COPIES = 200
+
+
+def available(name):
+    """The clipboard backend called name if it works here, or None"""
+    try:
+        backend = CLIPBOARDS[name]()
+        backend.copy("ValTime")
+        return backend
+    except Exception as e:  # pyperclip raises its own PyperclipException
+        print(f"  {name:<12} unavailable ({e.__class__.__name__})")
+        return None
+
+
+def copies_per_second(backend, payloads):
+    started = time.perf_counter()
+    for i in range(COPIES):
+        backend.copy(payloads[i % len(payloads)])
+    return COPIES / (time.perf_counter() - started)
+
+
+def report(name, rate, baseline=None):
+    line = f"  {name:<32} {rate:10.0f} copies/s"
+    if baseline:
+        line += f"   {rate / baseline:6.1f}x"
+    print(line)
+
+
+def run(payloads):
+    rates = {}
+    header(f"Clipboard, {COPIES} chat payloads")
+    for name in ("pyperclip", "windows", "qt", "recording"):
+        backend = available(name)
+        if backend is None:
+            continue
+        if isinstance(backend, PyperclipClipboard):
+            # The old code path: copy, then a fixed 10 ms to let it settle
+            rates["pyperclip + sleep(0.01)"] = copies_per_second(backend, payloads)
+            backend.settle = 0
+            rates["pyperclip, no sleep"] = copies_per_second(backend, payloads)
+        else:
+            rates[name] = copies_per_second(backend, payloads)
+
+    baseline = rates.get("pyperclip + sleep(0.01)")
+    for name, rate in rates.items():
+        report(name, rate, baseline)
+    if baseline is None:
+        print("  (pyperclip has no copy mechanism here - install xclip/xsel "
+              "for a baseline)")
+
+    # Playback copies from a worker thread; the Qt backend hands those to
+    # the GUI thread, so measure that path too
+    qt = available("qt")
+    if qt is not None:
+        result = {}
+
+        def worker():
+            try:
+                result["rate"] = copies_per_second(qt, payloads)
+            except ClipboardError as e:
+                result["error"] = str(e)
+            QApplication.instance().quit()
+
+        threading.Thread(target=worker, daemon=True).start()
+        QApplication.instance().exec()
+        if "rate" in result:
+            report("qt, from a worker thread", result["rate"], baseline)
+
+
+def main():
+    app = QApplication.instance() or QApplication([])
+    payloads = [format_frame_for_valorant(TRUCK_ANIMATION[i])
+                for i in range(0, len(TRUCK_ANIMATION), 5)]
+    run(payloads)
+    del app
+
+
+if __name__ == "__main__":
+    main()
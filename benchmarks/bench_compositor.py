@@ -0,0 +1,45 @@
+"""Layered compositor: dirty-region re-rendering vs full-frame redraws"""
+
+from _common import bench, header, report
+
+from animation_player import TRUCK_SPRITE, TRUCK_WIDTH
+from compositor import Compositor, Layer, linear_path, mirror_sprite
+
+
+def passing_trucks(width, height, dirty_regions):
+    """Two trucks passing each other in a width x height viewport"""
+    truck_y = (height - len(TRUCK_SPRITE)) // 2
+    return Compositor(width, height, [
+        Layer(TRUCK_SPRITE, linear_path(-TRUCK_WIDTH, truck_y, dx=1), z=1),
+        Layer(mirror_sprite(TRUCK_SPRITE), linear_path(width, truck_y, dx=-1), z=0),
+    ], dirty_regions=dirty_regions)
+
+
+def render_only(scene, count):
+    scene.reset()
+    for i in range(count):
+        scene.render(i)
+
+
+def main():
+    header("Two trucks passing (frames rendered to code-point arrays)")
+    for width, height in [(26, 13), (200, 13), (200, 60), (400, 120)]:
+        count = width + TRUCK_WIDTH + 1
+        full_scene = passing_trucks(width, height, dirty_regions=False)
+        dirty_scene = passing_trucks(width, height, dirty_regions=True)
+        assert (full_scene.render_frames(count) == dirty_scene.render_frames(count)).all()
+
+        full = bench(lambda: full_scene.render_frames(count), repeat=3)
+        report(f"{width}x{height}, {count} frames (full redraw)", full)
+        report(f"{width}x{height}, {count} frames (dirty regions)",
+               bench(lambda: dirty_scene.render_frames(count), repeat=3), full)
+
+        # Rendering cost alone, without storing every frame
+        full = bench(lambda: render_only(full_scene, count), repeat=3)
+        report(f"{width}x{height} render only (full redraw)", full)
+        report(f"{width}x{height} render only (dirty regions)",
+               bench(lambda: render_only(dirty_scene, count), repeat=3), full)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Memory per frame: plain list of frames vs the line-dictionary FrameStore"""
+
+import json
+import tracemalloc
+
+from _common import ROOT, header
+
+from animation_player import TRUCK_SPRITE, generate_scroll_frames
+from frames import FrameStore
+
+
+def wide_scroll(width, repeats):
+    """A long imported animation: a 200-column sprite scrolled several times"""
+    sprite = [(line * (width // len(line) + 1))[:width] for line in TRUCK_SPRITE]
+    return generate_scroll_frames(sprite, 26) * repeats
+
+
+def measure(build):
+    """Bytes allocated (and still held) by build()"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return result, size
+
+
+def compare(name, text):
+    # Parse inside the measurement so lines are separate str objects,
+    # exactly as AnimationPlayer.load_animation gets them
+    frames, list_size = measure(lambda: json.loads(text)["frames"])
+    store, store_size = measure(lambda: FrameStore(json.loads(text)["frames"]))
+    assert list(store) == frames
+    count = len(frames)
+    stats = store.stats()
+    print(f"  {name}: {count} frames, {stats['unique_lines']} unique lines")
+    print(f"    list of frames  {list_size / count:10.0f} bytes/frame")
+    print(f"    FrameStore      {store_size / count:10.0f} bytes/frame"
+          f"   ({(store_size - list_size) / list_size:+.0%})")
+
+
+def typing():
+    """Lines held after typing a 200-character frame one keystroke at a time"""
+    store = FrameStore(generate_scroll_frames(TRUCK_SPRITE, 26))
+    before = store.stats()["unique_lines"]
+    text = ""
+    for char in ("abcdefghij" * 20):
+        text += char
+        store[0] = text  # What AnimationPlayer.on_editor_changed does
+    print(f"  typing 200 keystrokes into a frame: {before} -> "
+          f"{store.stats()['unique_lines']} unique lines held")
+
+
+def main():
+    header("Frame memory")
+    with open(f"{ROOT}/truck_animation.json", encoding="utf-8") as f:
+        compare("truck_animation.json", f.read())
+    compare("truck scroll", json.dumps({"frames": generate_scroll_frames(TRUCK_SPRITE, 26)}))
+    compare("200-col scroll x50", json.dumps({"frames": wide_scroll(200, 50)}))
+
+    header("Editing")
+    typing()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Frame generation: sliding-window scroll generator vs the per-character loop"""
+
+from _common import bench, header, report, wide_sprite
+
+from animation_player import (
+    TRUCK_SPRITE, BG_CHAR, SCREEN_WIDTH, generate_scroll_frames
+)
+
+
+def legacy_scroll_frames(sprite, screen_width):
+    """The original generate_truck_frames loop, generalised to any width"""
+    sprite_width = len(sprite[0])
+    frames = []
+    for truck_pos in range(-sprite_width, screen_width + 1):
+        frame_lines = []
+        for sprite_line in sprite:
+            line = ""
+            for screen_x in range(screen_width):
+                truck_x = screen_x - truck_pos
+                if 0 <= truck_x < sprite_width:
+                    line += sprite_line[truck_x]
+                else:
+                    line += BG_CHAR
+            frame_lines.append(line)
+        frames.append(frame_lines)
+    return frames
+
+
+def main():
+    cases = [
+        ("truck 26 cols / 26 viewport", TRUCK_SPRITE, SCREEN_WIDTH),
+        ("200 cols / 26 viewport", wide_sprite(200), SCREEN_WIDTH),
+        ("200 cols / 200 viewport", wide_sprite(200), 200),
+    ]
+    header("Scroll frame generation")
+    for name, sprite, width in cases:
+        assert generate_scroll_frames(sprite, width) == legacy_scroll_frames(sprite, width)
+        legacy = bench(lambda: legacy_scroll_frames(sprite, width), repeat=3)
+        report(f"{name} (legacy)", legacy)
+        report(f"{name} (sliding window)",
+               bench(lambda: generate_scroll_frames(sprite, width)), legacy)
+
+
+if __name__ == "__main__":
+    main()
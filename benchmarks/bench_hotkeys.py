@@ -0,0 +1,97 @@
+"""Hotkey callback cost per key event: the old on_press vs HotkeyDispatcher"""
+
+import random
+import time
+import tracemalloc
+
+from _common import header
+
+from PyQt6.QtWidgets import QApplication, QWidget
+from pynput import keyboard
+from pynput.keyboard import Key, KeyCode
+
+from hotkeys import HotkeyDispatcher
+
+EVENTS = 200_000
+
+
+def legacy_on_press(widget, toggle, select, back):
+    """The on_press callback as it was before HotkeyDispatcher"""
+    def on_press(key):
+        try:
+            if hasattr(key, 'char') and key.char == '.':
+                toggle()
+            if widget.isVisible() and hasattr(key, 'char') and key.char in '123456':
+                select(int(key.char))
+        except AttributeError:
+            pass
+        if key == keyboard.Key.esc and widget.isVisible():
+            back()
+    return on_press
+
+
+def game_keys(count):
+    """Synthetic in-game typing: mostly movement and abilities, a few hotkeys"""
+    common = [KeyCode.from_char(c) for c in "wasdqecfgr"] + [Key.shift, Key.ctrl, Key.space]
+    rare = [KeyCode.from_char(c) for c in "123456"] + [Key.esc]
+    rng = random.Random(1)
+    return [rng.choice(rare) if rng.random() < 0.02 else rng.choice(common)
+            for _ in range(count)]
+
+
+def replay(callback, keys):
+    started = time.perf_counter()
+    for key in keys:
+        callback(key)
+    return (time.perf_counter() - started) / len(keys)
+
+
+def allocations(callback, keys):
+    """Peak bytes allocated above the starting point while replaying keys"""
+    tracemalloc.start()
+    callback(keys[0])  # warm up under tracing
+    base = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    for key in keys:
+        callback(key)
+    peak = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    app = QApplication.instance() or QApplication([])
+    widget = QWidget()
+    widget.show()
+    noop = lambda *args: None
+
+    keys = game_keys(EVENTS)
+    legacy = legacy_on_press(widget, noop, noop, noop)
+    dispatcher = HotkeyDispatcher(noop, noop, noop)
+    dispatcher.visible = True
+
+    header(f"{EVENTS} synthetic key events, overlay visible")
+    old = replay(legacy, keys)
+    new = replay(dispatcher.on_press, keys)
+    print(f"  old on_press          {old * 1e9:8.0f} ns/event   {1 / old:12,.0f} events/s")
+    print(f"  HotkeyDispatcher      {new * 1e9:8.0f} ns/event   {1 / new:12,.0f} events/s"
+          f"   {old / new:5.1f}x")
+
+    header("Irrelevant keys only")
+    irrelevant = [KeyCode.from_char("w"), Key.shift] * 5000
+    for name, callback in (("old on_press", legacy), ("HotkeyDispatcher", dispatcher.on_press)):
+        peak = allocations(callback, irrelevant)
+        print(f"  {name:<20}  peak allocated {peak:6d} bytes over {len(irrelevant)} events")
+
+    header("Holding '.' (1000 auto-repeat presses)")
+    posted = []
+    toggles = HotkeyDispatcher(lambda: posted.append(1), noop, noop)
+    dot = KeyCode.from_char(".")
+    for _ in range(1000):
+        toggles.on_press(dot)
+    print(f"  old on_press posts 1000 toggles, HotkeyDispatcher posts {len(posted)}")
+    del app
+
+
+if __name__ == "__main__":
+    main()
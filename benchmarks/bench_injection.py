@@ -0,0 +1,54 @@
+"""Per-message cost of each injection backend for one chat paste"""
+
+import sys
+
+from _common import bench, header, report
+
+from injection import (NativeBackend, PynputBackend, RecordingBackend,
+                       chat_sequence, without_waits)
+
+
+def available(backend_class):
+    """An instance of backend_class that can actually type here, or None"""
+    try:
+        backend = backend_class()
+        backend.send([])
+        # pynput's dummy backend (headless Linux) only fails on use
+        if isinstance(backend, PynputBackend):
+            backend.send([("release", "shift")])
+        return backend
+    except (OSError, NotImplementedError, ImportError) as e:
+        print(f"  {backend_class.name}: unavailable ({e.__class__.__name__})")
+        return None
+
+
+def main():
+    sequence = chat_sequence()
+    events = without_waits(sequence)
+
+    header(f"Chat paste, key events only ({len(events)} events)")
+    baseline = bench(lambda: RecordingBackend(sleep=False).send(events))
+    report("recording", baseline)
+    for backend_class in (PynputBackend, NativeBackend):
+        backend = available(backend_class)
+        if backend is not None:
+            report(backend.name, bench(lambda: backend.send(events)), baseline)
+
+    header("Chat paste, with waits (latency per message)")
+    report("recording", bench(lambda: RecordingBackend().send(sequence), number=20))
+    waits = sum(value for action, value in sequence if action == "wait")
+    print(f"  (waits in the sequence: {waits * 1e3:.0f} ms)")
+
+    recorder = RecordingBackend()
+    recorder.send(sequence)
+    first = recorder.events[0][0]
+    header("Recorded timeline")
+    for timestamp, action, key in recorder.events:
+        print(f"  {(timestamp - first) / 1e6:8.2f} ms  {action:<8} {key}")
+
+    if sys.platform != "win32":
+        print("\n  (native SendInput backend is only measured on Windows)")
+
+
+if __name__ == "__main__":
+    main()
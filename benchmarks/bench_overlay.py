@@ -0,0 +1,262 @@
+"""Overlay build, show, switch, paint and memory costs under the offscreen Qt platform"""
+
+import contextlib
+import io
+import os
+import statistics
+import time
+
+from _common import bench, header, quiet_listener
+
+from PyQt6.QtCore import QEvent, QObject, Qt
+from PyQt6.QtGui import QColor, QFont, QImage, QPainter
+from PyQt6.QtWidgets import QApplication, QFrame, QHBoxLayout, QLabel
+
+import overlay
+
+SWITCHES = 300
+SHOWS = 100
+BUILDS = 15
+
+
+def make_menu(render_mode="widgets"):
+    overlay.RENDER_MODE = render_mode
+    menu = overlay.CommunicationMenu()
+    menu.show()
+    QApplication.processEvents()
+    return menu
+
+
+class LegacyStyledMenu(overlay.CommunicationMenu):
+    """The menu as it was styled before style.py: inline CSS and new fonts per widget"""
+
+    def __init__(self):
+        # Inline CSS only, without the overlay stylesheet
+        install_stylesheet = overlay.install_stylesheet
+        overlay.install_stylesheet = lambda widget: None
+        try:
+            super().__init__()
+        finally:
+            overlay.install_stylesheet = install_stylesheet
+        self.container.setStyleSheet("""
+            #container {
+                background-color: transparent;
+                border: 1px solid rgba(255, 255, 255, 200);
+                border-radius: 3px;
+            }
+        """)
+        self.options_frame.setStyleSheet("background: transparent;")
+
+    def create_header(self):
+        header = QFrame()
+        header.setFixedHeight(50)
+        header.setStyleSheet("background-color: rgba(255, 255, 255, 220); border-bottom: 1px solid rgba(255, 255, 255, 255); border-top-left-radius: 3px; border-top-right-radius: 3px;")
+        layout = QHBoxLayout(header)
+        layout.setContentsMargins(12, 0, 12, 0)
+        layout.setSpacing(10)
+        icon_label = QLabel("📡")
+        icon_label.setStyleSheet("font-size: 18px; background: transparent;")
+        self.header_title = QLabel("COMMUNICATION")
+        self.header_title.setFont(QFont("Segoe UI", 14, QFont.Weight.DemiBold))
+        self.header_title.setStyleSheet("color: rgba(0, 0, 0, 0.85); letter-spacing: 1px; background: transparent;")
+        layout.addWidget(icon_label)
+        layout.addWidget(self.header_title)
+        layout.addStretch()
+        return header
+
+    def create_option(self, num, text):
+        option = QFrame()
+        option.setObjectName(f"option_{num}")
+        option.setFixedHeight(32)
+        option.setStyleSheet("""
+            QFrame {
+                background: transparent;
+            }
+            QFrame:hover {
+                background-color: rgba(255, 255, 255, 0.06);
+            }
+        """)
+        option.setCursor(Qt.CursorShape.PointingHandCursor)
+        layout = QHBoxLayout(option)
+        layout.setContentsMargins(10, 0, 10, 0)
+        layout.setSpacing(6)
+        key_label = QLabel(f"{num}:")
+        key_label.setFont(QFont("Segoe UI", 12, QFont.Weight.Bold))
+        key_label.setStyleSheet("color: rgba(255, 255, 255, 1.0);")
+        key_label.setFixedWidth(24)
+        text_label = QLabel(text)
+        text_label.setFont(QFont("Segoe UI", 12, QFont.Weight.Bold))
+        text_label.setStyleSheet("color: rgba(255, 255, 255, 1.0);")
+        text_label.setObjectName(f"text_{num}")
+        self.option_labels.append((option, text_label, num))
+        layout.addWidget(key_label)
+        layout.addWidget(text_label)
+        layout.addStretch()
+        option.mousePressEvent = lambda e, n=num: self.select_option(n)
+        return option
+
+    def create_footer(self):
+        footer = QFrame()
+        footer.setFixedHeight(26)
+        footer.setStyleSheet("background: transparent; border-top: 1px solid rgba(255, 255, 255, 8);")
+        footer.setCursor(Qt.CursorShape.PointingHandCursor)
+        layout = QHBoxLayout(footer)
+        layout.setContentsMargins(10, 0, 10, 0)
+        layout.setSpacing(5)
+        esc_label = QLabel("Esc")
+        esc_label.setFont(QFont("Segoe UI", 10))
+        esc_label.setStyleSheet("color: rgba(255, 255, 255, 0.35);")
+        self.footer_text = QLabel("Close")
+        self.footer_text.setFont(QFont("Segoe UI", 11))
+        self.footer_text.setStyleSheet("color: rgba(255, 255, 255, 0.5);")
+        layout.addWidget(esc_label)
+        layout.addWidget(self.footer_text)
+        layout.addStretch()
+        footer.mousePressEvent = lambda e: self.handle_back()
+        return footer
+
+
+def legacy_rebuild(menu):
+    """rebuild_options as it was: delete every row and build new ones"""
+    menu.option_labels = []
+    while menu.options_layout.count():
+        child = menu.options_layout.takeAt(0)
+        if child.widget():
+            child.widget().deleteLater()
+    for i, option_text in enumerate(menu.options, 1):
+        menu.options_layout.addWidget(menu.create_option(i, option_text))
+
+
+def navigate(menu, rebuild):
+    """Enter each submenu and go back, as the hotkeys do; seconds per switch"""
+    submenus = [name for name in menu.main_options if name in menu.submenus]
+    switches = 0
+    started = time.perf_counter()
+    while switches < SWITCHES:
+        for name in submenus:
+            for options in (menu.submenus[name], menu.main_options):
+                menu.current_menu = name if options is not menu.main_options else "main"
+                menu.options = options
+                rebuild(menu)
+                menu.update_header_title()
+                # Layout, deferred deletes and a repaint, as the event loop would
+                QApplication.processEvents()
+                QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+                menu.repaint()
+                switches += 1
+    return (time.perf_counter() - started) / switches
+
+
+def show_and_navigate(menu_class):
+    """
+    Seconds to build and first show a menu (median), and seconds per cycle of
+    showing it, entering a submenu, going back and hiding it again
+    """
+    with contextlib.redirect_stdout(io.StringIO()):  # "Selected: ..." and blur warnings
+        return _show_and_navigate(menu_class)
+
+
+def _show_and_navigate(menu_class):
+    builds = []
+    for _ in range(BUILDS):
+        started = time.perf_counter()
+        menu = menu_class()
+        menu.toggle_visibility()
+        QApplication.processEvents()
+        menu.repaint()
+        builds.append(time.perf_counter() - started)
+        if len(builds) < BUILDS:
+            menu.hide()
+            menu.deleteLater()
+            QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+    build = statistics.median(builds)
+
+    started = time.perf_counter()
+    for _ in range(SHOWS):
+        menu.toggle_visibility()  # Hide
+        QApplication.processEvents()
+        menu.toggle_visibility()  # Show
+        for step in (lambda: menu.select_option(1), menu.handle_back):
+            step()
+            QApplication.processEvents()
+            QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+            menu.repaint()
+    cycle = (time.perf_counter() - started) / SHOWS
+    menu.hide()
+    menu.deleteLater()
+    QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+    return build, cycle
+
+
+def paint_time(menu):
+    """Seconds to paint the whole menu into an image"""
+    image = QImage(menu.size(), QImage.Format.Format_ARGB32_Premultiplied)
+    image.fill(QColor(40, 60, 80))
+
+    def paint():
+        painter = QPainter(image)
+        menu.render(painter)
+        painter.end()
+    return bench(paint, repeat=3)
+
+
+def rss_kib():
+    """Resident memory of this process in KiB (Linux)"""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def build_cost(render_mode, count=20):
+    """QObjects per menu and resident memory per menu in KiB"""
+    before = rss_kib()
+    menus = [make_menu(render_mode) for _ in range(count)]
+    per_menu = (rss_kib() - before) / count
+    objects = len(menus[0].findChildren(QObject))
+    for menu in menus:
+        menu.hide()
+        menu.deleteLater()
+    QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+    return objects, per_menu
+
+
+def main():
+    quiet_listener()
+    app = QApplication.instance() or QApplication([])
+
+    header(f"Build and show, then {SHOWS} show/navigate/hide cycles (offscreen)")
+    show_and_navigate(LegacyStyledMenu)  # Warm up font loading and the platform plugin
+    # Alternate the two and keep each one's best run, so neither gets the quiet moments
+    legacy_runs, runs = [], []
+    for _ in range(3):
+        legacy_runs.append(show_and_navigate(LegacyStyledMenu))
+        runs.append(show_and_navigate(overlay.CommunicationMenu))
+    legacy_build, legacy_cycle = map(min, zip(*legacy_runs))
+    build, cycle = map(min, zip(*runs))
+    print(f"  inline stylesheets     build+show {legacy_build * 1e3:7.2f} ms   "
+          f"cycle {legacy_cycle * 1e3:7.3f} ms")
+    print(f"  shared stylesheet      build+show {build * 1e3:7.2f} ms   "
+          f"cycle {cycle * 1e3:7.3f} ms   ({legacy_build / build:.2f}x, {legacy_cycle / cycle:.2f}x)")
+
+    header(f"Menu switch latency ({SWITCHES} switches, offscreen)")
+    before = navigate(make_menu(), legacy_rebuild)
+    after = navigate(make_menu(), overlay.CommunicationMenu.rebuild_options)
+    print(f"  rebuild every row      {before * 1e3:8.3f} ms/switch")
+    print(f"  pooled rows            {after * 1e3:8.3f} ms/switch   {before / after:5.1f}x")
+    painted = navigate(make_menu("painted"), overlay.CommunicationMenu.rebuild_options)
+    print(f"  painted menu           {painted * 1e3:8.3f} ms/switch   {before / painted:5.1f}x")
+
+    header("Widget tree vs painted menu")
+    for mode in ("widgets", "painted"):
+        menu = make_menu(mode)
+        menu.select_option(3)  # A five-option submenu
+        QApplication.processEvents()
+        paint = paint_time(menu)
+        menu.hide()
+        objects, memory = build_cost(mode)
+        print(f"  {mode:<10} paint {paint * 1e3:7.3f} ms   {objects:3d} QObjects   "
+              f"~{memory:6.0f} KiB/menu")
+    del app
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Keypress-to-voiceline latency while a chat animation is playing, with and
+without preemption at frame boundaries.
+"""
+
+import random
+import time
+
+from _common import header
+
+from actions import ABORT, PRIORITY_ANIMATION, PRIORITY_VOICELINE, SUSPEND, ActionWorker
+from injection import RecordingBackend, chat_sequence, voiceline_sequence
+from playback import PlaybackScheduler, run_playback
+
+FRAMES = 20
+FRAME_DELAY = 0.1
+VOICELINES = 5
+VOICELINE_DELAY = 0.05  # the overlay's delay before a voiceline
+PRESS_GAP = 0.35  # voicelines far enough apart not to queue behind each other
+
+
+def play(preempt):
+    """Play one animation, pressing voicelines at random moments"""
+    worker = ActionWorker()
+    injector = RecordingBackend()
+    send_times = []
+
+    def send(payload):
+        started = time.perf_counter()
+        injector.send(chat_sequence())
+        send_times.append(time.perf_counter() - started)
+
+    def animation(action):
+        scheduler = PlaybackScheduler()
+        action.on_cancel(scheduler.stop)
+        if preempt is not None:
+            action.on_preempt(scheduler.request_yield)
+            scheduler.on_yield = action.yield_to_preempting
+        run_playback([f"frame {i}" for i in range(FRAMES)], send, FRAME_DELAY,
+                     scheduler=scheduler)
+
+    playing = worker.submit(animation, PRIORITY_ANIMATION)
+    # A random moment within each frame period, so presses land both during
+    # sends and between them
+    presses = [0.1 + i * PRESS_GAP + random.uniform(0, FRAME_DELAY)
+               for i in range(VOICELINES)]
+    if preempt == ABORT:
+        presses = presses[:1]
+
+    voicelines = []
+    started = time.perf_counter()
+    for at in presses:
+        time.sleep(max(0.0, started + at - time.perf_counter()))
+        voicelines.append(worker.submit(
+            lambda action: injector.send(voiceline_sequence(1, 1)),
+            PRIORITY_VOICELINE, delay=VOICELINE_DELAY, preempt=preempt or SUSPEND
+        ))
+    for voiceline in voicelines:
+        voiceline.wait()
+    playing.wait()
+    worker.close()
+
+    latencies = [v.started - v.submitted for v in voicelines]
+    return latencies, max(send_times), playing.status
+
+
+def report(name, latencies, longest_send, status):
+    latencies = sorted(latencies)
+    print(f"  {name:<22} mean {sum(latencies) / len(latencies) * 1e3:7.1f} ms   "
+          f"max {latencies[-1] * 1e3:7.1f} ms   (animation {status})")
+    return latencies[-1]
+
+
+def main():
+    random.seed(1)
+    header(f"Voiceline latency during a {FRAMES}-frame animation "
+           f"({FRAME_DELAY * 1e3:.0f} ms frames)")
+    report("no preemption", *play(None))
+    _, longest_send, _ = result = play(SUSPEND)
+    worst = report("suspend + resume", *result)
+    report("abort", *play(ABORT))
+    bound = VOICELINE_DELAY + longest_send
+    print(f"  bound: {VOICELINE_DELAY * 1e3:.0f} ms delay + one chat paste "
+          f"({longest_send * 1e3:.1f} ms) = {bound * 1e3:.1f} ms"
+          f"  -> {'within' if worst <= bound + 0.005 else 'EXCEEDED'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Highest chat throughput a rate-limited chat accepts without dropping
+messages, found offline against a SimulatedChat.
+"""
+
+from _common import header
+
+from playback import PlaybackPacer, run_playback
+from ratelimit import SimulatedChat, TokenBucket
+
+CHAT_RATE = 50.0  # messages per second the simulated chat accepts
+CHAT_BURST = 5
+MESSAGES = 60
+LIMITER_RATES = (25.0, 40.0, 50.0, 60.0, 80.0)
+
+
+def play(limiter, pacer=None):
+    chat = SimulatedChat(CHAT_RATE, CHAT_BURST)
+    payloads = [f"frame {i}" for i in range(MESSAGES)]
+    run_playback(payloads, chat.receive, frame_delay=0, pacer=pacer, limiter=limiter)
+    return chat
+
+
+def report(name, chat):
+    total = len(chat.delivered) + len(chat.dropped)
+    print(f"  {name:<26} sent {total:4d}   delivered {len(chat.delivered):4d}   "
+          f"dropped {len(chat.dropped):4d}   {chat.throughput():6.1f} msg/s")
+
+
+def main():
+    header(f"Simulated chat: {CHAT_RATE:.0f} msg/s, burst {CHAT_BURST}, "
+           f"{MESSAGES} messages with no frame delay")
+    report("no limiter", play(None))
+    best = None
+    for rate in LIMITER_RATES:
+        chat = play(TokenBucket(rate, CHAT_BURST))
+        report(f"limiter {rate:.0f}/s", chat)
+        if not chat.dropped:
+            best = max(best or 0.0, chat.throughput())
+    if best:
+        print(f"  highest throughput with nothing dropped: {best:.1f} msg/s")
+
+    header("Target FPS above the limit: the pacer adapts instead of the chat dropping")
+    pacer = PlaybackPacer.for_fps(MESSAGES, 2 * CHAT_RATE, send_cost=0.0)
+    report(f"{2 * CHAT_RATE:.0f} fps, limiter {CHAT_RATE:.0f}/s",
+           play(TokenBucket(CHAT_RATE, CHAT_BURST), pacer))
+
+
+if __name__ == "__main__":
+    main()
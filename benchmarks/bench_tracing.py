@@ -0,0 +1,90 @@
+"""Tracing overhead, and hotkey-to-paint / hotkey-to-keystroke latency headless"""
+
+import contextlib
+import io
+import os
+import tempfile
+import threading
+
+from _common import bench, header, quiet_listener, run_until
+
+from PyQt6.QtWidgets import QApplication
+from pynput.keyboard import KeyCode
+
+import overlay
+from hotkeys import HotkeyDispatcher
+from tracing import TRACER
+
+VOICELINES = 30
+
+
+def overhead():
+    """Per-event cost of a traced hotkey handler and of rebuild_options"""
+    noop = lambda *args: None
+    dispatcher = HotkeyDispatcher(noop, noop, noop)
+    dispatcher.visible = True
+    one = KeyCode.from_char("1")
+    menu = overlay.CommunicationMenu()
+    results = {}
+    for enabled in (False, True):
+        TRACER.enabled = enabled
+        results[enabled] = (bench(lambda: dispatcher.on_press(one)),
+                            bench(menu.rebuild_options))
+        TRACER.clear()
+    TRACER.enabled = False
+    menu.deleteLater()
+    return results
+
+
+def press(menu, char):
+    """A key press as the pynput listener thread delivers it"""
+    key = KeyCode.from_char(char)
+    listener = threading.Thread(target=menu.hotkeys.on_press, args=(key,))
+    listener.start()
+    listener.join()
+    menu.hotkeys.on_release(key)
+
+
+def voicelines():
+    """Show the menu, pick Combat -> Need Healing, wait for the keys and the hide"""
+    TRACER.enabled = True
+    os.environ["VALTIME_INPUT_BACKEND"] = "recording"
+    menu = overlay.CommunicationMenu()
+    recorder = menu.injector.backend
+    for _ in range(VOICELINES):
+        press(menu, ".")
+        run_until(menu.is_shown)
+        press(menu, "3")
+        run_until(lambda: menu.current_menu == "Combat")
+        keys = len(recorder.events)
+        press(menu, "3")
+        run_until(lambda: len(recorder.events) >= keys + 6 and not menu.is_shown())
+        assert len(recorder.events) == keys + 6, "voiceline keys missing"
+    menu.actions.close()
+    menu.hide()
+    TRACER.enabled = False
+
+
+def main():
+    quiet_listener()
+    app = QApplication.instance() or QApplication([])
+
+    header("Tracing overhead per call")
+    results = overhead()
+    for enabled, (hotkey, rebuild) in results.items():
+        label = "enabled " if enabled else "disabled"
+        print(f"  {label}   hotkey handler {hotkey * 1e9:7.0f} ns   "
+              f"rebuild_options {rebuild * 1e6:7.2f} us")
+
+    header(f"{VOICELINES} voicelines, offscreen, recording backend with real waits")
+    with contextlib.redirect_stdout(io.StringIO()):  # "Selected: ..."
+        voicelines()
+    print(TRACER.report())
+    path = os.path.join(tempfile.gettempdir(), "valtime-bench-trace.json")
+    TRACER.export_chrome_trace(path)
+    print(f"  {len(TRACER.events)} events written to {path}")
+    del app
+
+
+if __name__ == "__main__":
+    main()
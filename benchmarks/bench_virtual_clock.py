@@ -0,0 +1,102 @@
+"""Playback and key sequences simulated on a VirtualClock: speed and exact timelines"""
+
+import contextlib
+import io
+import time
+
+from _common import header, long_animation, quiet_listener, run_until
+
+from PyQt6.QtWidgets import QApplication
+
+import overlay
+from animation_player import AnimationPlayer
+from clipboard import RecordingClipboard
+from clock import VirtualClock
+from frames import FrameStore
+from injection import RecordingBackend
+from ratelimit import TokenBucket
+
+FRAMES = 1000
+FRAME_DELAY = 0.4
+CHATS = 8
+
+
+def simulate_playback():
+    """
+    The player's Play button on a long animation: the 3 s countdown, then
+    every frame through the chat rate limit. Returns the recorded key
+    events, the player's lateness summary and the wall-clock seconds taken.
+    """
+    clock = VirtualClock()
+    player = AnimationPlayer(clock=clock)
+    player.injector = RecordingBackend(clock=clock)
+    player.clipboard = RecordingClipboard()
+    player.chat_limiter = TokenBucket(clock=clock.time)
+    player.frames = FrameStore(long_animation(FRAMES))
+    player.timing, player.skip_frames, player.frame_delay = "manual", 1, FRAME_DELAY
+    started = time.perf_counter()
+    player.play_animation()
+    clock.run()  # The countdown
+    run_until(lambda: not player.is_playing, timeout=60)
+    wall = time.perf_counter() - started
+    events, timing = player.injector.events, player.scheduler.lateness_summary()
+    player.close()
+    player.deleteLater()
+    return events, timing, wall
+
+
+def simulate_overlay():
+    """A voiceline, then CHATS chat messages one after another, on the action worker"""
+    clock = VirtualClock()
+    menu = overlay.CommunicationMenu(clock=clock)
+    menu.injector = RecordingBackend(clock=clock)
+    menu.clipboard = RecordingClipboard()
+    menu.chat_limiter = TokenBucket(clock=clock.time)
+    menu.trigger_valorant_voiceline(3, 1).wait()
+    for i in range(CHATS):
+        menu.type_in_chat(f"message {i}").wait()
+    events = menu.injector.events
+    menu.actions.close()
+    menu.deleteLater()
+    return events
+
+
+def sends(events):
+    """Seconds at which each chat message was sent (its final Enter)"""
+    sent, shift = [], False
+    for timestamp, action, key in events:
+        if key == "shift":
+            shift = action == "press"
+        elif key == "enter" and action == "press" and not shift:
+            sent.append(timestamp / 1e9)
+    return sent
+
+
+def main():
+    quiet_listener()
+    app = QApplication.instance() or QApplication([])
+
+    header(f"Player playback, {FRAMES} frames every {FRAME_DELAY * 1e3:.0f} ms, "
+           f"chat rate limit, virtual time")
+    with contextlib.redirect_stdout(io.StringIO()):
+        runs = [simulate_playback() for _ in range(2)]
+    events, timing, wall = runs[0]
+    sent = sends(events)
+    print(f"  {len(sent)} frames sent over {sent[-1] - sent[0]:.1f} s of playback "
+          f"({events[-1][0] / 1e9:.1f} s after Play), simulated in {wall * 1e3:.0f} ms")
+    print(f"  frames late by {timing['mean']:.1f} ms avg, {timing['max']:.1f} ms max")
+    print(f"  {len(events)} key events, identical on a second run: {events == runs[1][0]}")
+
+    header(f"Overlay voiceline and {CHATS} chat messages, virtual time")
+    with contextlib.redirect_stdout(io.StringIO()):
+        events = simulate_overlay()
+        repeated = simulate_overlay()
+    voiceline = [(t / 1e9, key) for t, action, key in events[:6] if action == "press"]
+    print("  voiceline keys at " + ", ".join(f"{key!r} {t * 1e3:.0f} ms" for t, key in voiceline))
+    print("  chat sent at      " + ", ".join(f"{t * 1e3:.0f}" for t in sends(events)) + " ms")
+    print(f"  identical on a second run: {events == repeated}")
+    del app
+
+
+if __name__ == "__main__":
+    main()
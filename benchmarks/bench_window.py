@@ -0,0 +1,91 @@
+"""Toggle-to-visible latency of the overlay window: hide/show vs keep-alive"""
+
+import contextlib
+import ctypes
+import io
+import statistics
+import time
+
+from _common import bench, header, quiet_listener, quiet_platform
+
+from PyQt6.QtWidgets import QApplication
+
+import overlay
+from window_effects import (ACCENT_POLICY, ACCENT_STATE, WINDOWCOMPOSITIONATTRIB,
+                            WINDOWCOMPOSITIONATTRIBDATA, NullEffects)
+
+TOGGLES = 300
+
+
+class CountingEffects(NullEffects):
+    """No effects, but counts how often the blur is really applied"""
+
+    def __init__(self):
+        super().__init__()
+        self.applied = 0
+
+    def _set_blur(self, hwnd):
+        self.applied += 1
+
+
+def legacy_blur_setup():
+    """The ctypes structures enable_blur built on every show (without the call)"""
+    accent = ACCENT_POLICY()
+    accent.AccentState = ACCENT_STATE.ENABLE_BLURBEHIND
+    accent.AccentFlags = 0
+    accent.GradientColor = 0
+    data = WINDOWCOMPOSITIONATTRIBDATA()
+    data.Attrib = WINDOWCOMPOSITIONATTRIB.WCA_ACCENT_POLICY
+    data.pvData = ctypes.cast(ctypes.pointer(accent), ctypes.c_void_p)
+    data.cbData = ctypes.sizeof(accent)
+    return ctypes.pointer(data)
+
+
+def toggle_latency(window_mode):
+    """
+    Seconds from the toggle reaching the GUI thread to the menu being
+    painted, for each show of TOGGLES show/submenu/hide cycles
+    """
+    overlay.WINDOW_MODE = window_mode
+    menu = overlay.CommunicationMenu()
+    menu.effects = CountingEffects()
+    latencies = []
+    for _ in range(TOGGLES):
+        started = time.perf_counter()
+        menu.toggle_visibility()  # Show
+        QApplication.processEvents()  # Expose and paint, as far as needed
+        latencies.append(time.perf_counter() - started)
+        menu.select_option(3)  # Into a submenu, so showing has to reset it
+        QApplication.processEvents()
+        menu.toggle_visibility()  # Hide
+        QApplication.processEvents()
+    applied = menu.effects.applied
+    menu.hide()
+    menu.deleteLater()
+    return latencies, applied
+
+
+def main():
+    quiet_listener()
+    quiet_platform()
+    app = QApplication.instance() or QApplication([])
+
+    header(f"Toggle to visible ({TOGGLES} toggles, offscreen, no-op effects)")
+    with contextlib.redirect_stdout(io.StringIO()):  # "Selected: ..."
+        toggle_latency("remap")  # Warm up
+        results = {mode: toggle_latency(mode) for mode in ("remap", "keepalive")}
+    base = statistics.median(results["remap"][0])
+    for mode, (latencies, applied) in results.items():
+        median = statistics.median(latencies)
+        p95 = statistics.quantiles(latencies, n=20)[-1]
+        print(f"  {mode:<10} median {median * 1e3:7.3f} ms   p95 {p95 * 1e3:7.3f} ms   "
+              f"{base / median:5.1f}x   blur applied {applied}x")
+
+    header("Blur setup per show")
+    print(f"  ctypes structures rebuilt per show     {bench(legacy_blur_setup) * 1e6:8.2f} us"
+          f"   (now built once per session)")
+    del app
+
+
+if __name__ == "__main__":
+    main()
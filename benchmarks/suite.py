@@ -0,0 +1,237 @@
+"""
+Benchmark suite with saved baselines.
+
+    python benchmarks/suite.py              run and compare with the baseline
+    python benchmarks/suite.py --save       run and save the results as the baseline
+    python benchmarks/suite.py -k format    only the cases with "format" in their name
+
+Runs headless like the other scripts: the offscreen Qt platform, the
+recording keystroke backend (no waits) and the recording clipboard. Every
+case is timed as the best of a few rounds. A case more than --tolerance
+slower than its baseline is timed again (up to RETRIES times, keeping the
+best) to rule out a noisy moment; if it is still slower it is flagged and
+the exit status is 1.
+
+Baselines only compare on the machine they were saved on; the file notes
+the Python version and platform and warns when they differ.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+
+from _common import bench, header, long_animation, quiet_listener, quiet_platform, wide_sprite
+
+from PyQt6.QtWidgets import QApplication
+
+import overlay
+from animation_player import (SCREEN_WIDTH, TRUCK_ANIMATION, TRUCK_SPRITE, AnimationPlayer,
+                              generate_scroll_frames, generate_truck_frames)
+from clipboard import RecordingClipboard
+from frames import (FrameStore, LazyFrames, format_frame_for_valorant,
+                    format_line_for_valorant, format_payload)
+from injection import RecordingBackend
+from playback import run_playback
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+TOLERANCE = 0.20  # Slower than the baseline by more than this is a regression
+RETRIES = 2  # Extra runs of a case that looks regressed
+PLAYBACK_FRAMES = 10_000
+
+
+def scroll_case(sprite_width, viewport_width):
+    sprite = wide_sprite(sprite_width)
+    return lambda: generate_scroll_frames(sprite, viewport_width)
+
+
+def format_case():
+    frame = TRUCK_ANIMATION[len(TRUCK_ANIMATION) // 2]
+    return lambda: format_frame_for_valorant(frame)
+
+
+def chunker_case(length):
+    line = (TRUCK_SPRITE[6] * (length // len(TRUCK_SPRITE[6]) + 1))[:length]
+    return lambda: format_line_for_valorant(line)
+
+
+@contextlib.contextmanager
+def menu():
+    menu = overlay.CommunicationMenu()
+    try:
+        yield menu
+    finally:
+        menu.actions.close()
+        menu.hide()
+        menu.deleteLater()
+
+
+@contextlib.contextmanager
+def player():
+    player = AnimationPlayer()
+    player.injector = RecordingBackend(sleep=False)
+    player.clipboard = RecordingClipboard()
+    try:
+        yield player
+    finally:
+        player.close()
+        player.deleteLater()
+
+
+def time_rebuild_options():
+    with menu() as m:
+        return bench(m.rebuild_options)
+
+
+def time_toggle_visibility():
+    """One show and one hide, each with the events it posts processed"""
+    def toggle_twice():
+        m.toggle_visibility()
+        QApplication.processEvents()
+        m.toggle_visibility()
+        QApplication.processEvents()
+
+    with menu() as m:
+        return bench(toggle_twice, number=50)
+
+
+def time_load_default_animation():
+    with player() as p:
+        p.frames = FrameStore(long_animation(PLAYBACK_FRAMES))
+        return bench(p.load_default_animation, number=1)
+
+
+def time_playback():
+    """
+    Every frame of a long animation with no frame delay: formatting on the
+    producer thread, clipboard copies and chat key sequences without waits.
+    The chat rate limit is left out: it paces in real time.
+    """
+    frames = long_animation(PLAYBACK_FRAMES)
+
+    def play():
+        p.clipboard.clear()
+        payloads = LazyFrames(len(frames), lambda i: format_payload(frames[i]))
+        elided = run_playback(payloads, p.paste_prepared, frame_delay=0,
+                              prepare=p.clipboard.prepare)
+        assert len(p.clipboard.copies) + elided == len(frames), "frames missing"
+
+    with player() as p:
+        return bench(play, number=1, repeat=3)
+
+
+# name -> function returning seconds per call
+CASES = {
+    "generate_truck_frames": lambda: bench(generate_truck_frames),
+    "scroll 200 cols / 26 viewport": lambda: bench(scroll_case(200, SCREEN_WIDTH)),
+    "scroll 200 cols / 200 viewport": lambda: bench(scroll_case(200, 200)),
+    "scroll 1000 cols / 26 viewport": lambda: bench(scroll_case(1000, SCREEN_WIDTH)),
+    "format_frame_for_valorant": lambda: bench(format_case()),
+    "chunk single line 338 chars": lambda: bench(chunker_case(338)),
+    "chunk single line 10000 chars": lambda: bench(chunker_case(10_000)),
+    "rebuild_options": time_rebuild_options,
+    "toggle_visibility show + hide": time_toggle_visibility,
+    f"load_default_animation {PLAYBACK_FRAMES} frames": time_load_default_animation,
+    f"playback {PLAYBACK_FRAMES} frames, zero delay": time_playback,
+}
+
+
+def environment():
+    return {"python": platform.python_version(), "platform": platform.platform(),
+            "machine": platform.machine()}
+
+
+def load_baseline(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(path, results):
+    with open(path, "w") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=2)
+
+
+def format_time(seconds):
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:9.3f} ms"
+    return f"{seconds * 1e6:9.3f} us"
+
+
+def is_regression(seconds, saved, tolerance):
+    return saved is not None and seconds > saved * (1 + tolerance)
+
+
+def run_case(name, saved, tolerance):
+    """Seconds per call for a case, re-timed while it looks regressed"""
+    with contextlib.redirect_stdout(io.StringIO()):  # "Selected: ...", status prints
+        seconds = CASES[name]()
+        for _ in range(RETRIES):
+            if not is_regression(seconds, saved, tolerance):
+                break
+            seconds = min(seconds, CASES[name]())
+    return seconds
+
+
+def compare(results, baseline, tolerance):
+    """Print every result against the baseline; returns the regressed case names"""
+    regressed = []
+    saved = baseline["results"] if baseline else {}
+    for name, seconds in results.items():
+        line = f"  {name:<44} {format_time(seconds)}"
+        if name in saved:
+            ratio = seconds / saved[name]
+            line += f"   baseline {format_time(saved[name])}   {ratio:5.2f}x"
+            if is_regression(seconds, saved[name], tolerance):
+                line += "   REGRESSION"
+                regressed.append(name)
+        print(line)
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--save", action="store_true", help="save the results as the baseline")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="baseline JSON file")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="slowdown flagged as a regression (0.2 = 20%%)")
+    parser.add_argument("-k", dest="only", default="", help="only cases containing this text")
+    args = parser.parse_args(argv)
+
+    os.environ["VALTIME_INPUT_BACKEND"] = "recording"
+    os.environ["VALTIME_CLIPBOARD_BACKEND"] = "recording"
+    quiet_listener()
+    quiet_platform()
+    app = QApplication.instance() or QApplication([])
+    baseline = load_baseline(args.baseline)
+    if baseline and baseline["environment"] != environment():
+        print(f"Warning: baseline saved on {baseline['environment']}, "
+              f"running on {environment()}")
+
+    header("Benchmark suite")
+    saved = baseline["results"] if baseline else {}
+    results = {name: run_case(name, saved.get(name), args.tolerance)
+               for name in CASES if args.only in name}
+    regressed = compare(results, baseline, args.tolerance)
+
+    if args.save:
+        if baseline and args.only:
+            results = {**baseline["results"], **results}
+        save_baseline(args.baseline, results)
+        print(f"\nBaseline saved to {args.baseline}")
+    elif baseline is None:
+        print(f"\nNo baseline at {args.baseline} - run with --save to create one")
+    elif regressed:
+        print(f"\n{len(regressed)} regressed by more than {args.tolerance:.0%}: "
+              + ", ".join(regressed))
+    del app
+    return 1 if regressed and not args.save else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
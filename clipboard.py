@@ -0,0 +1,262 @@
+"""
+Clipboard backends for pasting into chat.
+
+pyperclip.copy spawns an xclip/xsel process per call on Linux and opens
+and closes the clipboard on Windows, after which callers had to sleep to
+let the copy settle. These backends are set up once per session and
+copy() only returns once the clipboard has taken the new text.
+
+Backends:
+    WindowsClipboard    Win32 clipboard through ctypes, owned by a hidden
+                        message-only window
+    QtClipboard         the application's QClipboard (one X/Wayland
+                        connection for the whole session, no subprocesses)
+    PyperclipClipboard  pyperclip.copy plus a fixed settle time (fallback)
+    RecordingClipboard  keeps copies in memory (tests, benchmarks)
+"""
+
+import ctypes
+import os
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from clock import SYSTEM_CLOCK
+
+OPEN_RETRIES = 10  # attempts to open a clipboard another program holds
+
+
+class ClipboardError(RuntimeError):
+    """The clipboard could not be set or did not take the new text"""
+
+
+class ClipboardBackend(ABC):
+    """Puts text on the system clipboard; clock times any fixed waits"""
+    name = "base"
+
+    def __init__(self, clock=SYSTEM_CLOCK):
+        self.clock = clock
+
+    def prepare(self, text):
+        """
+        Do the per-copy work that does not touch the clipboard (encoding),
+        so it can run ahead of time on another thread
+        """
+        return text
+
+    def copy_prepared(self, prepared):
+        """Set the clipboard from a prepare() result"""
+        self.copy(prepared)
+
+    @abstractmethod
+    def copy(self, text):
+        """Set the clipboard and return once it holds text"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class WindowsClipboard(ClipboardBackend):
+    """
+    The Win32 clipboard. The DLL functions are resolved once and a hidden
+    message-only window is created to own the clipboard: after
+    EmptyClipboard on a clipboard opened without a window,
+    SetClipboardData fails or is unreliable. A copy has succeeded when
+    SetClipboardData does, so there is no fixed wait. The clipboard
+    itself is only held open while writing - the game has to be able to
+    open it to paste. Retrying the open waits on the real clipboard, so
+    it uses real time whatever the clock. Create and close the backend
+    on the same thread (a window can only be destroyed by its thread).
+    """
+    name = "windows"
+
+    CF_UNICODETEXT = 13
+    GMEM_MOVEABLE = 0x0002
+    HWND_MESSAGE = -3
+
+    def __init__(self, clock=SYSTEM_CLOCK):
+        if sys.platform != "win32":
+            raise OSError("The Windows clipboard backend needs Windows")
+        from ctypes import wintypes
+
+        super().__init__(clock)
+        user32 = ctypes.WinDLL("user32", use_last_error=True)
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+
+        def function(dll, name, argtypes, restype):
+            f = getattr(dll, name)
+            f.argtypes = argtypes
+            f.restype = restype
+            return f
+
+        self._open = function(user32, "OpenClipboard", [wintypes.HWND], wintypes.BOOL)
+        self._close = function(user32, "CloseClipboard", [], wintypes.BOOL)
+        self._empty = function(user32, "EmptyClipboard", [], wintypes.BOOL)
+        self._set_data = function(user32, "SetClipboardData",
+                                  [wintypes.UINT, wintypes.HANDLE], wintypes.HANDLE)
+        self._destroy_window = function(user32, "DestroyWindow", [wintypes.HWND], wintypes.BOOL)
+        self._alloc = function(kernel32, "GlobalAlloc",
+                               [wintypes.UINT, ctypes.c_size_t], wintypes.HGLOBAL)
+        self._lock = function(kernel32, "GlobalLock", [wintypes.HGLOBAL], wintypes.LPVOID)
+        self._unlock = function(kernel32, "GlobalUnlock", [wintypes.HGLOBAL], wintypes.BOOL)
+        self._free = function(kernel32, "GlobalFree", [wintypes.HGLOBAL], wintypes.HGLOBAL)
+
+        create_window = function(
+            user32, "CreateWindowExW",
+            [wintypes.DWORD, wintypes.LPCWSTR, wintypes.LPCWSTR, wintypes.DWORD,
+             ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+             wintypes.HWND, wintypes.HMENU, wintypes.HINSTANCE, wintypes.LPVOID],
+            wintypes.HWND)
+        self._window = create_window(0, "STATIC", None, 0, 0, 0, 0, 0,
+                                     self.HWND_MESSAGE, None, None, None)
+        if not self._window:
+            raise ctypes.WinError(ctypes.get_last_error())
+
+    def _open_clipboard(self):
+        for _ in range(OPEN_RETRIES):
+            if self._open(self._window):
+                return
+            time.sleep(0.001)
+        raise ClipboardError("The clipboard is held by another program")
+
+    def prepare(self, text):
+        return text.encode("utf-16-le") + b"\0\0"
+
+    def copy(self, text):
+        self.copy_prepared(self.prepare(text))
+
+    def copy_prepared(self, data):
+        handle = self._alloc(self.GMEM_MOVEABLE, len(data))
+        if not handle:
+            raise ctypes.WinError(ctypes.get_last_error())
+        ctypes.memmove(self._lock(handle), data, len(data))
+        self._unlock(handle)
+
+        self._open_clipboard()
+        try:
+            self._empty()
+            if not self._set_data(self.CF_UNICODETEXT, handle):
+                # The clipboard only owns the memory once SetClipboardData succeeds
+                self._free(handle)
+                raise ctypes.WinError(ctypes.get_last_error())
+        finally:
+            self._close()
+
+    def close(self):
+        if self._window:
+            self._destroy_window(self._window)
+            self._window = None
+
+
+class QtClipboard(ClipboardBackend):
+    """
+    The running QApplication's clipboard. Must be created on the GUI
+    thread; copies from other threads are handed to the GUI thread and
+    wait until the clipboard reads back the new text.
+    """
+    name = "qt"
+
+    def __init__(self, clock=SYSTEM_CLOCK):
+        from PyQt6.QtCore import QObject, Qt, QThread, pyqtSignal, pyqtSlot
+        from PyQt6.QtWidgets import QApplication
+
+        app = QApplication.instance()
+        if app is None:
+            raise OSError("The Qt clipboard backend needs a running QApplication")
+        super().__init__(clock)
+
+        class Setter(QObject):
+            request = pyqtSignal(str)
+
+            def __init__(self, clipboard):
+                super().__init__()
+                self.clipboard = clipboard
+                self.ok = True
+
+            @pyqtSlot(str)
+            def set_text(self, text):
+                self.clipboard.setText(text)
+                self.ok = self.clipboard.text() == text
+
+        self._current_thread = QThread.currentThread
+        self._lock = threading.Lock()
+        self._setter = Setter(app.clipboard())
+        self._setter.moveToThread(app.thread())
+        self._setter.request.connect(self._setter.set_text,
+                                     Qt.ConnectionType.BlockingQueuedConnection)
+
+    def copy(self, text):
+        setter = self._setter
+        with self._lock:
+            if self._current_thread() is setter.thread():
+                setter.set_text(text)
+            else:
+                setter.request.emit(text)
+            ok = setter.ok
+        if not ok:
+            raise ClipboardError("The clipboard did not take the new text")
+
+
+class PyperclipClipboard(ClipboardBackend):
+    """pyperclip.copy with a fixed wait for the copy to settle"""
+    name = "pyperclip"
+
+    def __init__(self, settle=0.01, clock=SYSTEM_CLOCK):
+        import pyperclip
+        super().__init__(clock)
+        self._copy = pyperclip.copy
+        self.settle = settle
+
+    def copy(self, text):
+        self._copy(text)
+        self.clock.sleep(self.settle)
+
+
+class RecordingClipboard(ClipboardBackend):
+    """Keeps every copy in memory instead of touching the clipboard"""
+    name = "recording"
+
+    def __init__(self, clock=SYSTEM_CLOCK):
+        super().__init__(clock)
+        self.copies = []
+        self._lock = threading.Lock()
+
+    @property
+    def text(self):
+        return self.copies[-1] if self.copies else ""
+
+    def copy(self, text):
+        with self._lock:
+            self.copies.append(text)
+
+    def clear(self):
+        with self._lock:
+            self.copies = []
+
+
+CLIPBOARDS = {
+    "windows": WindowsClipboard,
+    "qt": QtClipboard,
+    "pyperclip": PyperclipClipboard,
+    "recording": RecordingClipboard,
+}
+
+
+def create_clipboard(name=None, clock=SYSTEM_CLOCK):
+    """
+    Clipboard backend by name, or from the VALTIME_CLIPBOARD_BACKEND
+    environment variable, timing its waits with clock. Defaults to the
+    Win32 clipboard on Windows and the Qt clipboard elsewhere; falls back
+    to pyperclip if neither can be set up.
+    """
+    name = name or os.environ.get("VALTIME_CLIPBOARD_BACKEND")
+    if name:
+        return CLIPBOARDS[name](clock=clock)
+    for backend in (WindowsClipboard, QtClipboard):
+        try:
+            return backend(clock)
+        except OSError:
+            pass
+    return PyperclipClipboard(clock=clock)
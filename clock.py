@@ -0,0 +1,159 @@
+"""
+Time sources for everything timing-sensitive.
+
+Playback deadlines, the waits in key sequences, action delays, the chat
+rate limit and the overlay's hide timers all take their time from a clock:
+    SystemClock   real time: time.perf_counter, time.sleep, threading.Timer
+    QtClock       real time, with timers on the Qt event loop (GUI code)
+    VirtualClock  simulated time that only moves when something waits
+
+Under a VirtualClock every sleep and timed wait returns at once and moves
+the clock forward by exactly its duration, firing the timers that fall
+due on the way in order. A playback of several minutes runs in as long as
+its code takes, and a RecordingBackend on the same clock gets the exact
+timestamp of every key event - the same on every run.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from abc import ABC, abstractmethod
+
+
+class Clock(ABC):
+    """
+    A time source.
+    - time() is the current time in seconds (only differences matter),
+      time_ns() the same in integer nanoseconds
+    - sleep(seconds) waits for that long
+    - wait(condition, timeout) is condition.wait(timeout), timed by this
+      clock; call it with the condition held
+    - call_later(delay, callback) runs callback after delay seconds
+    - precise clocks end waits exactly on time; otherwise the OS timer may
+      overshoot and callers finish deadlines off by spinning
+    A subclass missing any of these fails when it is created.
+    """
+    precise = False
+
+    @abstractmethod
+    def time(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def time_ns(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def sleep(self, seconds):
+        raise NotImplementedError
+
+    @abstractmethod
+    def wait(self, condition, timeout=None):
+        raise NotImplementedError
+
+    @abstractmethod
+    def call_later(self, delay, callback):
+        raise NotImplementedError
+
+
+class SystemClock(Clock):
+    """Real time; timers run on their own thread"""
+
+    def time(self):
+        return time.perf_counter()
+
+    def time_ns(self):
+        return time.perf_counter_ns()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+    def wait(self, condition, timeout=None):
+        return condition.wait(timeout)
+
+    def call_later(self, delay, callback):
+        timer = threading.Timer(delay, callback)
+        timer.daemon = True
+        timer.start()
+
+
+class QtClock(SystemClock):
+    """Real time; timers run on the Qt event loop, so they may touch widgets"""
+
+    def call_later(self, delay, callback):
+        from PyQt6.QtCore import QTimer
+        QTimer.singleShot(round(delay * 1000), callback)
+
+
+class VirtualClock(Clock):
+    """
+    Simulated time, kept in whole nanoseconds so runs are exactly repeatable.
+    - sleep(seconds) and wait(condition, timeout) advance the clock instead
+      of blocking; a timed wait always times out (at least 1 ns later, so
+      a wait loop cannot spin in place)
+    - An untimed wait fires the next timer, or really waits for another
+      thread's notify if there is none
+    - call_later(delay, callback) fires when the clock passes the time,
+      on the thread moving the clock - GUI code hands its callbacks to the
+      Qt event loop (a signal); advance(seconds) and run() move it from
+      outside
+    - Timelines are exact when one thread at a time moves the clock
+    """
+    precise = True
+
+    def __init__(self, start=0.0):
+        self._now = round(start * 1e9)
+        self._timers = []  # heap of (due ns, sequence, callback)
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def time(self):
+        return self._now / 1e9
+
+    def time_ns(self):
+        return self._now
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+    def wait(self, condition, timeout=None):
+        if timeout is not None:
+            self.advance(max(timeout, 1e-9))
+            return False
+        if self._fire_next():
+            return True
+        return condition.wait()
+
+    def call_later(self, delay, callback):
+        with self._lock:
+            due = self._now + max(0, round(delay * 1e9))
+            heapq.heappush(self._timers, (due, next(self._sequence), callback))
+
+    def advance(self, seconds):
+        """Move time forward, firing the timers due on the way in order"""
+        with self._lock:
+            target = self._now + max(0, round(seconds * 1e9))
+        while self._fire_next(target):
+            pass
+        with self._lock:
+            self._now = max(self._now, target)
+
+    def run(self):
+        """Fire every timer, including ones scheduled meanwhile, in order"""
+        while self._fire_next():
+            pass
+
+    def _fire_next(self, until=None):
+        """Jump to the next timer (if due by until) and fire it; False if none"""
+        with self._lock:
+            if not self._timers or (until is not None and self._timers[0][0] > until):
+                return False
+            due, _, callback = heapq.heappop(self._timers)
+            self._now = max(self._now, due)
+        callback()
+        return True
+
+
+# Real time, for code that is not given a clock
+SYSTEM_CLOCK = SystemClock()
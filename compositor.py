@@ -0,0 +1,217 @@
+"""
+Layered sprite compositor.
+
+Builds scenes out of several sprites on z-ordered layers, each moving along
+its own path at its own speed. Frames are rendered into NumPy code-point
+arrays, and after the first frame only the regions covered by sprites that
+moved are re-drawn.
+
+Requires numpy:
+    pip install numpy
+"""
+
+import numpy as np
+
+from frames import BG_CHAR, LazyFrames
+
+# Characters swapped when a sprite is mirrored horizontally
+MIRROR_CHARS = str.maketrans("▛▜▙▟▌▐▖▗▘▝◀▶<>/\\()[]{}", "▜▛▟▙▐▌▗▖▝▘▶◀><\\/)(][}{")
+
+
+def to_codepoints(lines, fill=" "):
+    """Convert a list of lines to a 2D array of code points"""
+    width = max((len(line) for line in lines), default=0)
+    text = "".join(line.ljust(width, fill) for line in lines)
+    cells = np.frombuffer(text.encode("utf-32-le"), dtype="<u4")
+    return cells.reshape(len(lines), width).copy()
+
+
+def to_lines(cells):
+    """Convert a 2D array of code points back to a list of lines"""
+    return [row.tobytes().decode("utf-32-le") for row in np.ascontiguousarray(cells)]
+
+
+def silhouette_mask(cells, transparent):
+    """
+    Opaque cells of a sprite: all but the transparent cells connected to
+    its edges, so transparent cells inside the outline stay solid
+    """
+    clear = cells == transparent
+    if not clear.size:
+        return ~clear
+    outside = np.zeros_like(clear)
+    outside[[0, -1], :] = clear[[0, -1], :]
+    outside[:, [0, -1]] = clear[:, [0, -1]]
+    # Grow the outside through neighbouring transparent cells until it stops
+    while True:
+        grown = outside.copy()
+        grown[1:] |= outside[:-1]
+        grown[:-1] |= outside[1:]
+        grown[:, 1:] |= outside[:, :-1]
+        grown[:, :-1] |= outside[:, 1:]
+        grown &= clear
+        if (grown == outside).all():
+            return ~outside
+        outside = grown
+
+
+def mirror_sprite(sprite):
+    """Flip a sprite horizontally, swapping left/right facing block characters"""
+    return [line[::-1].translate(MIRROR_CHARS) for line in sprite]
+
+
+def linear_path(x, y, dx=1, dy=0):
+    """Path starting at (x, y) and moving (dx, dy) cells per step"""
+    return lambda t: (x + dx * t, y + dy * t)
+
+
+def waypoint_path(points, loop=False):
+    """Path visiting a list of (x, y) points, one per step"""
+    def path(t):
+        index = int(t)
+        if loop:
+            index %= len(points)
+        return points[min(index, len(points) - 1)]
+    return path
+
+
+class Layer:
+    """
+    A sprite placed in a scene.
+    - path(t) gives the sprite's top-left (x, y) at time t
+    - speed scales time, so t = frame index * speed
+    - Cells equal to the transparent character outside the sprite's outline
+      show the layers below; inside it they are drawn (silhouette=False
+      makes every transparent cell show through)
+    """
+
+    def __init__(self, sprite, path, z=0, speed=1.0, transparent=BG_CHAR, silhouette=True):
+        self.cells = to_codepoints(sprite, fill=transparent or " ")
+        if transparent is None:
+            self.mask = None
+        elif silhouette:
+            self.mask = silhouette_mask(self.cells, ord(transparent))
+        else:
+            self.mask = self.cells != ord(transparent)
+        self.height, self.width = self.cells.shape
+        self.path = path
+        self.z = z
+        self.speed = speed
+
+    def position(self, index):
+        x, y = self.path(index * self.speed)
+        return int(round(x)), int(round(y))
+
+
+class Compositor:
+    """
+    Renders layered scenes into code-point frames.
+    - Layers are drawn in z order (lowest first) over a flat background
+    - The first frame is drawn in full; later frames only re-draw the union
+      of each moved layer's old and new area
+    - dirty_cells counts the cells re-drawn by the last render
+    """
+
+    def __init__(self, width, height, layers=(), bg_char=BG_CHAR, dirty_regions=True):
+        self.width = width
+        self.height = height
+        self.background = np.full((height, width), ord(bg_char), dtype="<u4")
+        self.layers = sorted(layers, key=lambda layer: layer.z)
+        self.dirty_regions = dirty_regions
+        self.dirty_cells = 0
+        self.reset()
+
+    def add_layer(self, layer):
+        self.layers.append(layer)
+        self.layers.sort(key=lambda layer: layer.z)
+        self.reset()
+
+    def reset(self):
+        """Forget the previous frame so the next render is a full redraw"""
+        self.canvas = None
+        self._positions = None
+
+    def _clip(self, top, left, bottom, right):
+        return max(top, 0), max(left, 0), min(bottom, self.height), min(right, self.width)
+
+    def _dirty_rects(self, positions):
+        """Clipped, non-overlapping rectangles covering every layer that moved"""
+        rects = []
+        for layer, old, new in zip(self.layers, self._positions, positions):
+            if old == new:
+                continue
+            # Union of where the layer was and where it is now
+            (ox, oy), (nx, ny) = old, new
+            rect = self._clip(min(oy, ny), min(ox, nx),
+                              max(oy, ny) + layer.height, max(ox, nx) + layer.width)
+            if rect[0] >= rect[2] or rect[1] >= rect[3]:
+                continue
+            # Merge with any rectangle it touches so no cell is drawn twice
+            merged = True
+            while merged:
+                merged = False
+                for other in rects:
+                    if (rect[0] < other[2] and other[0] < rect[2]
+                            and rect[1] < other[3] and other[1] < rect[3]):
+                        rects.remove(other)
+                        rect = (min(rect[0], other[0]), min(rect[1], other[1]),
+                                max(rect[2], other[2]), max(rect[3], other[3]))
+                        merged = True
+                        break
+            rects.append(rect)
+        return rects
+
+    def _redraw(self, rect, positions):
+        """Re-draw the background and every layer inside one clipped rectangle"""
+        top, left, bottom, right = rect
+        self.canvas[top:bottom, left:right] = self.background[top:bottom, left:right]
+        for layer, (x, y) in zip(self.layers, positions):
+            t, l = max(top, y), max(left, x)
+            b, r = min(bottom, y + layer.height), min(right, x + layer.width)
+            if t >= b or l >= r:
+                continue
+            src = layer.cells[t - y:b - y, l - x:r - x]
+            dst = self.canvas[t:b, l:r]
+            if layer.mask is None:
+                dst[...] = src
+            else:
+                np.copyto(dst, src, where=layer.mask[t - y:b - y, l - x:r - x])
+        self.dirty_cells += (bottom - top) * (right - left)
+
+    def render(self, index):
+        """
+        Render frame index and return the canvas (reused by the next render).
+        Frames are expected in order; a jump just costs a larger dirty area.
+        """
+        positions = [layer.position(index) for layer in self.layers]
+        self.dirty_cells = 0
+
+        rects = None
+        if self.canvas is not None and self.dirty_regions:
+            rects = self._dirty_rects(positions)
+            # Not worth it when the changes cover the whole canvas anyway
+            if sum((b - t) * (r - l) for t, l, b, r in rects) >= self.width * self.height:
+                rects = None
+
+        if rects is None:
+            self.canvas = self.background.copy()
+            self._redraw((0, 0, self.height, self.width), positions)
+        else:
+            for rect in rects:
+                self._redraw(rect, positions)
+
+        self._positions = positions
+        return self.canvas
+
+    def render_frames(self, count, start=0):
+        """Render count consecutive frames into a (count, height, width) array"""
+        out = np.empty((count, self.height, self.width), dtype="<u4")
+        self.reset()
+        for i in range(count):
+            out[i] = self.render(start + i)
+        return out
+
+    def frames(self, count, start=0):
+        """Rendered frames as lists of lines, ready for format_frame_for_valorant"""
+        cells = self.render_frames(count, start)
+        return LazyFrames(count, lambda i: to_lines(cells[i]))
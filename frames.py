@@ -0,0 +1,303 @@
+"""
+Frame containers shared by the overlay and the animation player.
+
+Frames are lists of lines (or a single string for one-line frames), exactly
+as format_frame_for_valorant consumes them.
+"""
+
+import threading
+from array import array
+from collections import OrderedDict
+from collections.abc import MutableSequence
+
+LINE_WIDTH = 26  # Valorant chat lines are 26 characters wide
+BG_CHAR = "▒"  # Background character
+
+
+class LazyFrames:
+    """
+    Read-only frame sequence that renders frames on first access.
+    - render(i) produces frame i; results are cached
+    - Supports len(), indexing, negative indices and slicing (frames[::skip])
+    - Slices are views sharing the same cache, so nothing is rendered twice
+    - prefetch() renders ahead on a background thread while frames are consumed
+    """
+
+    def __init__(self, count, render):
+        self._render = render
+        self._cache = {}
+        self._lock = threading.Lock()
+        self._indices = range(count)
+
+    def _view(self, indices):
+        view = LazyFrames.__new__(LazyFrames)
+        view._render = self._render
+        view._cache = self._cache
+        view._lock = self._lock
+        view._indices = indices
+        return view
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self._view(self._indices[key])
+        return self._get(self._indices[key])
+
+    def __iter__(self):
+        for index in self._indices:
+            yield self._get(index)
+
+    def _get(self, index):
+        frame = self._cache.get(index)
+        if frame is None:
+            with self._lock:
+                frame = self._cache.get(index)
+                if frame is None:
+                    frame = self._cache[index] = self._render(index)
+        return frame
+
+    def select(self, positions):
+        """View of the frames at the given positions of this sequence"""
+        return self._view([self._indices[p] for p in positions])
+
+    def prefetch(self):
+        """Render all frames in order on a background thread"""
+        def render_all():
+            for index in self._indices:
+                self._get(index)
+
+        thread = threading.Thread(target=render_all, daemon=True)
+        thread.start()
+        return thread
+
+
+class FrameStore(MutableSequence):
+    """
+    Compact, editable frame list.
+    - Every distinct line is stored once in a line dictionary, with a count
+      of its uses; a line is dropped as soon as no frame uses it, so
+      replacing a frame (the editor does on every keystroke) leaves
+      nothing behind
+    - The frames are one flat array of line ids plus an array of where
+      each frame ends, so there is no object per frame
+    - Reading a frame returns a fresh list of lines (or the string for
+      one-line frames), so it drops in for a plain list of frames
+    """
+
+    def __init__(self, frames=()):
+        self._lines = []  # Id -> line, None once dropped
+        self._line_ids = {}  # Line -> id
+        self._counts = array("I")  # Id -> uses by frames
+        self._free = []  # Ids of dropped lines, reused first
+        self._ids = array("I")  # Line ids of every frame, back to back
+        self._ends = array("I")  # Frame -> end of its line ids in _ids
+        self._single = bytearray()  # 1 for one-line (str) frames
+        self.extend(frames)
+
+    def _intern(self, line):
+        line_id = self._line_ids.get(line)
+        if line_id is None:
+            if self._free:
+                line_id = self._free.pop()
+                self._lines[line_id] = line
+            else:
+                line_id = len(self._lines)
+                self._lines.append(line)
+                self._counts.append(0)
+            self._line_ids[line] = line_id
+        self._counts[line_id] += 1
+        return line_id
+
+    def _release(self, line_ids):
+        counts = self._counts
+        for line_id in line_ids:
+            counts[line_id] -= 1
+            if not counts[line_id]:
+                del self._line_ids[self._lines[line_id]]
+                self._lines[line_id] = None
+                self._free.append(line_id)
+
+    def _encode(self, frame):
+        if isinstance(frame, str):
+            return array("I", (self._intern(frame),)), 1
+        return array("I", map(self._intern, frame)), 0
+
+    def _span(self, index):
+        """Start and end of frame index's line ids in _ids"""
+        return self._ends[index - 1] if index else 0, self._ends[index]
+
+    def _shift(self, index, delta):
+        """Move the ends of frame index and every later frame by delta"""
+        if delta:
+            ends = self._ends
+            ends[index:] = array("I", [end + delta for end in ends[index:]])
+
+    def _decode(self, index):
+        lines = self._lines
+        start, end = self._span(index)
+        if self._single[index]:
+            return lines[self._ids[start]]
+        return [lines[i] for i in self._ids[start:end]]
+
+    def _position(self, index):
+        if index < 0:
+            index += len(self._ends)
+        if not 0 <= index < len(self._ends):
+            raise IndexError("frame index out of range")
+        return index
+
+    def __len__(self):
+        return len(self._ends)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._decode(i) for i in range(len(self._ends))[index]]
+        return self._decode(self._position(index))
+
+    def __setitem__(self, index, frame):
+        if isinstance(index, slice):
+            raise TypeError("FrameStore does not support slice assignment")
+        index = self._position(index)
+        encoded, self._single[index] = self._encode(frame)
+        start, end = self._span(index)
+        old = self._ids[start:end]
+        self._ids[start:end] = encoded
+        self._release(old)  # After encoding, so lines the frame keeps stay put
+        self._shift(index, len(encoded) - len(old))
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            raise TypeError("FrameStore does not support slice deletion")
+        index = self._position(index)
+        start, end = self._span(index)
+        self._release(self._ids[start:end])
+        del self._ids[start:end]
+        del self._ends[index]
+        del self._single[index]
+        self._shift(index, start - end)
+
+    def insert(self, index, frame):
+        if index < 0:
+            index = max(0, index + len(self._ends))
+        index = min(index, len(self._ends))
+        encoded, single = self._encode(frame)
+        start = self._ends[index - 1] if index else 0
+        self._ids[start:start] = encoded
+        self._ends.insert(index, start)
+        self._single.insert(index, single)
+        self._shift(index, len(encoded))
+
+    def stats(self):
+        """Frame, unique line and line reference counts"""
+        return {
+            "frames": len(self._ends),
+            "unique_lines": len(self._line_ids),
+            "line_refs": len(self._ids),
+        }
+
+
+def is_repeat(payload, previous):
+    """
+    Whether a payload repeats the one sent just before it.
+    str hashes are cached, so differing frames are rejected without
+    comparing their contents.
+    """
+    if previous is None:
+        return False
+    return payload is previous or (hash(payload) == hash(previous) and payload == previous)
+
+
+def playback_frames(frames, skip):
+    """
+    Frames to play for a skip setting.
+    Takes every skip-th frame and always ends on the last frame.
+    """
+    positions = list(range(0, len(frames), skip))
+    if positions and positions[-1] != len(frames) - 1:
+        positions.append(len(frames) - 1)
+    if isinstance(frames, LazyFrames):
+        return frames.select(positions)
+    return [frames[p] for p in positions]
+
+
+def format_frame_for_valorant(frame_lines):
+    """
+    Combine all lines into one string with spaces after every 26 characters.
+    Each line is 26 chars, so we add a space after each line.
+    """
+    return " ".join(frame_lines).rstrip()  # Remove trailing space
+
+
+def format_line_for_valorant(line, line_width=LINE_WIDTH):
+    """Single line frame - add a space every line_width characters"""
+    chunks = (line[i:i + line_width] for i in range(0, len(line), line_width))
+    return " ".join(chunks).rstrip()
+
+
+def format_payload(frame, line_width=LINE_WIDTH):
+    """Ready-to-paste chat message for a frame ("" means nothing to send)"""
+    if isinstance(frame, list):
+        return format_frame_for_valorant(frame)
+    return format_line_for_valorant(frame, line_width)
+
+
+def frames_hash(frames):
+    """Content hash of a frame sequence"""
+    return hash(tuple(tuple(f) if isinstance(f, list) else f for f in frames))
+
+
+class PayloadCache:
+    """
+    Cache of formatted chat payloads for whole playbacks.
+    - Keyed by (animation id, content hash, skip, line width)
+    - Each entry is a LazyFrames of payload strings, formatted on first use
+    - Least recently used entries are evicted once more than max_frames
+      payloads are held in total
+    """
+
+    def __init__(self, max_frames=5000):
+        self.max_frames = max_frames
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def payloads(self, animation_id, frames, skip, line_width=LINE_WIDTH,
+                 content_hash=None):
+        """Payload strings to send for playing frames with a skip setting"""
+        if content_hash is None:
+            content_hash = frames_hash(frames)
+        key = (animation_id, content_hash, skip, line_width)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+            selected = playback_frames(frames, skip)
+            entry = LazyFrames(
+                len(selected), lambda i: format_payload(selected[i], line_width)
+            )
+            self._entries[key] = entry
+            self._size += len(entry)
+            # Evict oldest entries, but always keep the one just added
+            while self._size > self.max_frames and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+            return entry
+
+    def invalidate(self, animation_id=None):
+        """Drop cached payloads for one animation (or all of them)"""
+        with self._lock:
+            for key in list(self._entries):
+                if animation_id is None or key[0] == animation_id:
+                    self._size -= len(self._entries.pop(key))
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Shared by the overlay and the animation player
+PAYLOAD_CACHE = PayloadCache()
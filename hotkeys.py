@@ -0,0 +1,91 @@
+"""
+Global hotkey dispatch for the overlay.
+
+on_press runs on the pynput listener thread for every key pressed in
+game, so it is kept to a single dict lookup for keys the overlay does not
+use. It never calls into Qt: the overlay mirrors its visibility into
+HotkeyDispatcher.visible from the GUI thread instead.
+"""
+
+from pynput.keyboard import Key, KeyCode
+
+from tracing import TRACER
+
+TOGGLE_KEY = "."
+SELECT_KEYS = "123456"
+# Hidden: starts and stops profiling (not every platform has a Pause key)
+PROFILE_KEY = getattr(Key, "pause", None)
+
+
+class HotkeyDispatcher:
+    """
+    Precompiled key -> handler table for the overlay hotkeys.
+    - toggle(), select(num) and back() are called for '.', 1-6 and Escape,
+      and profile() (if given) for Pause; they should only post to the GUI
+      thread (e.g. emit a signal)
+    - visible mirrors whether the overlay is shown; written by the GUI
+      thread, read here (a plain attribute, atomic under the GIL)
+    - Holding '.' toggles once, and a toggle is not posted again until the
+      GUI thread has handled the last one (toggle_handled()). The hold ends
+      when the same physical key is released, matched by its virtual-key
+      code: with Shift down by then, the release reports '>' instead
+    """
+
+    def __init__(self, toggle, select, back, profile=None):
+        self.visible = False
+        self._toggle = toggle
+        self._select = select
+        self._back = back
+        self._toggle_held = False
+        self._toggle_pending = False
+        self._toggle_vk = None  # Virtual-key code of the held toggle key
+        self._toggle_handler = self._on_toggle  # Bound once, compared by identity
+
+        # Chars for KeyCode events, Key members for special keys. Escape
+        # goes in last: backends without a Pause key may alias the two.
+        self._table = {TOGGLE_KEY: self._toggle_handler}
+        for char in SELECT_KEYS:
+            self._table[char] = self._select_handler(int(char))
+        if profile is not None and PROFILE_KEY is not None:
+            self._table[PROFILE_KEY] = profile
+        self._table[Key.esc] = self._on_back
+
+    def _select_handler(self, num):
+        def on_select():
+            if self.visible:
+                if TRACER.enabled:
+                    TRACER.begin("select")
+                self._select(num)
+        return on_select
+
+    def _on_toggle(self):
+        if self._toggle_held or self._toggle_pending:
+            return
+        self._toggle_held = True
+        self._toggle_pending = True
+        if TRACER.enabled:
+            TRACER.begin("toggle")
+        self._toggle()
+
+    def _on_back(self):
+        if self.visible:
+            if TRACER.enabled:
+                TRACER.begin("back")
+            self._back()
+
+    def toggle_handled(self):
+        """Called by the GUI thread once it has acted on a toggle"""
+        self._toggle_pending = False
+
+    def on_press(self, key):
+        handler = self._table.get(key.char if key.__class__ is KeyCode else key)
+        if handler is not None:
+            if handler is self._toggle_handler:
+                self._toggle_vk = key.vk
+            handler()
+
+    def on_release(self, key):
+        if key.__class__ is KeyCode and (
+                key.char == TOGGLE_KEY
+                or (key.vk is not None and key.vk == self._toggle_vk)):
+            self._toggle_held = False
@@ -0,0 +1,314 @@
+"""
+Keystroke injection backends.
+
+Everything ValTime types into the game is described as a key sequence: a
+list of events sent to a backend in one batch.
+    ("press", key)      key down
+    ("release", key)    key up
+    ("wait", seconds)   pause before the next event
+Keys are single characters ("v", "1", "\\") or special key names
+("shift", "ctrl", "enter", "esc").
+
+Backends:
+    PynputBackend     pynput keyboard.Controller, one call per event
+    NativeBackend     Windows SendInput, one call per run of key events
+    RecordingBackend  records timestamped events in memory (tests, benchmarks)
+    TracedBackend     wraps another backend and records a tracing span per
+                      run of keys (used when tracing is enabled)
+"""
+
+import ctypes
+import os
+import sys
+import threading
+from abc import ABC, abstractmethod
+
+from clock import SYSTEM_CLOCK
+from tracing import TRACER
+
+SPECIAL_KEYS = ("shift", "ctrl", "alt", "enter", "esc", "tab", "backspace", "space")
+
+
+def tap(key):
+    """Press and release a key"""
+    return [("press", key), ("release", key)]
+
+
+def chat_sequence(settle=0.02, paste_settle=0.01):
+    """
+    Open all chat, paste the clipboard and send it.
+    - Shift+Enter opens all chat; shift is held while pressing enter
+    - settle: wait for the chat box to open before pasting
+    - paste_settle: wait for the paste to land before sending
+    """
+    return [
+        ("press", "shift"), ("wait", 0.01),
+        ("press", "enter"), ("wait", 0.01),
+        ("release", "enter"), ("wait", 0.01),
+        ("release", "shift"), ("wait", settle),
+        ("press", "ctrl"), *tap("v"), ("release", "ctrl"),
+        ("wait", paste_settle),
+        *tap("enter"),
+    ]
+
+
+def voiceline_sequence(main_num, sub_num, gap=0.08):
+    """Open Valorant's communication wheel and pick main_num -> sub_num"""
+    return [
+        *tap("\\"), ("wait", gap),
+        *tap(str(main_num)), ("wait", gap),
+        *tap(str(sub_num)),
+    ]
+
+
+def without_waits(sequence):
+    """The key events of a sequence with every wait removed"""
+    return [event for event in sequence if event[0] != "wait"]
+
+
+class InjectionBackend(ABC):
+    """Sends whole key sequences to the focused window; clock times the waits"""
+    name = "base"
+    clock = SYSTEM_CLOCK
+
+    @abstractmethod
+    def send(self, sequence):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class PynputBackend(InjectionBackend):
+    """The pynput keyboard controller - one press/release call per event"""
+    name = "pynput"
+
+    def __init__(self, clock=SYSTEM_CLOCK):
+        from pynput import keyboard
+        self.clock = clock
+        self._controller = keyboard.Controller()
+        self._keys = {name: getattr(keyboard.Key, name) for name in SPECIAL_KEYS}
+
+    def send(self, sequence):
+        controller = self._controller
+        for action, value in sequence:
+            if action == "wait":
+                self.clock.sleep(value)
+            elif action == "press":
+                controller.press(self._keys.get(value, value))
+            else:
+                controller.release(self._keys.get(value, value))
+
+
+class NativeBackend(InjectionBackend):
+    """
+    Windows SendInput - every run of key events between two waits is
+    submitted as a single array of INPUT structures. Characters are mapped
+    with VkKeyScanW for the current keyboard layout; shift, ctrl and alt
+    are held around a character that needs them, unless the sequence
+    already holds them.
+    """
+    name = "native"
+
+    INPUT_KEYBOARD = 1
+    KEYEVENTF_KEYUP = 0x0002
+    MAPVK_VK_TO_VSC = 0
+    VK_CODES = {
+        "shift": 0x10, "ctrl": 0x11, "alt": 0x12, "enter": 0x0D, "esc": 0x1B,
+        "tab": 0x09, "backspace": 0x08, "space": 0x20,
+    }
+    SHIFT_STATES = ((0x1, "shift"), (0x2, "ctrl"), (0x4, "alt"))  # VkKeyScanW high byte
+
+    def __init__(self, clock=SYSTEM_CLOCK):
+        if sys.platform != "win32":
+            raise OSError("The native injection backend needs Windows")
+        from ctypes import wintypes
+
+        self.clock = clock
+        class KEYBDINPUT(ctypes.Structure):
+            _fields_ = [
+                ("wVk", wintypes.WORD),
+                ("wScan", wintypes.WORD),
+                ("dwFlags", wintypes.DWORD),
+                ("time", wintypes.DWORD),
+                ("dwExtraInfo", ctypes.c_size_t),
+            ]
+
+        class MOUSEINPUT(ctypes.Structure):
+            # Only here so INPUT has the size SendInput expects
+            _fields_ = [
+                ("dx", wintypes.LONG),
+                ("dy", wintypes.LONG),
+                ("mouseData", wintypes.DWORD),
+                ("dwFlags", wintypes.DWORD),
+                ("time", wintypes.DWORD),
+                ("dwExtraInfo", ctypes.c_size_t),
+            ]
+
+        class INPUT(ctypes.Structure):
+            class _INPUT(ctypes.Union):
+                _fields_ = [("ki", KEYBDINPUT), ("mi", MOUSEINPUT)]
+            _anonymous_ = ("u",)
+            _fields_ = [("type", wintypes.DWORD), ("u", _INPUT)]
+
+        self._INPUT = INPUT
+        user32 = ctypes.WinDLL("user32", use_last_error=True)
+        self._send_input = user32.SendInput
+        self._send_input.argtypes = [wintypes.UINT, ctypes.POINTER(INPUT), ctypes.c_int]
+        self._send_input.restype = wintypes.UINT
+        self._vk_key_scan = user32.VkKeyScanW
+        self._vk_key_scan.argtypes = [wintypes.WCHAR]
+        self._vk_key_scan.restype = ctypes.c_short
+        self._map_virtual_key = user32.MapVirtualKeyW
+        self._map_virtual_key.argtypes = [wintypes.UINT, wintypes.UINT]
+        self._map_virtual_key.restype = wintypes.UINT
+        self._vk_cache = {}
+
+    def _vk(self, key):
+        """Virtual-key code of a key and the modifiers the layout needs for it"""
+        found = self._vk_cache.get(key)
+        if found is None:
+            vk = self.VK_CODES.get(key)
+            if vk is not None:
+                found = vk, ()
+            else:
+                scan = self._vk_key_scan(key)
+                if scan == -1:
+                    raise ValueError(f"No key types {key!r} on the current keyboard layout")
+                found = scan & 0xFF, tuple(
+                    name for bit, name in self.SHIFT_STATES if scan >> 8 & bit)
+            self._vk_cache[key] = found
+        return found
+
+    def _key_events(self, action, key, held):
+        """(action, vk) events for one key event, with any modifiers it needs"""
+        vk, modifiers = self._vk(key)
+        if key in ("shift", "ctrl", "alt"):
+            (held.add if action == "press" else held.discard)(key)
+        extra = [self.VK_CODES[name] for name in modifiers if name not in held]
+        if action == "press":
+            return [("press", m) for m in extra] + [("press", vk)]
+        return [("release", vk)] + [("release", m) for m in reversed(extra)]
+
+    def _submit(self, events):
+        inputs = (self._INPUT * len(events))()
+        for item, (action, vk) in zip(inputs, events):
+            item.type = self.INPUT_KEYBOARD
+            item.ki.wVk = vk
+            item.ki.wScan = self._map_virtual_key(vk, self.MAPVK_VK_TO_VSC)
+            item.ki.dwFlags = self.KEYEVENTF_KEYUP if action == "release" else 0
+        sent = self._send_input(len(events), inputs, ctypes.sizeof(self._INPUT))
+        if sent != len(events):
+            raise ctypes.WinError(ctypes.get_last_error())
+
+    def send(self, sequence):
+        batch = []
+        held = set()  # Modifiers the sequence itself holds down
+        for action, value in sequence:
+            if action == "wait":
+                if batch:
+                    self._submit(batch)
+                    batch = []
+                self.clock.sleep(value)
+            else:
+                batch += self._key_events(action, value, held)
+        if batch:
+            self._submit(batch)
+
+
+class RecordingBackend(InjectionBackend):
+    """
+    Records every event with a timestamp instead of typing.
+    - sleep=False skips waits, so sequences run as fast as possible
+    - clock times the waits and timestamps; on a VirtualClock the events
+      form an exact timeline
+    - events holds (timestamp_ns, action, key) for every key event
+    """
+    name = "recording"
+
+    def __init__(self, sleep=True, clock=SYSTEM_CLOCK):
+        self.sleep = sleep
+        self.clock = clock
+        self.events = []
+        self.sequences = 0
+        self._lock = threading.Lock()
+
+    def send(self, sequence):
+        with self._lock:
+            self.sequences += 1
+        for action, value in sequence:
+            if action == "wait":
+                if self.sleep:
+                    self.clock.sleep(value)
+            else:
+                with self._lock:
+                    self.events.append((self.clock.time_ns(), action, value))
+
+    def keys(self):
+        """Recorded (action, key) pairs without timestamps"""
+        return [(action, key) for _, action, key in self.events]
+
+    def clear(self):
+        with self._lock:
+            self.events = []
+            self.sequences = 0
+
+
+class TracedBackend(InjectionBackend):
+    """
+    Sends through another backend one run of key events at a time, each
+    recorded as an "inject i/n" span in the current trace. Runs are split
+    at the waits, where NativeBackend splits its batches too; the waits
+    are timed by the wrapped backend's clock.
+    """
+
+    def __init__(self, backend, tracer=TRACER):
+        self.backend = backend
+        self.clock = backend.clock
+        self.name = f"traced {backend.name}"
+        self._tracer = tracer
+
+    def send(self, sequence):
+        steps = []  # (seconds to wait first, run of key events)
+        wait, run = 0, []
+        for event in sequence:
+            if event[0] == "wait":
+                if run:
+                    steps.append((wait, run))
+                    wait, run = 0, []
+                wait += event[1]
+            else:
+                run.append(event)
+        steps.append((wait, run))  # The last run, or a trailing wait
+        total = len(steps) if run else len(steps) - 1
+        for number, (wait, run) in enumerate(steps, 1):
+            if wait:
+                self.clock.sleep(wait)
+            if run:
+                with self._tracer.span(f"inject {number}/{total}"):
+                    self.backend.send(run)
+
+    def close(self):
+        self.backend.close()
+
+
+BACKENDS = {
+    "pynput": PynputBackend,
+    "native": NativeBackend,
+    "recording": RecordingBackend,
+}
+
+
+def create_backend(name=None, clock=SYSTEM_CLOCK):
+    """
+    Injection backend by name, or from the VALTIME_INPUT_BACKEND environment
+    variable, timing its waits with clock. Defaults to pynput; the native
+    backend is only used when asked for by name. Wrapped in a TracedBackend
+    when tracing is enabled.
+    """
+    backend = _create_backend(name or os.environ.get("VALTIME_INPUT_BACKEND"), clock)
+    return TracedBackend(backend) if TRACER.enabled else backend
+
+
+def _create_backend(name, clock):
+    return BACKENDS[name or "pynput"](clock=clock)
@@ -0,0 +1,172 @@
+"""
+Custom-painted overlay menu.
+
+An alternative to the overlay's widget tree (header, option rows and
+footer as nested QFrames and QLabels, each with its own stylesheet): a
+single QWidget that paints everything in paintEvent. Text is drawn from
+cached QStaticText layouts and clicks are hit-tested against the row
+geometry, so showing the menu or switching menus involves no style
+resolution or layout passes.
+"""
+
+from PyQt6.QtCore import QPointF, QRectF, Qt
+from PyQt6.QtGui import QColor, QFont, QPainter, QStaticText, QTransform
+from PyQt6.QtWidgets import QWidget
+
+from style import font
+
+HEADER_HEIGHT = 50
+ROW_HEIGHT = 32
+FOOTER_HEIGHT = 26
+ROW_MARGIN = 10  # left/right padding of rows and footer
+HEADER_MARGIN = 12
+KEY_WIDTH = 24  # width of the "1:" column
+
+
+def _color(r, g, b, a):
+    return QColor(r, g, b, round(a * 255) if isinstance(a, float) else a)
+
+
+class PaintedMenu(QWidget):
+    """
+    The whole overlay menu in one widget, looking like the widget tree.
+    - set_options() / set_titles() update what is shown
+    - on_select(num) is called for a click on row num, on_back() for a
+      click on the footer
+    """
+
+    ICON = "📡"
+
+    def __init__(self, on_select, on_back, parent=None):
+        super().__init__(parent)
+        self.on_select = on_select
+        self.on_back = on_back
+        self.setMouseTracking(True)
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent, False)
+
+        self._options = []
+        self._title = "COMMUNICATION"
+        self._footer = "Close"
+        self._hover = None  # Row number under the mouse
+
+        title_font = QFont(font(14, QFont.Weight.DemiBold))
+        title_font.setLetterSpacing(QFont.SpacingType.AbsoluteSpacing, 1)
+        icon_font = QFont()
+        icon_font.setPixelSize(18)
+        self._fonts = {
+            "icon": icon_font,
+            "title": title_font,
+            "option": font(12, QFont.Weight.Bold),
+            "esc": font(10),
+            "footer": font(11),
+        }
+        self._texts = {}  # (text, font name) -> prepared QStaticText
+
+        self._colors = {
+            "header": _color(255, 255, 255, 220),
+            "header_line": _color(255, 255, 255, 255),
+            "title": _color(0, 0, 0, 0.85),
+            "option": _color(255, 255, 255, 1.0),
+            "hover": _color(255, 255, 255, 0.06),
+            "footer_line": _color(255, 255, 255, 8),
+            "esc": _color(255, 255, 255, 0.35),
+            "footer": _color(255, 255, 255, 0.5),
+        }
+
+    def _static(self, text, font_name):
+        """Cached QStaticText for text laid out in one of the menu fonts"""
+        key = (text, font_name)
+        static = self._texts.get(key)
+        if static is None:
+            static = QStaticText(text)
+            static.setTextFormat(Qt.TextFormat.PlainText)
+            static.setPerformanceHint(QStaticText.PerformanceHint.AggressiveCaching)
+            static.prepare(QTransform(), self._fonts[font_name])
+            self._texts[key] = static
+        return static
+
+    def set_options(self, options):
+        self._options = list(options)
+        self._hover = None
+        self.update()
+
+    def set_titles(self, title, footer):
+        self._title = title
+        self._footer = footer
+        self.update()
+
+    def _footer_rect(self):
+        return QRectF(0, self.height() - FOOTER_HEIGHT, self.width(), FOOTER_HEIGHT)
+
+    def hit_test(self, pos):
+        """Row number at pos, "footer", or None"""
+        if pos.y() >= self.height() - FOOTER_HEIGHT:
+            return "footer"
+        row = int((pos.y() - HEADER_HEIGHT) // ROW_HEIGHT)
+        if pos.y() >= HEADER_HEIGHT and row < len(self._options):
+            return row + 1
+        return None
+
+    def _draw_text(self, painter, x, top, height, text, font_name):
+        """Draw text vertically centred in a band; returns its width"""
+        static = self._static(text, font_name)
+        size = static.size()
+        painter.setFont(self._fonts[font_name])
+        painter.drawStaticText(QPointF(x, top + (height - size.height()) / 2), static)
+        return size.width()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+        width = self.width()
+        colors = self._colors
+
+        # Header
+        painter.fillRect(QRectF(0, 0, width, HEADER_HEIGHT), colors["header"])
+        painter.fillRect(QRectF(0, HEADER_HEIGHT - 1, width, 1), colors["header_line"])
+        painter.setPen(colors["title"])
+        x = HEADER_MARGIN
+        x += self._draw_text(painter, x, 0, HEADER_HEIGHT, self.ICON, "icon") + 10
+        self._draw_text(painter, x, 0, HEADER_HEIGHT, self._title, "title")
+
+        # Option rows
+        painter.setPen(colors["option"])
+        for num, text in enumerate(self._options, 1):
+            top = HEADER_HEIGHT + (num - 1) * ROW_HEIGHT
+            if num == self._hover:
+                painter.fillRect(QRectF(0, top, width, ROW_HEIGHT), colors["hover"])
+            self._draw_text(painter, ROW_MARGIN, top, ROW_HEIGHT, f"{num}:", "option")
+            self._draw_text(painter, ROW_MARGIN + KEY_WIDTH + 6, top, ROW_HEIGHT, text, "option")
+
+        # Footer
+        footer = self._footer_rect()
+        painter.fillRect(QRectF(0, footer.top(), width, 1), colors["footer_line"])
+        painter.setPen(colors["esc"])
+        x = ROW_MARGIN
+        x += self._draw_text(painter, x, footer.top(), FOOTER_HEIGHT, "Esc", "esc") + 5
+        painter.setPen(colors["footer"])
+        self._draw_text(painter, x, footer.top(), FOOTER_HEIGHT, self._footer, "footer")
+        painter.end()
+
+    def mouseMoveEvent(self, event):
+        hit = self.hit_test(event.position())
+        hover = hit if isinstance(hit, int) else None
+        if hit is None:
+            self.unsetCursor()
+        else:
+            self.setCursor(Qt.CursorShape.PointingHandCursor)
+        if hover != self._hover:
+            self._hover = hover
+            self.update()
+
+    def leaveEvent(self, event):
+        if self._hover is not None:
+            self._hover = None
+            self.update()
+
+    def mousePressEvent(self, event):
+        hit = self.hit_test(event.position())
+        if hit == "footer":
+            self.on_back()
+        elif hit is not None:
+            self.on_select(hit)
@@ -14,63 +14,48 @@ Controls:
     Escape       - Hide overlay
 """
 
+import os
 import sys
-import ctypes
-from ctypes import wintypes
+import json
 from PyQt6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, 
                               QLabel, QFrame)
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QObject
+from PyQt6.QtCore import Qt, pyqtSignal, QObject
 from PyQt6.QtGui import QFont
 from pynput import keyboard
 
-# Windows blur effect constants
-class ACCENT_STATE:
-    DISABLED = 0
-    ENABLE_GRADIENT = 1
-    ENABLE_TRANSPARENTGRADIENT = 2
-    ENABLE_BLURBEHIND = 3
-    ENABLE_ACRYLICBLURBEHIND = 4  # Windows 10 1803+
+from actions import (PRIORITY_ANIMATION, PRIORITY_CHAT, PRIORITY_VOICELINE, SUSPEND,
+                     ActionWorker)
+from clipboard import create_clipboard
+from clock import QtClock
+from hotkeys import HotkeyDispatcher
+from menu_view import PaintedMenu
+from style import font, install_stylesheet
+from injection import chat_sequence, create_backend, voiceline_sequence
+from ratelimit import limiter_from_config
+from profiling import PROFILER, profiling_requested
+from tracing import TRACER, write_report
+from window_effects import create_effects
 
-class WINDOWCOMPOSITIONATTRIB:
-    WCA_ACCENT_POLICY = 19
+# What a voiceline or chat message does to a running animation: SUSPEND
+# pauses it at the next frame boundary and carries on afterwards, ABORT
+# stops it there
+PREEMPT_POLICY = SUSPEND
 
-class ACCENT_POLICY(ctypes.Structure):
-    _fields_ = [
-        ("AccentState", ctypes.c_int),
-        ("AccentFlags", ctypes.c_int),
-        ("GradientColor", ctypes.c_uint),
-        ("AnimationId", ctypes.c_int),
-    ]
+# "widgets" builds the menu from QFrames and QLabels, "painted" draws it in
+# a single custom-painted widget (menu_view.PaintedMenu)
+RENDER_MODE = os.environ.get("VALTIME_RENDER_MODE", "widgets")
 
-class WINDOWCOMPOSITIONATTRIBDATA(ctypes.Structure):
-    _fields_ = [
-        ("Attrib", ctypes.c_int),
-        ("pvData", ctypes.c_void_p),
-        ("cbData", ctypes.c_size_t),
-    ]
+# "remap" hides the overlay by unmapping its window, "keepalive" keeps the
+# window mapped and hides it with zero opacity and input pass-through
+WINDOW_MODE = os.environ.get("VALTIME_WINDOW_MODE", "remap")
 
-def enable_blur(hwnd):
-    """Enable Windows blur effect on a window"""
+def load_animation_config():
+    """Load animation configuration from file"""
     try:
-        user32 = ctypes.windll.user32
-        SetWindowCompositionAttribute = user32.SetWindowCompositionAttribute
-        SetWindowCompositionAttribute.argtypes = [wintypes.HWND, ctypes.POINTER(WINDOWCOMPOSITIONATTRIBDATA)]
-        SetWindowCompositionAttribute.restype = ctypes.c_int
-        
-        # Use standard blur behind (clearer, like Windows 7 Aero)
-        accent = ACCENT_POLICY()
-        accent.AccentState = ACCENT_STATE.ENABLE_BLURBEHIND
-        accent.AccentFlags = 0
-        accent.GradientColor = 0
-        
-        data = WINDOWCOMPOSITIONATTRIBDATA()
-        data.Attrib = WINDOWCOMPOSITIONATTRIB.WCA_ACCENT_POLICY
-        data.pvData = ctypes.cast(ctypes.pointer(accent), ctypes.c_void_p)
-        data.cbData = ctypes.sizeof(accent)
-        
-        SetWindowCompositionAttribute(hwnd, ctypes.pointer(data))
-    except Exception as e:
-        print(f"Could not enable blur effect: {e}")
+        with open("animation_config.json", 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"animations": {"Truck": {"skip_frames": 5, "frame_delay": 0.5}}}
 
 # Signal bridge to communicate between pynput thread and Qt
 class SignalBridge(QObject):
@@ -78,10 +63,15 @@ class SignalBridge(QObject):
     select_signal = pyqtSignal(int)
     hide_signal = pyqtSignal()
     back_signal = pyqtSignal()
+    profile_signal = pyqtSignal()
 
 class CommunicationMenu(QWidget):
-    def __init__(self):
+    def __init__(self, clock=None):
         super().__init__()
+        # Times action delays, key sequence waits and hide timers; a
+        # VirtualClock runs them in simulated time. Its timers fire on
+        # whichever thread moves it, so they hide through hide_signal
+        self.clock = clock or QtClock()
         # Main menu options (display order)
         self.main_options = [
             "Rocket League",
@@ -147,14 +137,26 @@ class CommunicationMenu(QWidget):
             ]
         }
         
-        # Keyboard controller for typing in chat
-        self.keyboard_controller = keyboard.Controller()
+        # Injection backend for typing in game and in chat
+        self.injector = create_backend(clock=self.clock)
+        self.clipboard = create_clipboard(clock=self.clock)
+        # Blur behind the overlay, set up once and applied once per window
+        self.effects = create_effects()
+        # Keep-alive mode: hidden means faded out, not unmapped
+        self.keep_alive = WINDOW_MODE == "keepalive"
+        self.faded_out = False
+        # Everything typed in game runs on one worker, one action at a time
+        self.actions = ActionWorker(clock=self.clock)
+        # With a "chat_limit" configured, every all-chat message takes a
+        # token, so bursts stay under the game's spam filter
+        self.chat_limiter = limiter_from_config(load_animation_config(), self.clock.time)
         
         self.current_menu = "main"  # "main" or submenu name
         self.main_menu_index = 0  # Track which main menu was selected (1-based)
         self.selection_pending = False  # Prevent multiple selections
         self.options = self.main_options
         self.option_labels = []
+        self.paint_trace = None  # Trace waiting for the next paint (tracing only)
         self.signal_bridge = SignalBridge()
         self.init_ui()
         self.setup_global_hotkeys()
@@ -171,13 +173,9 @@ class CommunicationMenu(QWidget):
         # Main container - transparent background (blur handled by Windows)
         self.container = QFrame(self)
         self.container.setObjectName("container")
-        self.container.setStyleSheet("""
-            #container {
-                background-color: transparent;
-                border: 1px solid rgba(255, 255, 255, 200);
-                border-radius: 3px;
-            }
-        """)
+        # All overlay widgets are styled by object name from one stylesheet
+        # on the container (style.py)
+        install_stylesheet(self.container)
         
         # Layouts
         main_layout = QVBoxLayout(self)
@@ -187,17 +185,57 @@ class CommunicationMenu(QWidget):
         self.container_layout.setContentsMargins(0, 0, 0, 0)
         self.container_layout.setSpacing(0)
         
+        # Single painted widget instead of the header/options/footer tree
+        self.menu_view = None
+        if RENDER_MODE == "painted":
+            self.menu_view = PaintedMenu(self.select_option, self.handle_back)
+            self.container_layout.addWidget(self.menu_view)
+            self.rebuild_options()
+        else:
+            self.init_widget_tree()
+        
+        main_layout.addWidget(self.container)
+        
+        # Position window
+        self.position_window()
+        
+        # Connect signals
+        hotkey_signals = (self.signal_bridge.toggle_signal,
+                          self.signal_bridge.select_signal,
+                          self.signal_bridge.back_signal)
+        if TRACER.enabled:
+            # Slots run in connection order, so a key press's trace is
+            # current on the GUI thread exactly while its handler runs
+            for signal in hotkey_signals:
+                signal.connect(lambda *args: TRACER.adopt("signal"))
+        self.signal_bridge.toggle_signal.connect(self.toggle_visibility)
+        self.signal_bridge.select_signal.connect(self.select_option)
+        self.signal_bridge.hide_signal.connect(self.hide_overlay)
+        self.signal_bridge.back_signal.connect(self.handle_back)
+        self.signal_bridge.profile_signal.connect(PROFILER.toggle)
+        if TRACER.enabled:
+            for signal in hotkey_signals:
+                signal.connect(lambda *args: TRACER.release())
+        
+        # Initially hidden
+        self.hide()
+    
+    def init_widget_tree(self):
         # Header
         self.header = self.create_header()
         self.container_layout.addWidget(self.header)
         
         # Options container
         self.options_frame = QFrame()
-        self.options_frame.setStyleSheet("background: transparent;")
+        self.options_frame.setObjectName("options")
         self.options_layout = QVBoxLayout(self.options_frame)
         self.options_layout.setContentsMargins(0, 0, 0, 0)
         self.options_layout.setSpacing(0)
         
+        # One pooled row per option of the largest menu, created once;
+        # switching menus only updates them in place
+        largest = max(len(menu) for menu in [self.main_options, *self.submenus.values()])
+        self.ensure_option_rows(largest)
         self.rebuild_options()
             
         self.container_layout.addWidget(self.options_frame)
@@ -209,24 +247,10 @@ class CommunicationMenu(QWidget):
         self.footer = self.create_footer()
         self.container_layout.addWidget(self.footer)
         
-        main_layout.addWidget(self.container)
-        
-        # Position window
-        self.position_window()
-        
-        # Connect signals
-        self.signal_bridge.toggle_signal.connect(self.toggle_visibility)
-        self.signal_bridge.select_signal.connect(self.select_option)
-        self.signal_bridge.hide_signal.connect(self.hide)
-        self.signal_bridge.back_signal.connect(self.handle_back)
-        
-        # Initially hidden
-        self.hide()
-        
     def create_header(self):
         header = QFrame()
+        header.setObjectName("header")
         header.setFixedHeight(50)
-        header.setStyleSheet("background-color: rgba(255, 255, 255, 220); border-bottom: 1px solid rgba(255, 255, 255, 255); border-top-left-radius: 3px; border-top-right-radius: 3px;")
         
         layout = QHBoxLayout(header)
         layout.setContentsMargins(12, 0, 12, 0)
@@ -234,12 +258,12 @@ class CommunicationMenu(QWidget):
         
         # Communication icon
         icon_label = QLabel("📡")
-        icon_label.setStyleSheet("font-size: 18px; background: transparent;")
+        icon_label.setObjectName("headerIcon")
         
         # Title - exact Valorant style
         self.header_title = QLabel("COMMUNICATION")
-        self.header_title.setFont(QFont("Segoe UI", 14, QFont.Weight.DemiBold))
-        self.header_title.setStyleSheet("color: rgba(0, 0, 0, 0.85); letter-spacing: 1px; background: transparent;")
+        self.header_title.setObjectName("headerTitle")
+        self.header_title.setFont(font(14, QFont.Weight.DemiBold))
         
         layout.addWidget(icon_label)
         layout.addWidget(self.header_title)
@@ -250,15 +274,8 @@ class CommunicationMenu(QWidget):
     def create_option(self, num, text):
         option = QFrame()
         option.setObjectName(f"option_{num}")
+        option.setProperty("role", "option")
         option.setFixedHeight(32)
-        option.setStyleSheet("""
-            QFrame {
-                background: transparent;
-            }
-            QFrame:hover {
-                background-color: rgba(255, 255, 255, 0.06);
-            }
-        """)
         option.setCursor(Qt.CursorShape.PointingHandCursor)
         
         layout = QHBoxLayout(option)
@@ -267,15 +284,15 @@ class CommunicationMenu(QWidget):
         
         # Key number with colon
         key_label = QLabel(f"{num}:")
-        key_label.setFont(QFont("Segoe UI", 12, QFont.Weight.Bold))
-        key_label.setStyleSheet("color: rgba(255, 255, 255, 1.0);")
+        key_label.setProperty("role", "optionKey")
+        key_label.setFont(font(12, QFont.Weight.Bold))
         key_label.setFixedWidth(24)
         
         # Option text
         text_label = QLabel(text)
-        text_label.setFont(QFont("Segoe UI", 12, QFont.Weight.Bold))
-        text_label.setStyleSheet("color: rgba(255, 255, 255, 1.0);")
+        text_label.setFont(font(12, QFont.Weight.Bold))
         text_label.setObjectName(f"text_{num}")
+        text_label.setProperty("role", "optionText")
         
         self.option_labels.append((option, text_label, num))
         
@@ -290,8 +307,8 @@ class CommunicationMenu(QWidget):
     
     def create_footer(self):
         footer = QFrame()
+        footer.setObjectName("footer")
         footer.setFixedHeight(26)
-        footer.setStyleSheet("background: transparent; border-top: 1px solid rgba(255, 255, 255, 8);")
         footer.setCursor(Qt.CursorShape.PointingHandCursor)
         
         layout = QHBoxLayout(footer)
@@ -300,13 +317,13 @@ class CommunicationMenu(QWidget):
         
         # Esc key indicator
         esc_label = QLabel("Esc")
-        esc_label.setFont(QFont("Segoe UI", 10))
-        esc_label.setStyleSheet("color: rgba(255, 255, 255, 0.35);")
+        esc_label.setObjectName("footerKey")
+        esc_label.setFont(font(10))
         
         # Close/Back text
         self.footer_text = QLabel("Close")
-        self.footer_text.setFont(QFont("Segoe UI", 11))
-        self.footer_text.setStyleSheet("color: rgba(255, 255, 255, 0.5);")
+        self.footer_text.setObjectName("footerText")
+        self.footer_text.setFont(font(11))
         
         layout.addWidget(esc_label)
         layout.addWidget(self.footer_text)
@@ -326,68 +343,128 @@ class CommunicationMenu(QWidget):
     
     def setup_global_hotkeys(self):
         """Setup global hotkeys using pynput - works even when game is focused"""
-        def on_press(key):
-            try:
-                # Period key to toggle
-                if hasattr(key, 'char') and key.char == '.':
-                    self.signal_bridge.toggle_signal.emit()
-                
-                # Number keys 1-6 when visible
-                if self.isVisible() and hasattr(key, 'char') and key.char in '123456':
-                    self.signal_bridge.select_signal.emit(int(key.char))
-                    
-            except AttributeError:
-                pass
-            
-            # Escape to go back or hide
-            if key == keyboard.Key.esc and self.isVisible():
-                self.signal_bridge.back_signal.emit()
+        # Period toggles, 1-6 select and Escape goes back (the last two only
+        # while visible). Every other key returns after one dict lookup.
+        self.hotkeys = HotkeyDispatcher(
+            toggle=self.signal_bridge.toggle_signal.emit,
+            select=self.signal_bridge.select_signal.emit,
+            back=self.signal_bridge.back_signal.emit,
+            profile=self.signal_bridge.profile_signal.emit,
+        )
+        self.hotkeys.visible = self.isVisible()
         
         # Start listener in background thread
-        self.listener = keyboard.Listener(on_press=on_press)
+        self.listener = keyboard.Listener(on_press=self.hotkeys.on_press,
+                                          on_release=self.hotkeys.on_release)
         self.listener.daemon = True
         self.listener.start()
     
-    def toggle_visibility(self):
-        if self.isVisible():
+    def showEvent(self, event):
+        # Mirrored for the listener thread, which must not call into Qt
+        self.hotkeys.visible = self.is_shown()
+        super().showEvent(event)
+    
+    def hideEvent(self, event):
+        self.hotkeys.visible = False
+        super().hideEvent(event)
+    
+    def is_shown(self):
+        """Whether the menu can be seen (isVisible() stays True when faded out)"""
+        return self.isVisible() and not self.faded_out
+    
+    def show_overlay(self):
+        """Show the overlay and blur behind it"""
+        if self.keep_alive and self.faded_out:
+            # Still mapped: fade back in and take input again
+            self.faded_out = False
+            self.windowHandle().setFlag(Qt.WindowType.WindowTransparentForInput, False)
+            self.setWindowOpacity(1.0)
+            self.hotkeys.visible = self.isVisible()
+        if not self.isVisible():
+            self.show()
+        self.effects.apply_blur(int(self.winId()))
+    
+    def hide_overlay(self):
+        """Hide the overlay: unmap it, or in keep-alive mode fade it out"""
+        if not self.keep_alive:
             self.hide()
+            return
+        if not self.is_shown():
+            return
+        self.faded_out = True
+        self.hotkeys.visible = False
+        self.setWindowOpacity(0.0)
+        # Clicks go through to the game while faded out
+        self.windowHandle().setFlag(Qt.WindowType.WindowTransparentForInput, True)
+        # Get the main menu laid out and painted now, so showing it again
+        # only has to fade it in
+        self.reset_menu()
+    
+    def reset_menu(self):
+        """Back to the main menu with the selection lock released"""
+        self.current_menu = "main"
+        self.options = self.main_options
+        self.selection_pending = False  # Reset selection lock
+        self.rebuild_options()
+        self.update_header_title()
+    
+    def toggle_visibility(self):
+        self.hotkeys.toggle_handled()
+        if self.is_shown():
+            self.hide_overlay()
         else:
             # Reset to main menu when showing
-            self.current_menu = "main"
-            self.options = self.main_options
-            self.selection_pending = False  # Reset selection lock
-            self.rebuild_options()
-            self.update_header_title()
-            self.show()
-            # Enable blur effect when shown
-            hwnd = int(self.winId())
-            enable_blur(hwnd)
+            self.reset_menu()
+            self.show_overlay()
+    
+    def ensure_option_rows(self, count):
+        """Grow the pool of option rows to at least count rows"""
+        for num in range(len(self.option_labels) + 1, count + 1):
+            self.options_layout.addWidget(self.create_option(num, ""))
     
     def rebuild_options(self):
-        """Clear and rebuild the options list"""
-        # Clear existing options
-        self.option_labels = []
-        while self.options_layout.count():
-            child = self.options_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-        
-        # Add new options
-        for i, option_text in enumerate(self.options, 1):
-            option = self.create_option(i, option_text)
-            self.options_layout.addWidget(option)
+        """Show the current options in the pooled rows, hiding the spare ones"""
+        if TRACER.enabled:
+            with TRACER.span("rebuild") as trace:
+                self.update_option_rows()
+            # The next paint is the first to show the new options
+            self.paint_trace = trace or self.paint_trace
+        else:
+            self.update_option_rows()
+    
+    def update_option_rows(self):
+        if self.menu_view is not None:
+            self.menu_view.set_options(self.options)
+            return
+        self.ensure_option_rows(len(self.options))
+        for option, text_label, num in self.option_labels:
+            if num <= len(self.options):
+                text_label.setText(self.options[num - 1])
+                option.show()
+            else:
+                option.hide()
+    
+    def paintEvent(self, event):
+        # The window is painted top-down, so this is the start of every repaint
+        if self.paint_trace is not None:
+            TRACER.mark("paint", self.paint_trace)
+            self.paint_trace = None
+        super().paintEvent(event)
     
     def update_header_title(self):
         """Update the header title based on current menu"""
         if self.current_menu == "main":
-            self.header_title.setText("COMMUNICATION")
-            self.footer_text.setText("Close")
+            title, footer = "COMMUNICATION", "Close"
         else:
-            self.header_title.setText(self.current_menu.upper())
-            self.footer_text.setText("Back")
+            title, footer = self.current_menu.upper(), "Back"
+        if self.menu_view is not None:
+            self.menu_view.set_titles(title, footer)
+        else:
+            self.header_title.setText(title)
+            self.footer_text.setText(footer)
     
     def select_option(self, num):
-        if not self.isVisible():
+        if not self.is_shown():
             return
         
         if self.selection_pending:
@@ -415,138 +492,98 @@ class CommunicationMenu(QWidget):
                 valorant_main_key = self.valorant_menu_keys[self.current_menu]
                 self.trigger_valorant_voiceline(valorant_main_key, num)
                 # Keep overlay visible longer to hide official UI
-                QTimer.singleShot(500, self.hide)
+                self.clock.call_later(0.5, self.signal_bridge.hide_signal.emit)
             elif self.current_menu in self.animation_menus:
                 # Animation menu - trigger animation
                 self.trigger_animation(selected)
-                QTimer.singleShot(50, self.hide)
+                self.clock.call_later(0.05, self.signal_bridge.hide_signal.emit)
             else:
                 # Custom menu - type message in Valorant chat
                 self.type_in_chat(selected)
                 # Hide quickly after custom selection
-                QTimer.singleShot(50, self.hide)
+                self.clock.call_later(0.05, self.signal_bridge.hide_signal.emit)
     
     def trigger_valorant_voiceline(self, main_num, sub_num):
         """Trigger Valorant's native communication wheel"""
-        import time
+        trace = TRACER.current() if TRACER.enabled else None
         
-        def do_voiceline():
-            # Press backslash to open communication wheel
-            self.keyboard_controller.press('\\')
-            self.keyboard_controller.release('\\')
-            time.sleep(0.08)
-            
-            # Press main menu number
-            self.keyboard_controller.press(str(main_num))
-            self.keyboard_controller.release(str(main_num))
-            time.sleep(0.08)
-            
-            # Press submenu number
-            self.keyboard_controller.press(str(sub_num))
-            self.keyboard_controller.release(str(sub_num))
+        def do_voiceline(action):
+            # Backslash opens the communication wheel, then main and submenu number
+            with TRACER.attach(trace):
+                self.injector.send(voiceline_sequence(main_num, sub_num))
         
-        import threading
-        threading.Timer(0.05, do_voiceline).start()
+        return self.actions.submit(do_voiceline, PRIORITY_VOICELINE, delay=0.05,
+                                   name="voiceline", preempt=PREEMPT_POLICY)
     
     def trigger_animation(self, animation_name):
         """Trigger an ASCII animation in Valorant chat"""
-        import time
-        import pyperclip
-        import json
-        
-        def load_animation_config():
-            """Load animation configuration from file"""
-            try:
-                with open("animation_config.json", 'r') as f:
-                    return json.load(f)
-            except FileNotFoundError:
-                return {"animations": {"Truck": {"skip_frames": 5, "frame_delay": 0.5}}}
-        
-        def play_animation():
+        def play_animation(action):
             if animation_name == "Truck":
                 # Import the truck animation
-                from animation_player import TRUCK_ANIMATION, format_frame_for_valorant
+                from animation_player import TRUCK_ANIMATION, TRUCK_SCROLL
+                from frames import PAYLOAD_CACHE
+                from playback import PlaybackScheduler, pacer_from_config, run_playback
                 
                 # Load settings from config
                 config = load_animation_config()
                 anim_config = config.get("animations", {}).get(animation_name, {})
-                skip = anim_config.get("skip_frames", 5)
                 frame_delay = anim_config.get("frame_delay", 0.5)
+                # Target-paced playback picks its own stride, so it gets every frame
+                pacer = pacer_from_config(anim_config, len(TRUCK_ANIMATION))
+                skip = anim_config.get("skip_frames", 5) if pacer is None else 1
                 
-                frames = TRUCK_ANIMATION
+                # Ready-to-paste payloads, cached across plays - on the first
+                # play they are rendered in the background while the first
+                # frames are already being sent
+                payloads = PAYLOAD_CACHE.payloads(
+                    animation_name, TRUCK_ANIMATION, skip,
+                    content_hash=TRUCK_SCROLL.content_hash
+                )
+                payloads.prefetch()
                 
-                # Get frames to play
-                frames_to_play = list(frames[::skip])
-                # Always include last frame
-                if frames and frames_to_play[-1] is not frames[-1]:
-                    frames_to_play.append(frames[-1])
+                chat_paste = chat_sequence()
                 
-                for frame in frames_to_play:
-                    formatted = format_frame_for_valorant(frame)
-                    if formatted:
-                        # Copy to clipboard
-                        pyperclip.copy(formatted)
-                        time.sleep(0.01)
-                        
-                        # Open all chat
-                        self.keyboard_controller.press(keyboard.Key.shift)
-                        time.sleep(0.01)
-                        self.keyboard_controller.press(keyboard.Key.enter)
-                        time.sleep(0.01)
-                        self.keyboard_controller.release(keyboard.Key.enter)
-                        time.sleep(0.01)
-                        self.keyboard_controller.release(keyboard.Key.shift)
-                        time.sleep(0.02)
-                        
-                        # Paste
-                        self.keyboard_controller.press(keyboard.Key.ctrl)
-                        self.keyboard_controller.press('v')
-                        self.keyboard_controller.release('v')
-                        self.keyboard_controller.release(keyboard.Key.ctrl)
-                        time.sleep(0.01)
-                        
-                        # Send
-                        self.keyboard_controller.press(keyboard.Key.enter)
-                        self.keyboard_controller.release(keyboard.Key.enter)
-                        
-                        time.sleep(frame_delay)
-        
-        import threading
-        threading.Timer(0.1, play_animation).start()
+                def send(prepared):
+                    # Copy to clipboard (no fixed wait), then open
+                    # all chat, paste and send
+                    self.clipboard.copy_prepared(prepared)
+                    self.injector.send(chat_paste)
+                
+                # Frames go out on fixed deadlines; frames identical to the one
+                # already in chat are held, not re-sent. Upcoming frames are
+                # formatted and encoded while the current one is being typed.
+                self.animation_scheduler = PlaybackScheduler(self.clock)
+                action.on_cancel(self.animation_scheduler.stop)
+                # Voicelines and chat messages interrupt the animation between
+                # two frames, never in the middle of a paste
+                action.on_preempt(self.animation_scheduler.request_yield)
+                self.animation_scheduler.on_yield = action.yield_to_preempting
+                with PROFILER.memory_snapshots("playback"):
+                    run_playback(payloads, send, frame_delay, pacer,
+                                 scheduler=self.animation_scheduler,
+                                 prepare=self.clipboard.prepare,
+                                 limiter=self.chat_limiter)
+        
+        return self.actions.submit(play_animation, PRIORITY_ANIMATION, delay=0.1,
+                                   name=f"animation {animation_name}")
     
     def type_in_chat(self, message):
         """Type a message in Valorant all chat using clipboard paste"""
-        import time
-        import pyperclip
+        trace = TRACER.current() if TRACER.enabled else None
         
-        def do_type():
-            # Copy message to clipboard
-            pyperclip.copy(message)
-            
-            # Press Shift+Enter to open all chat - hold shift while pressing enter
-            self.keyboard_controller.press(keyboard.Key.shift)
-            time.sleep(0.01)  # Small delay to ensure shift is registered
-            self.keyboard_controller.press(keyboard.Key.enter)
-            time.sleep(0.01)
-            self.keyboard_controller.release(keyboard.Key.enter)
-            time.sleep(0.01)
-            self.keyboard_controller.release(keyboard.Key.shift)
-            time.sleep(0.03)
+        def do_type(action):
+            # Wait for the chat rate limit (if set), then copy message to clipboard
+            if self.chat_limiter is not None:
+                self.chat_limiter.acquire(self.clock.sleep)
+            self.clipboard.copy(message)
             
-            # Paste the message with Ctrl+V
-            self.keyboard_controller.press(keyboard.Key.ctrl)
-            self.keyboard_controller.press('v')
-            self.keyboard_controller.release('v')
-            self.keyboard_controller.release(keyboard.Key.ctrl)
-            time.sleep(0.02)
-            
-            # Press Enter to send
-            self.keyboard_controller.press(keyboard.Key.enter)
-            self.keyboard_controller.release(keyboard.Key.enter)
+            # Shift+Enter opens all chat, Ctrl+V pastes, Enter sends - with a
+            # little longer for the chat box and paste to settle
+            with TRACER.attach(trace):
+                self.injector.send(chat_sequence(settle=0.03, paste_settle=0.02))
         
-        # Run immediately in a separate thread
-        import threading
-        threading.Timer(0.05, do_type).start()
+        return self.actions.submit(do_type, PRIORITY_CHAT, delay=0.05, name="chat",
+                                   preempt=PREEMPT_POLICY)
     
     def go_back(self):
         """Go back to main menu"""
@@ -561,28 +598,24 @@ class CommunicationMenu(QWidget):
         if self.current_menu != "main":
             self.go_back()
         else:
-            self.hide()
-    
-    def reset_option(self, option, text_label):
-        option.setStyleSheet("""
-            QFrame {
-                background: transparent;
-            }
-            QFrame:hover {
-                background-color: rgba(255, 255, 255, 0.06);
-            }
-        """)
-        text_label.setStyleSheet("color: rgba(255, 255, 255, 1.0);")
+            self.hide_overlay()
     
     def closeEvent(self, event):
         # Stop the keyboard listener when closing
         if hasattr(self, 'listener'):
             self.listener.stop()
+        # Cancel queued and running actions
+        self.actions.close()
+        self.clipboard.close()
         event.accept()
 
 def main():
     app = QApplication(sys.argv)
     
+    # VALTIME_PROFILE=1 profiles the whole session (Pause toggles it too)
+    if profiling_requested():
+        PROFILER.start()
+    
     overlay = CommunicationMenu()
     
     print("=" * 50)
@@ -596,11 +629,13 @@ def main():
     print("=" * 50)
     
     # Show initially for demo and enable blur
-    overlay.show()
-    hwnd = int(overlay.winId())
-    enable_blur(hwnd)
+    overlay.show_overlay()
     
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    PROFILER.stop()
+    # With VALTIME_TRACE set: hotkey latency summary and Chrome trace
+    write_report()
+    sys.exit(exit_code)
 
 if __name__ == "__main__":
     main()
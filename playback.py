@@ -0,0 +1,290 @@
+"""
+Playback loop shared by the overlay and the animation player.
+
+Sends ready-to-paste payloads to chat one after another, either with a
+fixed period between frames (the skip/delay settings) or paced towards a
+target duration / frame rate. Frames are scheduled against absolute
+deadlines on a clock (clock.py), so the time spent sending does not add
+up as drift. On a VirtualClock a whole playback runs in simulated time.
+
+Each frame is fetched (formatted, for lazy payloads) and prepared for the
+clipboard before waiting for its deadline, so that work happens inside
+the wait instead of delaying the send.
+"""
+
+import math
+import threading
+
+from clock import SYSTEM_CLOCK
+from frames import is_repeat
+
+SEND_COST_ESTIMATE = 0.07  # seconds - the fixed sleeps in one chat paste
+SEND_COST_SMOOTHING = 0.3  # weight of the newest measurement
+SPIN_THRESHOLD = 0.002  # seconds - finish waits by yielding, not sleeping
+
+
+class PlaybackScheduler:
+    """
+    Absolute-deadline timing for one playback.
+    - Deadlines are offsets from start(), measured on clock
+    - Time spent paused shifts every later deadline, so nothing is skipped
+    - stop(), pause() and resume() wake a waiting playback immediately
+    - request_yield() makes the playback call on_yield() at the next frame
+      boundary (between two sends), paused for as long as it runs
+    - lateness holds (frame index, seconds late) for every frame
+    """
+
+    def __init__(self, clock=SYSTEM_CLOCK):
+        self.clock = clock
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._paused_at = None
+        self._paused_total = 0.0
+        self._start = None
+        self._yield_requested = False
+        self.on_yield = None
+        self.lateness = []
+
+    def start(self):
+        """Start the playback clock, unpaused"""
+        with self._cond:
+            self._start = self.clock.time()
+            self._paused_at = None
+            self._paused_total = 0.0
+            self.lateness = []
+
+    def elapsed(self):
+        """Playback time since start(), not counting pauses"""
+        now = self._paused_at if self._paused_at is not None else self.clock.time()
+        return now - self._start - self._paused_total
+
+    @property
+    def stopped(self):
+        return self._stopped
+
+    @property
+    def paused(self):
+        return self._paused_at is not None
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def pause(self):
+        with self._cond:
+            if self._paused_at is None:
+                self._paused_at = self.clock.time()
+            self._cond.notify_all()
+
+    def resume(self):
+        with self._cond:
+            if self._paused_at is not None:
+                self._paused_total += self.clock.time() - self._paused_at
+                self._paused_at = None
+            self._cond.notify_all()
+
+    def request_yield(self):
+        """Have the playback thread run on_yield() before its next frame"""
+        with self._cond:
+            self._yield_requested = True
+            self._cond.notify_all()
+
+    def _yield(self):
+        self.pause()
+        try:
+            if self.on_yield is not None:
+                self.on_yield()
+        finally:
+            self.resume()
+
+    def wait_until(self, offset):
+        """
+        Wait until offset seconds of playback time have passed.
+        Returns False if playback was stopped instead.
+        """
+        # A precise clock needs no spinning to hit the deadline
+        spin = 0.0 if self.clock.precise else SPIN_THRESHOLD
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopped:
+                        return False
+                    if self._yield_requested:
+                        break
+                    if self._paused_at is not None:
+                        self.clock.wait(self._cond)
+                        continue
+                    remaining = offset - self.elapsed()
+                    if remaining <= spin:
+                        break
+                    # Wake a little early; the OS timer may overshoot
+                    self.clock.wait(self._cond, remaining - spin)
+                yielding = self._yield_requested
+                self._yield_requested = False
+
+            if yielding:
+                self._yield()
+                continue
+
+            # Yield the last couple of milliseconds away for an exact deadline
+            while self.elapsed() < offset:
+                if self._stopped or self._paused_at is not None or self._yield_requested:
+                    break
+                self.clock.sleep(0)
+            else:
+                return True
+
+    def record(self, index, offset):
+        """Note how late frame index started compared with its deadline"""
+        self.lateness.append((index, self.elapsed() - offset))
+
+    def lateness_summary(self):
+        """Mean, 95th percentile and worst lateness in milliseconds"""
+        if not self.lateness:
+            return {"mean": 0.0, "p95": 0.0, "max": 0.0}
+        values = sorted(late for _, late in self.lateness)
+        p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+        return {
+            "mean": sum(values) / len(values) * 1000,
+            "p95": p95 * 1000,
+            "max": values[-1] * 1000,
+        }
+
+
+class PlaybackPacer:
+    """
+    Closed-loop pacing towards a target playback speed.
+    - rate is how many source frames should pass per second
+    - The cost of each send is measured and smoothed as playback runs
+    - After every send it picks the next frame to send (the stride) and when
+      to start sending it, so each frame lands in chat when it is due,
+      however slow or fast sending turns out to be on this machine
+    - The last frame is always sent
+    """
+
+    def __init__(self, frame_count, rate, send_cost=SEND_COST_ESTIMATE):
+        self.frame_count = frame_count
+        self.rate = rate
+        self.send_cost = send_cost
+
+    @classmethod
+    def for_duration(cls, frame_count, duration, **kwargs):
+        """Play the whole animation in duration seconds"""
+        return cls(frame_count, max(frame_count - 1, 1) / duration, **kwargs)
+
+    @classmethod
+    def for_fps(cls, frame_count, fps, **kwargs):
+        """Advance through the animation at fps frames per second"""
+        return cls(frame_count, fps, **kwargs)
+
+    def record_send(self, seconds):
+        """Feed back how long the last send actually took"""
+        self.send_cost += SEND_COST_SMOOTHING * (seconds - self.send_cost)
+
+    def due(self, index):
+        """Playback time at which frame index should be in chat"""
+        return index / self.rate
+
+    def next(self, index, elapsed):
+        """
+        Next frame to send after index and the playback time to start
+        sending it. Returns None once the last frame has been sent.
+        """
+        last = self.frame_count - 1
+        if index >= last:
+            return None
+        # The earliest frame we can still get into chat on time
+        target = max(index + 1, math.ceil(self.rate * (elapsed + self.send_cost)))
+        target = min(target, last)
+        return target, self.due(target) - self.send_cost
+
+
+def run_playback(payloads, send, frame_delay=0.5, pacer=None, scheduler=None,
+                 on_frame=None, prepare=None, limiter=None):
+    """
+    Send payloads to chat in order.
+    - send(payload) pastes one chat message
+    - With prepare, each payload goes through prepare(payload) before the
+      wait for its deadline and send gets the prepared value
+    - Without a pacer every payload is sent, one every frame_delay seconds
+    - With a pacer, the pacer picks which payloads to send and when
+    - Empty payloads are skipped; a payload identical to the one already in
+      chat is not sent again (the previous one is held instead)
+    - scheduler (a PlaybackScheduler) stops or pauses playback and collects
+      per-frame lateness; its clock times the whole playback
+    - on_frame(index, elided) is called after each frame
+    - limiter (a ratelimit.TokenBucket) holds every send until it has a
+      token. No frame is dropped for it: without a pacer frames go out
+      later, a pacer picks its next frames knowing when the next token is due
+    Returns the number of repeated frames that were elided.
+    """
+    if scheduler is None:
+        scheduler = PlaybackScheduler()
+    scheduler.start()
+    last_sent = None
+    elided = 0
+    index, send_at = (0, 0.0) if len(payloads) else (None, 0.0)
+
+    def take_token():
+        while not limiter.try_acquire():
+            if not scheduler.wait_until(scheduler.elapsed() + limiter.ready_in()):
+                return False
+        return True
+
+    while index is not None:
+        # Fetch and prepare before waiting, so that work happens in the wait
+        formatted = prepared = payloads[index]
+        repeat = is_repeat(formatted, last_sent)
+        if prepare is not None and formatted and not repeat:
+            prepared = prepare(formatted)
+        wait_for = send_at
+        if limiter is not None and formatted and not repeat:
+            wait_for = max(send_at, scheduler.elapsed() + limiter.ready_in())
+        if not scheduler.wait_until(wait_for):
+            break
+        scheduler.record(index, send_at)
+
+        if repeat:
+            elided += 1
+        elif formatted:
+            if limiter is not None and not take_token():
+                break
+            started = scheduler.clock.time()
+            send(prepared)
+            last_sent = formatted
+            if pacer is not None:
+                pacer.record_send(scheduler.clock.time() - started)
+
+        if on_frame is not None:
+            on_frame(index, elided)
+
+        if pacer is not None:
+            # The next send cannot start before the limiter allows it
+            ready_in = limiter.ready_in() if limiter is not None else 0.0
+            step = pacer.next(index, scheduler.elapsed() + ready_in)
+            index, send_at = step if step is not None else (None, 0.0)
+        elif index + 1 < len(payloads):
+            index += 1
+            send_at = index * frame_delay
+        else:
+            index = None
+
+    return elided
+
+
+TIMING_MODES = {
+    "manual": "Skip / delay",
+    "duration": "Target duration (s)",
+    "fps": "Target FPS",
+}
+
+
+def pacer_from_config(anim_config, frame_count):
+    """PlaybackPacer for an animation's settings, or None for manual skip/delay"""
+    timing = anim_config.get("timing", "manual")
+    if timing == "duration":
+        return PlaybackPacer.for_duration(frame_count, anim_config.get("target_duration", 10.0))
+    if timing == "fps":
+        return PlaybackPacer.for_fps(frame_count, anim_config.get("target_fps", 2.0))
+    return None
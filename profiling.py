@@ -0,0 +1,207 @@
+"""
+On-demand profiling for the overlay and the animation player.
+
+The shipped executable has no console, so a slow session cannot be looked
+at in the field. Profiling is switched on with VALTIME_PROFILE=1 (for the
+whole session) or the hidden Pause hotkey (press again to stop). While it
+runs:
+    - cProfile profiles the GUI thread (the Qt event loop) and, through
+      thread_profile(), the action worker, playback and frame producer
+      threads - one .prof file per thread (on Python 3.12+ cProfile
+      allows one profiler per process, so the GUI thread's profile covers
+      every thread)
+    - memory_snapshots() takes tracemalloc snapshots before and after each
+      playback, dumped as .tracemalloc files with a text summary of the
+      largest differences
+    - stdout and stderr are copied to a log file
+Every file is named valtime-<start time>-<what>.<ext> and written next to
+animation_config.json. Open .prof files with pstats (or snakeviz) and
+snapshots with tracemalloc.Snapshot.load.
+"""
+
+import contextlib
+import cProfile
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+
+CONFIG_FILE = "animation_config.json"  # Dumps are written next to it
+TRACEMALLOC_FRAMES = 25  # Stack depth recorded per allocation
+TOP_DIFFERENCES = 30  # Lines in a snapshot summary
+
+# cProfile uses sys.monitoring from 3.12 on: one profiler for all threads
+PER_THREAD = sys.version_info < (3, 12)
+
+_NO_CONTEXT = contextlib.nullcontext()
+
+
+def profiling_requested():
+    """Whether VALTIME_PROFILE asks for profiling from startup"""
+    return os.environ.get("VALTIME_PROFILE", "") not in ("", "0")
+
+
+class _Tee:
+    """Writes to a stream (if there is one) and to a log file"""
+
+    def __init__(self, stream, log):
+        self.stream = stream
+        self.log = log
+
+    def write(self, text):
+        if self.stream is not None:
+            self.stream.write(text)
+        self.log.write(text)
+        return len(text)
+
+    def flush(self):
+        if self.stream is not None:
+            self.stream.flush()
+        self.log.flush()
+
+
+class Profiler:
+    """
+    One profiling session at a time.
+    - start() / stop() / toggle() are called from the GUI thread; stop()
+      writes the dumps and returns their paths
+    - thread_profile() profiles a block on a worker thread; blocks on one
+      thread add up into one profile, written when the session stops (or,
+      for a block still running then, when it ends)
+    - memory_snapshots(label) dumps tracemalloc snapshots around a block
+    - active is read by worker threads without locking
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self.active = False
+        self.written = []  # Paths of every file written
+        self._session = None
+        self._first = 0  # Index in written of the session's first file
+        self._main = None
+        self._threads = {}  # thread name -> [profile, nesting depth]
+        self._snapshots = 0
+        self._log = None
+        self._streams = None
+        self._lock = threading.Lock()
+
+    def _path(self, what, ext):
+        directory = self.directory or os.path.dirname(os.path.abspath(CONFIG_FILE))
+        what = re.sub(r"[^A-Za-z0-9_.-]+", "-", what).strip("-")
+        return os.path.join(directory, f"valtime-{self._session}-{what}.{ext}")
+
+    def start(self):
+        if self.active:
+            return
+        self._session = time.strftime("%Y%m%d-%H%M%S")
+        self._snapshots = 0
+        self._first = len(self.written)
+        self._log = open(self._path("log", "txt"), "w", encoding="utf-8")
+        self.written.append(self._log.name)
+        self._streams = sys.stdout, sys.stderr
+        sys.stdout = _Tee(sys.stdout, self._log)
+        sys.stderr = _Tee(sys.stderr, self._log)
+        self._main = cProfile.Profile()
+        self._main.enable()
+        self.active = True
+        print(f"Profiling to {os.path.dirname(self._log.name)}")
+
+    def stop(self):
+        """Stop profiling and write the dumps; returns the new paths"""
+        if not self.active:
+            return []
+        self.active = False
+        self._main.disable()
+        self._dump_profile(self._main, threading.current_thread().name)
+        self._main = None
+        with self._lock:
+            idle = [(name, entry[0]) for name, entry in self._threads.items() if entry[1] == 0]
+            for name, _ in idle:
+                del self._threads[name]
+        for name, profile in idle:
+            self._dump_profile(profile, name)
+        written = self.written[self._first:]
+        print(f"Profiling stopped, wrote {len(written)} files")
+        sys.stdout, sys.stderr = self._streams
+        self._log.close()
+        return written
+
+    def toggle(self):
+        if self.active:
+            self.stop()
+        else:
+            self.start()
+
+    def _dump_profile(self, profile, thread_name):
+        path = self._path(thread_name, "prof")
+        profile.dump_stats(path)
+        self.written.append(path)
+
+    def thread_profile(self):
+        """Context manager profiling the block on this thread, while active"""
+        if not self.active or not PER_THREAD:
+            return _NO_CONTEXT
+        return self._profiled()
+
+    @contextlib.contextmanager
+    def _profiled(self):
+        name = threading.current_thread().name
+        with self._lock:
+            entry = self._threads.get(name)
+            if entry is None:
+                entry = self._threads[name] = [cProfile.Profile(), 0]
+            entry[1] += 1
+            outermost = entry[1] == 1
+        if outermost:
+            entry[0].enable()
+        try:
+            yield
+        finally:
+            if outermost:
+                entry[0].disable()
+            with self._lock:
+                entry[1] -= 1
+                # Still running when the session stopped: write it now
+                late = not self.active and entry[1] == 0 and self._threads.get(name) is entry
+                if late:
+                    del self._threads[name]
+            if late:
+                self._dump_profile(entry[0], name)
+
+    def memory_snapshots(self, label):
+        """Context manager dumping tracemalloc snapshots around the block, while active"""
+        if not self.active:
+            return _NO_CONTEXT
+        return self._snapshotted(label)
+
+    @contextlib.contextmanager
+    def _snapshotted(self, label):
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        before = tracemalloc.take_snapshot()
+        try:
+            yield
+        finally:
+            after = tracemalloc.take_snapshot()
+            if started:
+                tracemalloc.stop()
+            with self._lock:
+                self._snapshots += 1
+                what = f"{label}{self._snapshots}"
+            for snapshot, when in ((before, "before"), (after, "after")):
+                path = self._path(f"{what}-{when}", "tracemalloc")
+                snapshot.dump(path)
+                self.written.append(path)
+            path = self._path(what, "txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(f"Largest allocation changes during {label}\n")
+                for stat in after.compare_to(before, "lineno")[:TOP_DIFFERENCES]:
+                    f.write(f"{stat}\n")
+            self.written.append(path)
+
+
+# Shared by the overlay, the animation player and the worker threads
+PROFILER = Profiler()
@@ -0,0 +1,110 @@
+"""
+Rate limiting for chat messages.
+
+Every message pasted into all chat takes a token from a token bucket:
+up to burst messages can go out back to back, after that they are spaced
+to the sustained rate. Playback waits for tokens instead of sending
+messages the game's spam filter would swallow. The limit is off unless
+animation_config.json has a "chat_limit" entry, e.g.
+    "chat_limit": {"rate": 3.0, "burst": 5}
+
+SimulatedChat is a local stand-in for the game's chat that drops
+messages arriving faster than its own rate, for finding the highest
+throughput that gets every message through offline.
+"""
+
+import threading
+import time
+
+DEFAULT_RATE = 3.0  # messages per second, sustained
+DEFAULT_BURST = 5  # messages that may go out back to back
+
+
+class TokenBucket:
+    """
+    Token bucket holding up to burst tokens, refilled at rate per second.
+    - try_acquire() takes a token if one is available
+    - ready_in() is how long until a token is available
+    - acquire() waits for a token and takes it
+    - clock is the time source in seconds (time.monotonic by default)
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, clock=time.monotonic):
+        if rate <= 0 or burst < 1:
+            raise ValueError("Rate must be positive and burst at least 1")
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self):
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def ready_in(self):
+        """Seconds until a token is available (0.0 if one is now)"""
+        with self._lock:
+            self._refill()
+            return max(0.0, (1 - self._tokens) / self.rate)
+
+    def acquire(self, sleep=time.sleep):
+        """Wait for a token and take it; returns the seconds waited"""
+        waited = 0.0
+        while not self.try_acquire():
+            delay = self.ready_in()
+            sleep(delay)
+            waited += delay
+        return waited
+
+
+def limiter_from_config(config, clock=time.monotonic):
+    """
+    Chat TokenBucket for the "chat_limit" settings ({"rate", "burst"}), or
+    None (no limit) when the config has none
+    """
+    settings = config.get("chat_limit")
+    if settings is None:
+        return None
+    return TokenBucket(settings.get("rate", DEFAULT_RATE), settings.get("burst", DEFAULT_BURST),
+                       clock)
+
+
+class SimulatedChat:
+    """
+    Local chat that enforces a message rate like the game's spam filter.
+    - receive(message) delivers the message, or drops it if it arrives
+      when the chat's own bucket is empty
+    - delivered and dropped hold (time, message) pairs
+    """
+
+    def __init__(self, rate, burst, clock=time.monotonic):
+        self._bucket = TokenBucket(rate, burst, clock)
+        self._clock = clock
+        self.delivered = []
+        self.dropped = []
+
+    def receive(self, message):
+        entry = (self._clock(), message)
+        if self._bucket.try_acquire():
+            self.delivered.append(entry)
+            return True
+        self.dropped.append(entry)
+        return False
+
+    def throughput(self):
+        """Delivered messages per second over the delivery span"""
+        if len(self.delivered) < 2:
+            return 0.0
+        span = self.delivered[-1][0] - self.delivered[0][0]
+        return (len(self.delivered) - 1) / span if span else float("inf")
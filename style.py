@@ -0,0 +1,73 @@
+"""
+Shared look of the overlay.
+
+One stylesheet, set on the overlay's container, styles every overlay
+widget by object name or role property, so building the menu parses CSS
+once and rebuilding it never does. Fonts are created once and shared.
+"""
+
+from functools import lru_cache
+
+from PyQt6.QtGui import QFont
+
+FONT_FAMILY = "Segoe UI"
+
+# Singletons are matched by object name, the pooled option rows (whose
+# object names carry their number) by their "role" property. Every
+# selector names the widget it styles directly, and widgets that draw
+# nothing get no rule: each matched rule is evaluated on every paint.
+# The old per-widget stylesheets were unscoped and so also styled the
+# widget's children, which is why the header and footer borders are
+# repeated on their labels.
+OVERLAY_STYLESHEET = """
+QFrame#container {
+    border: 1px solid rgba(255, 255, 255, 200);
+    border-radius: 3px;
+}
+QFrame#header {
+    background-color: rgba(255, 255, 255, 220);
+}
+QFrame#header, QLabel#headerIcon, QLabel#headerTitle {
+    border-bottom: 1px solid rgba(255, 255, 255, 255);
+    border-top-left-radius: 3px;
+    border-top-right-radius: 3px;
+}
+QLabel#headerIcon {
+    font-size: 18px;
+}
+QLabel#headerTitle {
+    color: rgba(0, 0, 0, 0.85);
+    letter-spacing: 1px;
+}
+QFrame[role="option"]:hover, QLabel[role="optionKey"]:hover, QLabel[role="optionText"]:hover {
+    background-color: rgba(255, 255, 255, 0.06);
+}
+QLabel[role="optionKey"], QLabel[role="optionText"] {
+    color: rgba(255, 255, 255, 1.0);
+}
+QFrame#footer, QLabel#footerKey, QLabel#footerText {
+    border-top: 1px solid rgba(255, 255, 255, 8);
+}
+QLabel#footerKey {
+    color: rgba(255, 255, 255, 0.35);
+}
+QLabel#footerText {
+    color: rgba(255, 255, 255, 0.5);
+}
+"""
+
+
+def install_stylesheet(widget):
+    """
+    Style a widget and everything in it with the overlay stylesheet.
+    Scoped to the widget rather than the application: an application
+    stylesheet puts every widget of every window through stylesheet
+    polish and painting, and made the menu's show/navigate cycle slower.
+    """
+    widget.setStyleSheet(OVERLAY_STYLESHEET)
+
+
+@lru_cache(maxsize=None)
+def font(size, weight=QFont.Weight.Normal):
+    """Shared overlay font; treat it as read-only"""
+    return QFont(FONT_FAMILY, size, weight)
@@ -0,0 +1,200 @@
+"""
+End-to-end latency tracing.
+
+A trace starts when a hotkey handler runs on the pynput listener thread
+and collects timestamped marks and spans as the key press travels on:
+delivery of the SignalBridge signal on the GUI thread, rebuild_options,
+the first paint after it and every injected run of keys on the action
+worker. Timestamps come from time.perf_counter_ns, so they compare across
+threads.
+
+Events go into a fixed-size ring buffer. summary() gives p50/p95/p99 of
+the time from the key press to every kind of mark, and
+export_chrome_trace() writes the events as a Chrome trace
+(chrome://tracing, Perfetto).
+
+Enable with VALTIME_TRACE=1 (written to valtime-trace.json on exit) or
+VALTIME_TRACE=<file.json>. Call sites check TRACER.enabled first, so with
+tracing off a traced path costs one attribute lookup.
+"""
+
+import contextlib
+import itertools
+import json
+import os
+import statistics
+import threading
+import time
+from collections import deque
+
+DEFAULT_CAPACITY = 8192  # events kept in the ring buffer
+DEFAULT_TRACE_FILE = "valtime-trace.json"
+
+_NO_CONTEXT = contextlib.nullcontext()
+
+
+class Tracer:
+    """
+    Records latency traces.
+    - begin(name) starts a trace on the current thread (a hotkey handler)
+      and makes it the latest one; it returns the trace, an (id, name,
+      start_ns) tuple
+    - adopt(name) makes the latest trace current on this thread and marks
+      it (signal delivery on the GUI thread)
+    - attach(trace) makes a trace current for a block on another thread
+    - mark(name) and span(name) record an instant / a timed block in the
+      current (or a given) trace; outside a trace they do nothing
+    - events holds (trace id, name, start_ns, end_ns, thread id) tuples
+    """
+
+    def __init__(self, enabled=False, capacity=DEFAULT_CAPACITY):
+        self.enabled = enabled
+        self.events = deque(maxlen=capacity)
+        self.traces = deque(maxlen=capacity)  # Every trace begun, oldest dropped
+        self.latest = None
+        self.thread_names = {}
+        self._ids = itertools.count(1)
+        self._local = threading.local()
+
+    def _record(self, trace, name, start, end):
+        tid = threading.get_ident()
+        if tid not in self.thread_names:
+            self.thread_names[tid] = threading.current_thread().name
+        self.events.append((trace[0], name, start, end, tid))
+
+    def begin(self, name):
+        start = time.perf_counter_ns()
+        trace = (next(self._ids), name, start)
+        self.traces.append(trace)
+        self._record(trace, name, start, start)
+        self._local.trace = self.latest = trace
+        return trace
+
+    def current(self):
+        """The trace current on this thread, or None"""
+        return getattr(self._local, "trace", None)
+
+    def adopt(self, name):
+        """Carry on the latest trace on this thread, e.g. where its signal lands"""
+        self._local.trace = self.latest
+        self.mark(name)
+
+    def release(self):
+        """End this thread's part in its current trace"""
+        self._local.trace = None
+
+    def attach(self, trace):
+        """Context manager making trace current on this thread"""
+        if trace is None:
+            return _NO_CONTEXT
+        return self._attached(trace)
+
+    @contextlib.contextmanager
+    def _attached(self, trace):
+        previous = self.current()
+        self._local.trace = trace
+        try:
+            yield trace
+        finally:
+            self._local.trace = previous
+
+    def mark(self, name, trace=None):
+        trace = trace or self.current()
+        if trace is not None:
+            now = time.perf_counter_ns()
+            self._record(trace, name, now, now)
+
+    @contextlib.contextmanager
+    def span(self, name, trace=None):
+        trace = trace or self.current()
+        start = time.perf_counter_ns()
+        try:
+            yield trace
+        finally:
+            if trace is not None:
+                self._record(trace, name, start, time.perf_counter_ns())
+
+    def clear(self):
+        self.events.clear()
+        self.traces.clear()
+        self.latest = None
+
+    def latencies(self):
+        """
+        Nanoseconds from the key press to the end of each event, grouped
+        as "<trace name> -> <event name>"
+        """
+        starts = {trace_id: (name, start) for trace_id, name, start in self.traces}
+        groups = {}
+        for trace_id, name, start, end, tid in self.events:
+            trace = starts.get(trace_id)
+            if trace is None or (name == trace[0] and start == trace[1]):
+                continue  # Trace dropped from the buffer, or its own begin
+            groups.setdefault(f"{trace[0]} -> {name}", []).append(end - trace[1])
+        return groups
+
+    def summary(self):
+        """{group: (count, p50, p95, p99)} with percentiles in milliseconds"""
+        result = {}
+        for group, values in sorted(self.latencies().items()):
+            if len(values) > 1:
+                p = statistics.quantiles(values, n=100, method="inclusive")
+                p50, p95, p99 = p[49], p[94], p[98]
+            else:
+                p50 = p95 = p99 = values[0]
+            result[group] = (len(values), p50 / 1e6, p95 / 1e6, p99 / 1e6)
+        return result
+
+    def report(self):
+        """The summary as a printable table"""
+        lines = [f"  {'from key press to':<32} {'n':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"]
+        for group, (count, p50, p95, p99) in self.summary().items():
+            lines.append(f"  {group:<32} {count:5d} {p50:9.3f} {p95:9.3f} {p99:9.3f}")
+        return "\n".join(lines)
+
+    def export_chrome_trace(self, path):
+        """Write the buffered events as a Chrome trace JSON file"""
+        pid = os.getpid()
+        starts = {trace_id: start for trace_id, _, start in self.traces}
+        trace_events = [
+            {"ph": "M", "name": "thread_name", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in self.thread_names.items()
+        ]
+        for trace_id, name, start, end, tid in self.events:
+            event = {
+                "name": name, "cat": "latency", "pid": pid, "tid": tid,
+                "ts": start / 1e3,
+                "args": {"trace": trace_id},
+            }
+            if trace_id in starts:
+                event["args"]["since_key_ms"] = (end - starts[trace_id]) / 1e6
+            if end > start:
+                event.update(ph="X", dur=(end - start) / 1e3)
+            else:
+                event.update(ph="i", s="t")
+            trace_events.append(event)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, f)
+
+
+def trace_file():
+    """Where to write the trace on exit, from VALTIME_TRACE (None if tracing is off)"""
+    value = os.environ.get("VALTIME_TRACE", "")
+    if value in ("", "0"):
+        return None
+    return DEFAULT_TRACE_FILE if value == "1" else value
+
+
+# Shared by the hotkey listener, the overlay and the injection backends
+TRACER = Tracer(enabled=trace_file() is not None)
+
+
+def write_report(tracer=TRACER):
+    """Print the latency summary and write the Chrome trace file, if tracing"""
+    path = trace_file()
+    if not tracer.enabled or path is None:
+        return
+    print("\nHotkey latency")
+    print(tracer.report())
+    tracer.export_chrome_trace(path)
+    print(f"Trace written to {path}")
@@ -0,0 +1,127 @@
+"""
+Window effects for the overlay (the blur behind it).
+
+enable_blur used to resolve SetWindowCompositionAttribute, set its
+argtypes and build the accent structures on every show. These backends
+resolve the call once per session and apply the effect once per window
+handle: the attribute stays with the window across hides and shows.
+
+Backends:
+    WindowsEffects  blur behind through SetWindowCompositionAttribute
+    NullEffects     does nothing (other platforms, tests, benchmarks)
+"""
+
+import ctypes
+import os
+import sys
+
+
+# Windows blur effect constants
+class ACCENT_STATE:
+    DISABLED = 0
+    ENABLE_GRADIENT = 1
+    ENABLE_TRANSPARENTGRADIENT = 2
+    ENABLE_BLURBEHIND = 3
+    ENABLE_ACRYLICBLURBEHIND = 4  # Windows 10 1803+
+
+
+class WINDOWCOMPOSITIONATTRIB:
+    WCA_ACCENT_POLICY = 19
+
+
+class ACCENT_POLICY(ctypes.Structure):
+    _fields_ = [
+        ("AccentState", ctypes.c_int),
+        ("AccentFlags", ctypes.c_int),
+        ("GradientColor", ctypes.c_uint),
+        ("AnimationId", ctypes.c_int),
+    ]
+
+
+class WINDOWCOMPOSITIONATTRIBDATA(ctypes.Structure):
+    _fields_ = [
+        ("Attrib", ctypes.c_int),
+        ("pvData", ctypes.c_void_p),
+        ("cbData", ctypes.c_size_t),
+    ]
+
+
+class WindowEffects:
+    """Applies the overlay's window effects, once per window handle"""
+    name = "base"
+
+    def __init__(self):
+        self._blurred = set()
+
+    def apply_blur(self, hwnd):
+        """Blur behind the window; a no-op for a handle already blurred"""
+        if hwnd in self._blurred:
+            return
+        self._blurred.add(hwnd)
+        self._set_blur(hwnd)
+
+    def _set_blur(self, hwnd):
+        pass
+
+
+class WindowsEffects(WindowEffects):
+    """
+    Blur behind through user32.SetWindowCompositionAttribute. The function
+    and the accent structures are set up once and reused for every window.
+    """
+    name = "windows"
+
+    def __init__(self):
+        if sys.platform != "win32":
+            raise OSError("The Windows effects backend needs Windows")
+        from ctypes import wintypes
+
+        super().__init__()
+        user32 = ctypes.WinDLL("user32")
+        self._set_attribute = user32.SetWindowCompositionAttribute
+        self._set_attribute.argtypes = [wintypes.HWND,
+                                        ctypes.POINTER(WINDOWCOMPOSITIONATTRIBDATA)]
+        self._set_attribute.restype = ctypes.c_int
+
+        # Use standard blur behind (clearer, like Windows 7 Aero)
+        self._accent = ACCENT_POLICY()
+        self._accent.AccentState = ACCENT_STATE.ENABLE_BLURBEHIND
+        self._accent.AccentFlags = 0
+        self._accent.GradientColor = 0
+
+        self._data = WINDOWCOMPOSITIONATTRIBDATA()
+        self._data.Attrib = WINDOWCOMPOSITIONATTRIB.WCA_ACCENT_POLICY
+        self._data.pvData = ctypes.cast(ctypes.pointer(self._accent), ctypes.c_void_p)
+        self._data.cbData = ctypes.sizeof(self._accent)
+
+    def _set_blur(self, hwnd):
+        if not self._set_attribute(hwnd, ctypes.byref(self._data)):
+            print("Could not enable blur effect: SetWindowCompositionAttribute failed")
+
+
+class NullEffects(WindowEffects):
+    """No window effects"""
+    name = "none"
+
+
+EFFECTS = {
+    "windows": WindowsEffects,
+    "none": NullEffects,
+}
+
+
+def create_effects(name=None):
+    """
+    Window effects backend by name, or from the VALTIME_WINDOW_EFFECTS
+    environment variable. Defaults to the Windows blur on Windows and no
+    effects elsewhere.
+    """
+    name = name or os.environ.get("VALTIME_WINDOW_EFFECTS")
+    if name:
+        return EFFECTS[name]()
+    try:
+        return WindowsEffects()
+    except (OSError, AttributeError) as e:
+        if sys.platform == "win32":
+            print(f"Could not enable blur effect: {e}")
+        return NullEffects()